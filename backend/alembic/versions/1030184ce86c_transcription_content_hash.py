@@ -0,0 +1,38 @@
+"""Transcription content hash and ASR fingerprint.
+
+Revision ID: 1030184ce86c
+Revises: b338b8f0ec2f
+Create Date: 2026-10-18 09:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "1030184ce86c"
+down_revision = "b338b8f0ec2f"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "transcriptions", sa.Column("content_hash", sa.String(length=64), nullable=True)
+    )
+    op.add_column(
+        "transcriptions",
+        sa.Column("asr_fingerprint", sa.String(length=64), nullable=True),
+    )
+    op.create_index(
+        op.f("ix_transcriptions_content_hash"),
+        "transcriptions",
+        ["content_hash"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_transcriptions_content_hash"), table_name="transcriptions")
+    op.drop_column("transcriptions", "asr_fingerprint")
+    op.drop_column("transcriptions", "content_hash")
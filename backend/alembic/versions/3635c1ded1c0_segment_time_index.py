@@ -0,0 +1,31 @@
+"""Segment time-order index.
+
+Revision ID: 3635c1ded1c0
+Revises: e1fe4c274dd3
+Create Date: 2026-10-18 09:40:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "3635c1ded1c0"
+down_revision = "e1fe4c274dd3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_transcription_segments_transcription_start_id",
+        "transcription_segments",
+        ["transcription_id", "start_time", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_transcription_segments_transcription_start_id",
+        table_name="transcription_segments",
+    )
@@ -0,0 +1,38 @@
+"""Content-addressed blobs.
+
+Revision ID: 4b3192271d5d
+Revises: b570e00545ad
+Create Date: 2026-10-18 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "4b3192271d5d"
+down_revision = "b570e00545ad"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "blobs",
+        sa.Column("content_hash", sa.String(length=64), nullable=False),
+        sa.Column("path", sa.String(), nullable=False),
+        sa.Column("size", sa.BigInteger(), nullable=True),
+        sa.Column("mime_type", sa.String(), nullable=True),
+        sa.Column("ref_count", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.PrimaryKeyConstraint("content_hash"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("blobs")
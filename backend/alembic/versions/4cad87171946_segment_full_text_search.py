@@ -0,0 +1,81 @@
+"""Segment full-text search.
+
+Revision ID: 4cad87171946
+Revises: 3635c1ded1c0
+Create Date: 2026-10-18 09:45:00.000000
+
+"""
+from typing import Tuple
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "4cad87171946"
+down_revision = "3635c1ded1c0"
+branch_labels = None
+depends_on = None
+
+# Mesmos objetos que os listeners after_create de app.models.transcription
+# criam em bancos novos; aqui para bancos cuja tabela já existia.
+POSTGRESQL_UPGRADE = (
+    "ALTER TABLE transcription_segments "
+    "ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('portuguese', coalesce(text, ''))) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_transcription_segments_search_vector "
+    "ON transcription_segments USING GIN (search_vector)",
+)
+POSTGRESQL_DOWNGRADE = (
+    "DROP INDEX IF EXISTS ix_transcription_segments_search_vector",
+    "ALTER TABLE transcription_segments DROP COLUMN IF EXISTS search_vector",
+)
+
+SQLITE_UPGRADE = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS transcription_segments_fts USING fts5("
+    "text, content='transcription_segments', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS transcription_segments_fts_insert "
+    "AFTER INSERT ON transcription_segments BEGIN "
+    "INSERT INTO transcription_segments_fts(rowid, text) "
+    "VALUES (new.id, new.text); END",
+    "CREATE TRIGGER IF NOT EXISTS transcription_segments_fts_delete "
+    "AFTER DELETE ON transcription_segments BEGIN "
+    "INSERT INTO transcription_segments_fts(transcription_segments_fts, rowid, text) "
+    "VALUES ('delete', old.id, old.text); END",
+    "CREATE TRIGGER IF NOT EXISTS transcription_segments_fts_update "
+    "AFTER UPDATE OF text ON transcription_segments BEGIN "
+    "INSERT INTO transcription_segments_fts(transcription_segments_fts, rowid, text) "
+    "VALUES ('delete', old.id, old.text); "
+    "INSERT INTO transcription_segments_fts(rowid, text) "
+    "VALUES (new.id, new.text); END",
+    # Indexar os segmentos gravados antes da tabela FTS existir
+    "INSERT INTO transcription_segments_fts(transcription_segments_fts) "
+    "VALUES ('rebuild')",
+)
+SQLITE_DOWNGRADE = (
+    "DROP TRIGGER IF EXISTS transcription_segments_fts_update",
+    "DROP TRIGGER IF EXISTS transcription_segments_fts_delete",
+    "DROP TRIGGER IF EXISTS transcription_segments_fts_insert",
+    "DROP TABLE IF EXISTS transcription_segments_fts",
+)
+
+
+def _statements(
+    postgresql: Tuple[str, ...], sqlite: Tuple[str, ...]
+) -> Tuple[str, ...]:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql
+    if dialect == "sqlite":
+        return sqlite
+    return ()
+
+
+def upgrade() -> None:
+    for statement in _statements(POSTGRESQL_UPGRADE, SQLITE_UPGRADE):
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    for statement in _statements(POSTGRESQL_DOWNGRADE, SQLITE_DOWNGRADE):
+        op.execute(statement)
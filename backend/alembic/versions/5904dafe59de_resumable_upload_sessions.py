@@ -0,0 +1,66 @@
+"""Resumable upload sessions.
+
+Revision ID: 5904dafe59de
+Revises: ea39c60170c5
+Create Date: 2026-10-18 09:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "5904dafe59de"
+down_revision = "ea39c60170c5"
+branch_labels = None
+depends_on = None
+
+upload_status = sa.Enum(
+    "UPLOADING", "WRITING", "COMPLETING", "COMPLETED", name="uploadstatus"
+)
+
+
+def upgrade() -> None:
+    # Vídeos de audiência passam de 2 GiB
+    with op.batch_alter_table("transcriptions") as batch_op:
+        batch_op.alter_column(
+            "file_size", existing_type=sa.Integer(), type_=sa.BigInteger()
+        )
+
+    op.create_table(
+        "upload_sessions",
+        sa.Column("id", sa.String(length=32), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("filename", sa.String(), nullable=False),
+        sa.Column("size", sa.BigInteger(), nullable=False),
+        sa.Column("offset", sa.BigInteger(), nullable=False),
+        sa.Column("mime_type", sa.String(), nullable=True),
+        sa.Column("status", upload_status, nullable=False),
+        sa.Column("claim_token", sa.String(length=32), nullable=True),
+        sa.Column("claimed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("transcription_id", sa.Integer(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["transcription_id"], ["transcriptions.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_upload_sessions_user_id"), "upload_sessions", ["user_id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_upload_sessions_user_id"), table_name="upload_sessions")
+    op.drop_table("upload_sessions")
+    upload_status.drop(op.get_bind(), checkfirst=True)
+    with op.batch_alter_table("transcriptions") as batch_op:
+        batch_op.alter_column(
+            "file_size", existing_type=sa.BigInteger(), type_=sa.Integer()
+        )
@@ -0,0 +1,28 @@
+"""Packed word timings.
+
+Revision ID: 8f87c35de9b5
+Revises: 4cad87171946
+Create Date: 2026-10-18 09:50:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "8f87c35de9b5"
+down_revision = "4cad87171946"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("transcriptions", sa.Column("words", sa.LargeBinary(), nullable=True))
+    op.add_column(
+        "transcription_chunks", sa.Column("words", sa.LargeBinary(), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("transcription_chunks", "words")
+    op.drop_column("transcriptions", "words")
@@ -0,0 +1,47 @@
+"""Transcription chunk checkpoints.
+
+Revision ID: b338b8f0ec2f
+Revises: e7d54c757b00
+Create Date: 2026-10-18 09:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "b338b8f0ec2f"
+down_revision = "e7d54c757b00"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "transcription_chunks",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("transcription_id", sa.Integer(), nullable=False),
+        sa.Column("chunk_index", sa.Integer(), nullable=False),
+        sa.Column("start_time", sa.Float(), nullable=False),
+        sa.Column("end_time", sa.Float(), nullable=False),
+        sa.Column("text", sa.Text(), nullable=True),
+        sa.Column(
+            "completed_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.ForeignKeyConstraint(["transcription_id"], ["transcriptions.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "transcription_id", "chunk_index", name="uq_transcription_chunks_index"
+        ),
+    )
+    op.create_index(
+        op.f("ix_transcription_chunks_id"), "transcription_chunks", ["id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_transcription_chunks_id"), table_name="transcription_chunks")
+    op.drop_table("transcription_chunks")
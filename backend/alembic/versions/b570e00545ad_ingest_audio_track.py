@@ -0,0 +1,36 @@
+"""Extracted audio track and original media status.
+
+Revision ID: b570e00545ad
+Revises: 5904dafe59de
+Create Date: 2026-10-18 09:25:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "b570e00545ad"
+down_revision = "5904dafe59de"
+branch_labels = None
+depends_on = None
+
+media_status = sa.Enum("STORED", "COLD", "DELETED", name="mediastatus")
+
+
+def upgrade() -> None:
+    # add_column não cria o tipo ENUM do PostgreSQL (create_table cria)
+    media_status.create(op.get_bind(), checkfirst=True)
+    op.add_column("transcriptions", sa.Column("audio_path", sa.String(), nullable=True))
+    op.add_column(
+        "transcriptions",
+        sa.Column(
+            "media_status", media_status, nullable=True, server_default="STORED"
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("transcriptions", "media_status")
+    op.drop_column("transcriptions", "audio_path")
+    media_status.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,33 @@
+"""Transcription listing indexes.
+
+Revision ID: e1fe4c274dd3
+Revises: 4b3192271d5d
+Create Date: 2026-10-18 09:35:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "e1fe4c274dd3"
+down_revision = "4b3192271d5d"
+branch_labels = None
+depends_on = None
+
+# Cada filtro da listagem começa por user_id e termina em id (paginação keyset)
+INDEXES = {
+    "ix_transcriptions_user_id_id": ["user_id", "id"],
+    "ix_transcriptions_user_status_id": ["user_id", "status", "id"],
+    "ix_transcriptions_user_case_number_id": ["user_id", "case_number", "id"],
+    "ix_transcriptions_user_created_at_id": ["user_id", "created_at", "id"],
+}
+
+
+def upgrade() -> None:
+    for name, columns in INDEXES.items():
+        op.create_index(name, "transcriptions", columns, unique=False)
+
+
+def downgrade() -> None:
+    for name in INDEXES:
+        op.drop_index(name, table_name="transcriptions")
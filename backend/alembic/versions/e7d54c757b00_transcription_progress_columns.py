@@ -0,0 +1,36 @@
+"""Transcription progress columns.
+
+Revision ID: e7d54c757b00
+Revises:
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "e7d54c757b00"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Bancos criados pelo create_all anterior (users, transcriptions, segments)
+    op.add_column(
+        "transcriptions", sa.Column("total_seconds", sa.Float(), nullable=True)
+    )
+    op.add_column(
+        "transcriptions", sa.Column("processed_seconds", sa.Float(), nullable=True)
+    )
+    op.add_column(
+        "transcriptions",
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("transcriptions", "started_at")
+    op.drop_column("transcriptions", "processed_seconds")
+    op.drop_column("transcriptions", "total_seconds")
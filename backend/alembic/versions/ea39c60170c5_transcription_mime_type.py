@@ -0,0 +1,24 @@
+"""Transcription sniffed MIME type.
+
+Revision ID: ea39c60170c5
+Revises: 1030184ce86c
+Create Date: 2026-10-18 09:15:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "ea39c60170c5"
+down_revision = "1030184ce86c"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("transcriptions", sa.Column("mime_type", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("transcriptions", "mime_type")
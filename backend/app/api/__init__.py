@@ -3,10 +3,14 @@ from fastapi import APIRouter
 from app.api.auth import router as auth_router
 from app.api.transcriptions import router as transcriptions_router
 from app.api.texts import router as texts_router
+from app.api.metrics import router as metrics_router
+from app.api.uploads import router as uploads_router
 
 api_router = APIRouter()
 
 # Include routers
 api_router.include_router(auth_router, prefix="/auth", tags=["auth"])
 api_router.include_router(transcriptions_router, prefix="/transcriptions", tags=["transcriptions"])
-api_router.include_router(texts_router, prefix="/texts", tags=["texts"])
\ No newline at end of file
+api_router.include_router(uploads_router, prefix="/uploads", tags=["uploads"])
+api_router.include_router(texts_router, prefix="/texts", tags=["texts"])
+api_router.include_router(metrics_router, prefix="/metrics", tags=["metrics"])
\ No newline at end of file
@@ -1,24 +1,55 @@
 from datetime import timedelta
-from typing import Any
+from typing import Any, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.database import get_db
+from app.core.executors import run_in_thread
 from app.core.security import (
     create_access_token,
     create_refresh_token,
+    create_stream_token,
     decode_token,
     verify_password,
 )
-from app.schemas.auth import UserCreate, UserLogin, Token, UserResponse, TokenRefresh
+from app.schemas.auth import (
+    StreamToken,
+    UserCreate,
+    UserLogin,
+    Token,
+    UserResponse,
+    TokenRefresh,
+)
+from app.services.user_cache import user_cache
 from app.services.users import get_user_by_email, get_user_by_id, create_user
 
 router = APIRouter()
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(
+    tokenUrl="/api/v1/auth/login", auto_error=False
+)
+
+
+async def _resolve_user(db: AsyncSession, user_id: Optional[str]) -> UserResponse:
+    if user_id is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token inválido")
+
+    # A sessão só obtém conexão do pool na primeira consulta: hits não tocam o banco
+    cached = await user_cache.get(int(user_id))
+    if cached is not None:
+        return cached
+
+    user = await get_user_by_id(db, int(user_id))
+    if user is None or not user.is_active:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Usuário inativo ou não encontrado")
+
+    current = UserResponse.model_validate(user)
+    await user_cache.set(current)
+    return current
 
 
 async def get_current_user(
@@ -28,16 +59,39 @@ async def get_current_user(
     payload = decode_token(token)
     if payload is None or payload.get("type") != "access":
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token inválido")
+    return await _resolve_user(db, payload.get("sub"))
 
-    user_id = payload.get("sub")
-    if user_id is None:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token inválido")
-
-    user = await get_user_by_id(db, int(user_id))
-    if user is None or not user.is_active:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Usuário inativo ou não encontrado")
 
-    return UserResponse.model_validate(user)
+async def get_stream_user(
+    token: Optional[str] = Query(
+        None, description="Token de /auth/stream-token (EventSource)"
+    ),
+    bearer: Optional[str] = Depends(optional_oauth2_scheme),
+    db: AsyncSession = Depends(get_db),
+) -> UserResponse:
+    """
+    Usuário de endpoints de streaming (SSE).
+
+    ``EventSource`` não envia cabeçalhos: o navegador conecta com
+    ``?token=`` obtido em ``POST /auth/stream-token`` (validade de
+    ``STREAM_TOKEN_EXPIRE_SECONDS``, checada só na conexão). Clientes que
+    controlam os cabeçalhos (fetch) seguem usando ``Authorization: Bearer``.
+    """
+    if token is not None:
+        payload, expected = decode_token(token), "stream"
+    elif bearer is not None:
+        payload, expected = decode_token(bearer), "access"
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    if payload is None or payload.get("type") != expected:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Token inválido"
+        )
+    return await _resolve_user(db, payload.get("sub"))
 
 
 @router.post("/register", response_model=UserResponse, status_code=201)
@@ -56,7 +110,9 @@ async def login(
     db: AsyncSession = Depends(get_db),
 ) -> Any:
     user = await get_user_by_email(db, form_data.username)
-    if user is None or not verify_password(form_data.password, user.hashed_password):
+    if user is None or not await run_in_thread(
+        verify_password, form_data.password, user.hashed_password
+    ):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Credenciais inválidas")
 
     access_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -92,6 +148,17 @@ async def refresh_token(body: TokenRefresh) -> Any:
     )
 
 
+@router.post("/stream-token", response_model=StreamToken)
+async def issue_stream_token(
+    current_user: UserResponse = Depends(get_current_user),
+) -> Any:
+    """Token curto para abrir streams SSE via ``EventSource`` (``?token=``)."""
+    return StreamToken(
+        token=create_stream_token(str(current_user.id)),
+        expires_in=settings.STREAM_TOKEN_EXPIRE_SECONDS,
+    )
+
+
 @router.get("/me", response_model=UserResponse)
 async def read_me(current_user: UserResponse = Depends(get_current_user)) -> Any:
     return current_user
@@ -0,0 +1,37 @@
+import secrets
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+router = APIRouter()
+
+metrics_scheme = HTTPBearer(auto_error=False)
+
+
+def require_metrics_token(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(metrics_scheme),
+) -> None:
+    """Acesso só para o scraper interno, com ``METRICS_TOKEN``.
+
+    Sem token configurado o endpoint não existe.
+    """
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if credentials is None or not secrets.compare_digest(
+        credentials.credentials, settings.METRICS_TOKEN
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token inválido",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+@router.get("", dependencies=[Depends(require_metrics_token)])
+async def read_metrics() -> Dict[str, Any]:
+    """Contadores do processo da API (caches, executores)."""
+    return metrics.snapshot()
@@ -8,6 +8,7 @@ import io
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
+from app.core.executors import run_in_process
 from app.api.auth import get_current_user
 from app.schemas.auth import UserResponse
 from app.services.text_processing import (
@@ -53,9 +54,9 @@ async def extract(
     filename = (file.filename or "").lower()
     content_bytes = await file.read()
     if filename.endswith(".pdf"):
-        text = extract_text_from_pdf(content_bytes)
+        text = await run_in_process(extract_text_from_pdf, content_bytes)
     elif filename.endswith(".docx"):
-        text = extract_text_from_docx(content_bytes)
+        text = await run_in_process(extract_text_from_docx, content_bytes)
     else:
         raise HTTPException(status_code=400, detail="Formato não suportado. Envie PDF ou DOCX.")
     text = normalize_text(text)
@@ -99,7 +100,7 @@ async def export_docx(
     db: AsyncSession = Depends(get_db),
 ) -> StreamingResponse:
     meta = {"tribunal": tribunal or "", "comarca": comarca or "", "processo": processo or ""}
-    bytes_out = generate_docx_bytes(title, content, meta)
+    bytes_out = await run_in_process(generate_docx_bytes, title, content, meta)
     return StreamingResponse(
         io.BytesIO(bytes_out),
         media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
@@ -1,78 +1,158 @@
-from typing import Any, List, Optional
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import json
 import os
-from pathlib import Path
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    File,
+    Form,
+)
+from fastapi.responses import FileResponse, StreamingResponse
+from redis.exceptions import RedisError  # type: ignore
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import delete, func, select, tuple_
 
 from app.core.config import settings
-from app.core.database import get_db
-from app.models.transcription import Transcription, TranscriptionStatus, TranscriptionSegment
-from app.api.auth import get_current_user
+from app.core.database import AsyncSessionLocal, get_db
+from app.models.transcription import (
+    MediaStatus,
+    Transcription,
+    TranscriptionChunk,
+    TranscriptionStatus,
+    TranscriptionSegment,
+)
+from app.models.upload import UploadSession
+from app.api.auth import get_current_user, get_stream_user
 from app.schemas.auth import UserResponse
-from app.schemas.transcription import TranscriptionResponse, TranscriptionSegmentResponse
+from app.schemas.transcription import (
+    TranscriptSearchHit,
+    TranscriptWordResponse,
+    TranscriptionResponse,
+    TranscriptionSegmentResponse,
+    TranscriptionSummaryResponse,
+)
 from fastapi import BackgroundTasks
+from app.services.anonymization import Anonymizer, get_anonymizer
+from app.services.blobstore import (
+    blob_path,
+    purge_released_blobs,
+    release_blob,
+    staging_path,
+    store_blob,
+)
+from app.services.exports import (
+    EXPORT_MEDIA_TYPES,
+    ExportFormat,
+    cache_export,
+    export_cache_path,
+    export_version,
+    remove_exports,
+    render_export,
+)
+from app.services.packed import PackedWords
+from app.services.progress import (
+    clear_progress_async,
+    iter_user_events,
+    publish_progress_async,
+    read_progress,
+)
+from app.services.search import search_segments
+from app.services.storage import (
+    StoredUpload,
+    UnsupportedMediaError,
+    UploadTooLargeError,
+    save_upload,
+)
 from app.services.transcription_pipeline import run_transcription_background, enqueue_transcription_job
 
 router = APIRouter()
 
 
-def _ensure_upload_dir() -> None:
-    Path(settings.UPLOAD_PATH).mkdir(parents=True, exist_ok=True)
-
-
-def _validate_extension(filename: str) -> None:
+def validate_extension(filename: str) -> None:
     ext = os.path.splitext(filename)[1].lower()
     if ext not in settings.ALLOWED_AUDIO_EXTENSIONS:
         raise HTTPException(status_code=400, detail="Extensão de arquivo não suportada")
 
 
-@router.post("/upload", response_model=TranscriptionResponse, status_code=201)
-async def upload_transcription(
-    background: BackgroundTasks,
-    title: str = Form(...),
-    file: UploadFile = File(...),
-    db: AsyncSession = Depends(get_db),
-    current_user: UserResponse = Depends(get_current_user),
-) -> Any:
-    _ensure_upload_dir()
-
-    _validate_extension(file.filename)
-
-    # Basic size validation using SpooledTemporaryFile (if available)
-    # Note: Max size enforced by server/proxy typically; we rely on settings for guidance
+def _progress(
+    status: str,
+    processed_seconds: Optional[float],
+    total_seconds: Optional[float],
+    started_at: Optional[datetime],
+) -> Tuple[int, Optional[float]]:
+    """Progresso (0-100) e ETA em segundos a partir dos segundos já transcritos."""
+    if status in (TranscriptionStatus.COMPLETED, TranscriptionStatus.REVIEWED):
+        return 100, 0.0
+    if status != TranscriptionStatus.PROCESSING or not total_seconds:
+        return 0, None
 
-    dest_path = Path(settings.UPLOAD_PATH) / file.filename
+    processed = min(processed_seconds or 0.0, total_seconds)
+    progress = int(processed * 100 / total_seconds)
+    eta_seconds = None
+    if processed > 0 and started_at is not None:
+        if started_at.tzinfo is None:
+            started_at = started_at.replace(tzinfo=timezone.utc)
+        elapsed = (datetime.now(timezone.utc) - started_at).total_seconds()
+        eta_seconds = round(
+            max(0.0, elapsed * (total_seconds - processed) / processed), 1
+        )
+    return progress, eta_seconds
 
-    # Avoid overwrite by appending numeric suffix
-    counter = 1
-    base_name, ext = os.path.splitext(file.filename)
-    while dest_path.exists():
-        dest_path = Path(settings.UPLOAD_PATH) / f"{base_name}_{counter}{ext}"
-        counter += 1
 
-    # Save file to disk
-    content = await file.read()
-    if len(content) > settings.MAX_UPLOAD_SIZE:
-        raise HTTPException(status_code=400, detail="Arquivo excede o tamanho máximo permitido")
+async def register_uploaded_file(
+    db: AsyncSession,
+    background: BackgroundTasks,
+    *,
+    title: str,
+    filename: str,
+    stored: StoredUpload,
+    user_id: int,
+) -> Transcription:
+    """Criar a transcrição de um arquivo recebido e enfileirar o processamento.
 
-    with open(dest_path, "wb") as f:
-        f.write(content)
+    O arquivo temporário vira (ou reaproveita) o blob do conteúdo. Conteúdo
+    já processado com as mesmas opções é reaproveitado pelo worker, que conhece
+    o modelo e a configuração do ASR.
+    """
+    stored = await store_blob(db, stored)
 
     transcription = Transcription(
         title=title,
-        original_filename=file.filename,
-        file_path=str(dest_path),
-        file_size=len(content),
+        original_filename=filename,
+        file_path=str(stored.path),
+        file_size=stored.size,
+        content_hash=stored.content_hash,
+        mime_type=stored.mime_type,
+        # Blob reaproveitado pode estar no armazenamento frio
+        # (ORIGINAL_MEDIA_POLICY="cold")
+        media_status=(
+            MediaStatus.STORED
+            if stored.path == blob_path(stored.content_hash)
+            else MediaStatus.COLD
+        ),
         status=TranscriptionStatus.PENDING,
         language=settings.TRANSCRIPTION_LANGUAGE,
-        user_id=int(current_user.id),
+        user_id=user_id,
     )
 
     db.add(transcription)
     await db.flush()
     await db.refresh(transcription)
+    await publish_progress_async(
+        transcription.id,
+        user_id=user_id,
+        status=TranscriptionStatus.PENDING,
+        stage="queued",
+        created_at=transcription.created_at,
+        segment_count=0,
+    )
 
     # Kick off background transcription: prefer Redis RQ, fallback para BackgroundTasks
     try:
@@ -80,19 +160,175 @@ async def upload_transcription(
     except Exception:
         background.add_task(run_transcription_background, transcription.id)
 
+    return transcription
+
+
+@router.post("/upload", response_model=TranscriptionResponse, status_code=201)
+async def upload_transcription(
+    background: BackgroundTasks,
+    title: str = Form(...),
+    file: UploadFile = File(...),
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user),
+) -> Any:
+    validate_extension(file.filename)
+
+    # Gravar em blocos (hash e tipo na mesma passada), abortando acima do limite
+    try:
+        stored = await save_upload(file, staging_path(), settings.MAX_UPLOAD_SIZE)
+    except UploadTooLargeError:
+        raise HTTPException(
+            status_code=413, detail="Arquivo excede o tamanho máximo permitido"
+        )
+    except UnsupportedMediaError:
+        raise HTTPException(
+            status_code=415, detail="Conteúdo do arquivo não é áudio ou vídeo"
+        )
+
+    transcription = await register_uploaded_file(
+        db,
+        background,
+        title=title,
+        filename=file.filename,
+        stored=stored,
+        user_id=int(current_user.id),
+    )
     return TranscriptionResponse.model_validate(transcription)
 
 
-@router.get("/", response_model=List[TranscriptionResponse])
+# Colunas da listagem: o texto completo e o resumo não saem do banco
+_SUMMARY_COLUMNS = [
+    getattr(Transcription, name) for name in TranscriptionSummaryResponse.model_fields
+]
+
+
+@router.get("/", response_model=List[TranscriptionSummaryResponse])
 async def list_transcriptions(
+    response: Response,
+    cursor: Optional[int] = Query(
+        None, description="Valor de X-Next-Cursor da página anterior"
+    ),
+    limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    status: Optional[TranscriptionStatus] = None,
+    case_number: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
     db: AsyncSession = Depends(get_db),
     current_user: UserResponse = Depends(get_current_user),
 ) -> Any:
-    result = await db.execute(
-        select(Transcription).where(Transcription.user_id == int(current_user.id)).order_by(Transcription.id.desc())
+    """Listar transcrições do usuário, da mais recente para a mais antiga.
+
+    Paginação por cursor (keyset em ``id``): o cabeçalho ``X-Next-Cursor``
+    traz o cursor da próxima página e fica ausente na última.
+    """
+    query = select(*_SUMMARY_COLUMNS).where(
+        Transcription.user_id == int(current_user.id)
+    )
+    if cursor is not None:
+        query = query.where(Transcription.id < cursor)
+    if status is not None:
+        query = query.where(Transcription.status == status)
+    if case_number is not None:
+        query = query.where(Transcription.case_number == case_number)
+    if created_from is not None:
+        query = query.where(Transcription.created_at >= created_from)
+    if created_to is not None:
+        query = query.where(Transcription.created_at < created_to)
+
+    result = await db.execute(query.order_by(Transcription.id.desc()).limit(limit + 1))
+    rows = result.mappings().all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = str(rows[-1]["id"])
+    return [TranscriptionSummaryResponse.model_validate(dict(row)) for row in rows]
+
+
+@router.get("/search", response_model=List[TranscriptSearchHit])
+async def search_transcriptions(
+    q: str = Query(..., min_length=1, max_length=200),
+    case_number: Optional[str] = None,
+    court: Optional[str] = None,
+    limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user),
+) -> Any:
+    """Busca textual nas transcrições do usuário.
+
+    Cada resultado é um segmento, com snippet e ``start_time``/``end_time``
+    para o player ir direto ao trecho. Ordenado por relevância.
+    """
+    hits = await search_segments(
+        db,
+        int(current_user.id),
+        q,
+        case_number=case_number,
+        court=court,
+        limit=limit,
+        offset=offset,
+    )
+    return [TranscriptSearchHit.model_validate(hit) for hit in hits]
+
+
+def _sse(event: Dict[str, Any]) -> str:
+    return f"event: {event['event']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+async def _event_stream(
+    request: Request, user_id: int, snapshot: List[Dict[str, Any]]
+) -> AsyncIterator[str]:
+    # Clientes EventSource reconectam sozinhos após 5 s se o stream cair
+    yield "retry: 5000\n\n"
+    for event in snapshot:
+        yield _sse(event)
+    try:
+        async for event in iter_user_events(user_id, settings.SSE_KEEPALIVE_SECONDS):
+            if await request.is_disconnected():
+                break
+            yield _sse(event) if event is not None else ": keep-alive\n\n"
+    except RedisError:
+        return  # Redis indisponível: encerra o stream e o cliente reconecta
+
+
+@router.get("/events")
+async def stream_transcription_events(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_stream_user),
+) -> StreamingResponse:
+    """Stream (Server-Sent Events) de progresso e segmentos das transcrições do usuário.
+
+    Uma conexão por cliente substitui o polling de ``/status``: eventos
+    "progress" trazem os campos do registro de progresso e eventos
+    "segments" os segmentos de cada chunk recém-gravado. Ao conectar, o
+    estado atual dos jobs em andamento é enviado como eventos "progress".
+    No navegador: ``new EventSource(`/transcriptions/events?token=${token}`)``
+    com o token de ``POST /auth/stream-token``, renovado a cada reconexão.
+    """
+    user_id = int(current_user.id)
+    active = await db.execute(
+        select(Transcription.id).where(
+            Transcription.user_id == user_id,
+            Transcription.status.in_(
+                [TranscriptionStatus.PENDING, TranscriptionStatus.PROCESSING]
+            ),
+        )
+    )
+    snapshot = []
+    for transcription_id in active.scalars().all():
+        record = await read_progress(transcription_id)
+        if record is not None:
+            snapshot.append(
+                {"event": "progress", "transcription_id": transcription_id, **record}
+            )
+    # Devolver a conexão ao pool: o stream pode ficar aberto por horas
+    await db.commit()
+
+    return StreamingResponse(
+        _event_stream(request, user_id, snapshot),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
-    items = result.scalars().all()
-    return [TranscriptionResponse.model_validate(t) for t in items]
 
 
 @router.get("/{transcription_id}", response_model=TranscriptionResponse)
@@ -108,28 +344,240 @@ async def get_transcription(
     return TranscriptionResponse.model_validate(transcription)
 
 
-@router.get("/{transcription_id}/segments", response_model=List[TranscriptionSegmentResponse])
-async def get_transcription_segments(
+@router.delete("/{transcription_id}", status_code=204)
+async def delete_transcription(
     transcription_id: int,
     db: AsyncSession = Depends(get_db),
     current_user: UserResponse = Depends(get_current_user),
-) -> Any:
-    """Obter segmentos detalhados de uma transcrição."""
-    # Verificar se transcrição existe e pertence ao usuário
+) -> Response:
+    """Excluir uma transcrição; o arquivo é apagado quando nenhuma outra o usa."""
     result = await db.execute(select(Transcription).where(Transcription.id == transcription_id))
     transcription: Optional[Transcription] = result.scalar_one_or_none()
     if transcription is None or transcription.user_id != int(current_user.id):
         raise HTTPException(status_code=404, detail="Transcrição não encontrada")
-    
-    # Buscar segmentos ordenados por tempo
-    segments_result = await db.execute(
-        select(TranscriptionSegment)
-        .where(TranscriptionSegment.transcription_id == transcription_id)
-        .order_by(TranscriptionSegment.start_time)
+    if transcription.status == TranscriptionStatus.PROCESSING:
+        raise HTTPException(status_code=409, detail="Transcrição em processamento")
+
+    content_hash = transcription.content_hash
+    await db.execute(
+        delete(TranscriptionSegment).where(
+            TranscriptionSegment.transcription_id == transcription_id
+        )
     )
-    segments = segments_result.scalars().all()
-    
-    return [TranscriptionSegmentResponse.model_validate(segment) for segment in segments]
+    await db.execute(
+        delete(TranscriptionChunk).where(
+            TranscriptionChunk.transcription_id == transcription_id
+        )
+    )
+    await db.execute(
+        delete(UploadSession).where(UploadSession.transcription_id == transcription_id)
+    )
+    await db.execute(delete(Transcription).where(Transcription.id == transcription_id))
+    await clear_progress_async(transcription_id)
+    remove_exports(transcription_id)
+    if content_hash and await release_blob(db, content_hash):
+        # Arquivos só são apagados depois que a remoção estiver commitada
+        await db.commit()
+        await purge_released_blobs(db, [content_hash])
+    return Response(status_code=204)
+
+
+# Duração máxima de um segmento (janela de 30 s do Whisper): limita a busca
+# por segmentos que começam antes da janela e terminam dentro dela
+MAX_SEGMENT_SECONDS = 30.0
+
+_SEGMENT_COLUMNS = [
+    getattr(TranscriptionSegment, name)
+    for name in TranscriptionSegmentResponse.model_fields
+]
+
+
+def _parse_segment_cursor(cursor: str) -> Tuple[float, int]:
+    try:
+        start_time, segment_id = cursor.split("_", 1)
+        return float(start_time), int(segment_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+
+
+@router.get("/{transcription_id}/segments", response_model=List[TranscriptionSegmentResponse])
+async def get_transcription_segments(
+    transcription_id: int,
+    response: Response,
+    from_seconds: Optional[float] = Query(
+        None, alias="from", ge=0, description="Início da janela (s)"
+    ),
+    to_seconds: Optional[float] = Query(
+        None, alias="to", ge=0, description="Fim da janela (s)"
+    ),
+    cursor: Optional[str] = Query(
+        None, description="Valor de X-Next-Cursor da página anterior"
+    ),
+    limit: int = Query(
+        settings.SEGMENT_PAGE_SIZE, ge=1, le=settings.MAX_SEGMENT_PAGE_SIZE
+    ),
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user),
+) -> Any:
+    """Obter segmentos de uma transcrição em ordem de tempo.
+
+    ``from``/``to`` restringem aos segmentos que se sobrepõem à janela (ex.:
+    em volta da posição de reprodução); a paginação é por cursor em
+    (``start_time``, ``id``), com o próximo cursor em ``X-Next-Cursor``.
+    """
+    # Verificar se transcrição existe e pertence ao usuário (sem carregar o texto)
+    owner_id = await db.scalar(
+        select(Transcription.user_id).where(Transcription.id == transcription_id)
+    )
+    if owner_id is None or owner_id != int(current_user.id):
+        raise HTTPException(status_code=404, detail="Transcrição não encontrada")
+
+    query = select(*_SEGMENT_COLUMNS).where(
+        TranscriptionSegment.transcription_id == transcription_id
+    )
+    if from_seconds is not None:
+        query = query.where(
+            TranscriptionSegment.start_time >= from_seconds - MAX_SEGMENT_SECONDS,
+            TranscriptionSegment.end_time > from_seconds,
+        )
+    if to_seconds is not None:
+        query = query.where(TranscriptionSegment.start_time < to_seconds)
+    if cursor is not None:
+        after_start, after_id = _parse_segment_cursor(cursor)
+        query = query.where(
+            tuple_(TranscriptionSegment.start_time, TranscriptionSegment.id)
+            > tuple_(after_start, after_id)
+        )
+
+    result = await db.execute(
+        query.order_by(TranscriptionSegment.start_time, TranscriptionSegment.id).limit(
+            limit + 1
+        )
+    )
+    rows = result.mappings().all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = (
+            f"{rows[-1]['start_time']!r}_{rows[-1]['id']}"
+        )
+    # Linhas já têm o formato da resposta: validadas uma única vez pelo response_model
+    return rows
+
+
+@router.get("/{transcription_id}/words", response_model=List[TranscriptWordResponse])
+async def get_transcription_words(
+    transcription_id: int,
+    from_seconds: float = Query(0.0, alias="from", ge=0, description="Início (s)"),
+    to_seconds: Optional[float] = Query(
+        None, alias="to", ge=0, description="Fim (s); padrão: início + janela máxima"
+    ),
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user),
+) -> Any:
+    """
+    Palavras com timestamps que se sobrepõem à janela (sincronização no player).
+
+    A janela é limitada a ``WORDS_MAX_WINDOW_SECONDS``: audiências longas
+    têm dezenas de milhares de palavras e o player pede trechos.
+    """
+    max_window = settings.WORDS_MAX_WINDOW_SECONDS
+    if to_seconds is None:
+        to_seconds = from_seconds + max_window
+    if to_seconds - from_seconds > max_window:
+        raise HTTPException(
+            status_code=400, detail=f"Janela máxima de {max_window} s"
+        )
+    result = await db.execute(
+        select(Transcription.user_id, Transcription.words).where(
+            Transcription.id == transcription_id
+        )
+    )
+    row = result.first()
+    if row is None or row.user_id != int(current_user.id):
+        raise HTTPException(status_code=404, detail="Transcrição não encontrada")
+    return PackedWords.from_bytes(row.words).window(from_seconds, to_seconds)
+
+
+async def _render_export_stream(
+    transcription_id: int,
+    title: str,
+    fmt: ExportFormat,
+    anonymizer: Optional[Anonymizer],
+) -> AsyncIterator[bytes]:
+    # Sessão própria: a de get_db é encerrada quando o handler retorna,
+    # antes de o StreamingResponse consumir o corpo
+    async with AsyncSessionLocal() as session:
+        async for chunk in render_export(
+            session, transcription_id, title, fmt, anonymizer
+        ):
+            yield chunk
+
+
+@router.get("/{transcription_id}/export")
+async def export_transcription(
+    transcription_id: int,
+    export_format: ExportFormat = Query(ExportFormat.SRT, alias="format"),
+    anonymize: bool = Query(
+        False, description="Mascarar dados pessoais (LGPD) antes de compartilhar"
+    ),
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user),
+) -> Response:
+    """Exportar a transcrição (SRT, WebVTT, TXT ou DOCX) com tempos e falantes.
+
+    O arquivo é gerado em streaming a partir dos segmentos. Exportações de
+    transcrições concluídas ficam em cache em disco, por versão do conteúdo.
+    """
+    result = await db.execute(
+        select(Transcription.user_id, Transcription.title, Transcription.status)
+        .where(Transcription.id == transcription_id)
+    )
+    row = result.first()
+    if row is None or row.user_id != int(current_user.id):
+        raise HTTPException(status_code=404, detail="Transcrição não encontrada")
+
+    media_type = EXPORT_MEDIA_TYPES[export_format]
+    filename = f"transcricao-{transcription_id}.{export_format.value}"
+    anonymizer = get_anonymizer() if anonymize else None
+    cache_path = None
+    if row.status == TranscriptionStatus.COMPLETED:
+        version = await export_version(db, transcription_id)
+        if anonymizer is not None:
+            # Muda com o dicionário de nomes
+            version = f"{version}-{anonymizer.fingerprint}"
+        cache_path = export_cache_path(
+            transcription_id, version, export_format, anonymized=anonymize
+        )
+        if cache_path.exists():
+            return FileResponse(cache_path, media_type=media_type, filename=filename)
+    body = _render_export_stream(transcription_id, row.title, export_format, anonymizer)
+    if cache_path is not None:
+        body = cache_export(body, cache_path)
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+# Estados em que o registro de progresso do worker reflete o banco
+_ACTIVE_STATUSES = {
+    TranscriptionStatus.PENDING.value,
+    TranscriptionStatus.PROCESSING.value,
+}
+
+# Colunas lidas do banco quando não há registro de progresso no Redis
+_STATUS_COLUMNS = [
+    Transcription.user_id,
+    Transcription.status,
+    Transcription.processed_seconds,
+    Transcription.total_seconds,
+    Transcription.duration,
+    Transcription.created_at,
+    Transcription.updated_at,
+    Transcription.started_at,
+    Transcription.completed_at,
+]
 
 
 @router.get("/{transcription_id}/status")
@@ -138,29 +586,59 @@ async def get_transcription_status(
     db: AsyncSession = Depends(get_db),
     current_user: UserResponse = Depends(get_current_user),
 ) -> Any:
-    """Obter status detalhado de uma transcrição (para polling do frontend)."""
-    result = await db.execute(select(Transcription).where(Transcription.id == transcription_id))
-    transcription: Optional[Transcription] = result.scalar_one_or_none()
-    if transcription is None or transcription.user_id != int(current_user.id):
-        raise HTTPException(status_code=404, detail="Transcrição não encontrada")
-    
-    # Calcular progresso estimado baseado no status
-    progress_map = {
-        TranscriptionStatus.PENDING: 0,
-        TranscriptionStatus.PROCESSING: 50,  # Estimar 50% quando processando
-        TranscriptionStatus.COMPLETED: 100,
-        TranscriptionStatus.FAILED: 0,
-        TranscriptionStatus.REVIEWED: 100,
-    }
-    
+    """Obter status detalhado de uma transcrição (para polling do frontend).
+
+    Enquanto o job está na fila ou em processamento responde a partir do
+    registro de progresso que o worker publica no Redis. Depois disso (ou sem
+    o registro) lê algumas colunas e um COUNT no banco: revisão, edição e
+    exclusão acontecem só no banco e o registro terminal ficaria desatualizado.
+    Em ambos os casos o custo não depende do número de segmentos.
+    """
+    data: Optional[Dict[str, Any]] = await read_progress(transcription_id)
+    if (
+        data is None
+        or data.get("user_id") != int(current_user.id)
+        or data.get("status") not in _ACTIVE_STATUSES
+    ):
+        row = (
+            (
+                await db.execute(
+                    select(*_STATUS_COLUMNS).where(Transcription.id == transcription_id)
+                )
+            )
+            .mappings()
+            .one_or_none()
+        )
+        if row is None or row["user_id"] != int(current_user.id):
+            raise HTTPException(status_code=404, detail="Transcrição não encontrada")
+        data = dict(row)
+        data["segment_count"] = await db.scalar(
+            select(func.count()).select_from(TranscriptionSegment).where(
+                TranscriptionSegment.transcription_id == transcription_id
+            )
+        )
+
+    status = TranscriptionStatus(data["status"])
+    progress, eta_seconds = _progress(
+        status,
+        data.get("processed_seconds"),
+        data.get("total_seconds"),
+        data.get("started_at"),
+    )
+    segment_count = data.get("segment_count") or 0
     return {
-        "id": transcription.id,
-        "status": transcription.status,
-        "progress": progress_map.get(transcription.status, 0),
-        "duration": transcription.duration,
-        "created_at": transcription.created_at,
-        "updated_at": transcription.updated_at,
-        "completed_at": transcription.completed_at,
-        "has_segments": len(transcription.segments or []) > 0,
-        "segment_count": len(transcription.segments or [])
+        "id": transcription_id,
+        "status": status,
+        "stage": data.get("stage"),
+        "progress": progress,
+        "processed_seconds": data.get("processed_seconds"),
+        "total_seconds": data.get("total_seconds"),
+        "eta_seconds": eta_seconds,
+        "duration": data.get("duration"),
+        "created_at": data.get("created_at"),
+        "updated_at": data.get("updated_at"),
+        "started_at": data.get("started_at"),
+        "completed_at": data.get("completed_at"),
+        "has_segments": segment_count > 0,
+        "segment_count": segment_count,
     }
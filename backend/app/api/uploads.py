@@ -0,0 +1,276 @@
+"""Upload retomável (no estilo tus) para gravações grandes.
+
+Fluxo: ``POST /uploads`` cria o upload com o tamanho total; ``PATCH
+/uploads/{id}`` envia bytes a partir do cabeçalho ``Upload-Offset``;
+``HEAD /uploads/{id}`` informa o offset atual para retomar após falhas; e
+``POST /uploads/{id}/complete`` cria a transcrição. Uploads abandonados são
+removidos pelo reaper após ``UPLOAD_SESSION_TTL_HOURS``.
+"""
+import uuid
+from typing import Any, Dict, Optional
+
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    Header,
+    HTTPException,
+    Request,
+    Response,
+)
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.auth import get_current_user
+from app.api.transcriptions import register_uploaded_file, validate_extension
+from app.core.config import settings
+from app.core.database import get_db
+from app.models.transcription import Transcription
+from app.models.upload import UploadSession, UploadStatus
+from app.schemas.auth import UserResponse
+from app.schemas.transcription import TranscriptionResponse
+from app.schemas.upload import UploadCreate, UploadResponse
+from app.services.storage import (
+    PartResult,
+    UnsupportedMediaError,
+    UploadTooLargeError,
+    append_upload_part,
+    discard_upload,
+    finalize_upload,
+    partial_upload_path,
+)
+from app.services.uploads import claim_upload, claimable, release_upload
+
+router = APIRouter()
+
+
+async def _get_upload(
+    db: AsyncSession, upload_id: str, user: UserResponse
+) -> UploadSession:
+    result = await db.execute(
+        select(UploadSession).where(UploadSession.id == upload_id)
+    )
+    upload: Optional[UploadSession] = result.scalar_one_or_none()
+    if upload is None or upload.user_id != int(user.id):
+        raise HTTPException(status_code=404, detail="Upload não encontrado")
+    return upload
+
+
+def _offset_headers(upload: UploadSession) -> Dict[str, str]:
+    return {
+        "Upload-Offset": str(upload.offset),
+        "Upload-Length": str(upload.size),
+        "Cache-Control": "no-store",
+    }
+
+
+@router.post("", response_model=UploadResponse, status_code=201)
+async def create_upload(
+    payload: UploadCreate,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user),
+) -> Any:
+    validate_extension(payload.filename)
+    if payload.size > settings.MAX_RESUMABLE_UPLOAD_SIZE:
+        raise HTTPException(
+            status_code=413, detail="Arquivo excede o tamanho máximo permitido"
+        )
+
+    upload = UploadSession(
+        id=uuid.uuid4().hex,
+        user_id=int(current_user.id),
+        title=payload.title,
+        filename=payload.filename,
+        size=payload.size,
+        offset=0,
+    )
+    db.add(upload)
+    await db.flush()
+    await db.refresh(upload)
+
+    response.headers["Location"] = f"{settings.API_V1_PREFIX}/uploads/{upload.id}"
+    response.headers.update(_offset_headers(upload))
+    return UploadResponse.model_validate(upload)
+
+
+@router.head("/{upload_id}")
+async def get_upload_offset(
+    upload_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user),
+) -> Response:
+    """Offset atual, para o cliente retomar de onde parou."""
+    upload = await _get_upload(db, upload_id, current_user)
+    return Response(status_code=200, headers=_offset_headers(upload))
+
+
+@router.get("/{upload_id}", response_model=UploadResponse)
+async def get_upload(
+    upload_id: str,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user),
+) -> Any:
+    upload = await _get_upload(db, upload_id, current_user)
+    response.headers.update(_offset_headers(upload))
+    return UploadResponse.model_validate(upload)
+
+
+@router.patch("/{upload_id}", status_code=204)
+async def upload_part(
+    upload_id: str,
+    request: Request,
+    upload_offset: int = Header(..., alias="Upload-Offset"),
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user),
+) -> Response:
+    """
+    Gravar os bytes do corpo a partir de ``Upload-Offset``.
+
+    O corpo é consumido em streaming e gravado direto no arquivo parcial. Se
+    a conexão cair, os bytes recebidos ficam registrados e o próximo PATCH
+    continua do novo offset (consultado via HEAD). O upload é reservado no
+    banco durante a gravação: PATCHs concorrentes (em qualquer worker)
+    recebem 409.
+    """
+    upload = await _get_upload(db, upload_id, current_user)
+    if upload.status == UploadStatus.COMPLETED:
+        raise HTTPException(status_code=409, detail="Upload já finalizado")
+
+    token = await claim_upload(db, upload_id, UploadStatus.WRITING, upload_offset)
+    if token is None:
+        await db.refresh(upload)
+        detail = (
+            "Offset divergente"
+            if upload.offset != upload_offset
+            else "Upload em uso por outra requisição"
+        )
+        raise HTTPException(
+            status_code=409, detail=detail, headers=_offset_headers(upload)
+        )
+
+    part = PartResult(written=0)
+    try:
+        await append_upload_part(
+            upload_id, upload_offset, request.stream(), upload.size, part
+        )
+    except UploadTooLargeError:
+        raise HTTPException(
+            status_code=413, detail="Parte ultrapassa o tamanho declarado do upload"
+        )
+    except UnsupportedMediaError:
+        raise HTTPException(
+            status_code=415, detail="Conteúdo do arquivo não é áudio ou vídeo"
+        )
+    finally:
+        await release_upload(
+            db, upload_id, token, written=part.written, mime_type=part.mime_type
+        )
+
+    await db.refresh(upload)
+    return Response(status_code=204, headers=_offset_headers(upload))
+
+
+async def _completed_transcription(
+    db: AsyncSession, upload: UploadSession
+) -> TranscriptionResponse:
+    transcription = await db.get(Transcription, upload.transcription_id)
+    return TranscriptionResponse.model_validate(transcription)
+
+
+@router.post(
+    "/{upload_id}/complete", response_model=TranscriptionResponse, status_code=201
+)
+async def complete_upload(
+    upload_id: str,
+    background: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user),
+) -> Any:
+    """
+    Guardar o arquivo completo como blob e criar a transcrição.
+
+    Idempotente: repetições (retry do cliente) devolvem a transcrição já
+    criada; enquanto outra requisição finaliza o upload a resposta é 409.
+    """
+    upload = await _get_upload(db, upload_id, current_user)
+    if upload.status == UploadStatus.COMPLETED:
+        return await _completed_transcription(db, upload)
+    if upload.offset != upload.size:
+        raise HTTPException(
+            status_code=409, detail="Upload incompleto", headers=_offset_headers(upload)
+        )
+
+    token = await claim_upload(db, upload_id, UploadStatus.COMPLETING, upload.size)
+    if token is None:
+        await db.refresh(upload)
+        if upload.status == UploadStatus.COMPLETED:
+            return await _completed_transcription(db, upload)
+        raise HTTPException(
+            status_code=409,
+            detail="Upload em uso por outra requisição",
+            headers=_offset_headers(upload),
+        )
+
+    try:
+        stored = await finalize_upload(upload_id, upload.size, upload.mime_type)
+        transcription = await register_uploaded_file(
+            db,
+            background,
+            title=upload.title,
+            filename=upload.filename,
+            stored=stored,
+            user_id=upload.user_id,
+        )
+        await db.execute(
+            update(UploadSession)
+            .where(UploadSession.id == upload_id, UploadSession.claim_token == token)
+            .values(
+                status=UploadStatus.COMPLETED,
+                transcription_id=transcription.id,
+                claim_token=None,
+                claimed_at=None,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+    except BaseException:
+        await db.rollback()
+        # store_blob pode já ter movido o arquivo parcial: sem ele o upload
+        # recomeça do zero, em vez de ficar completo e impossível de finalizar
+        restart = not partial_upload_path(upload_id).exists()
+        await release_upload(db, upload_id, token, restart=restart)
+        raise
+    return TranscriptionResponse.model_validate(transcription)
+
+
+@router.delete("/{upload_id}", status_code=204)
+async def cancel_upload(
+    upload_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user),
+) -> Response:
+    """Cancelar um upload e remover o arquivo parcial.
+
+    Responde 409 enquanto um PATCH ou a finalização estiver em andamento.
+    """
+    upload = await _get_upload(db, upload_id, current_user)
+    finalized = upload.status == UploadStatus.COMPLETED
+    result = await db.execute(
+        delete(UploadSession)
+        .where(
+            UploadSession.id == upload_id,
+            UploadSession.status == upload.status,
+            or_(UploadSession.status == UploadStatus.COMPLETED, claimable()),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        raise HTTPException(
+            status_code=409, detail="Upload em uso por outra requisição"
+        )
+    await db.commit()
+    if not finalized:
+        await discard_upload(upload_id)
+    return Response(status_code=204)
@@ -14,6 +14,15 @@ class Settings(BaseSettings):
     
     # API
     API_V1_PREFIX: str = "/api/v1"
+    DEFAULT_PAGE_SIZE: int = 50  # Itens por página nas listagens paginadas por cursor
+    MAX_PAGE_SIZE: int = 200  # Limite do parâmetro ``limit``
+    # Segmentos por página (editor sincronizado com o áudio)
+    SEGMENT_PAGE_SIZE: int = 500
+    MAX_SEGMENT_PAGE_SIZE: int = 2000
+    # Janela máxima de /words (o player pede trechos)
+    WORDS_MAX_WINDOW_SECONDS: int = 600
+    # Bearer exigido em /metrics (scraper interno); vazio desativa o endpoint
+    METRICS_TOKEN: str = ""
     
     # CORS (use '*' only in development)
     BACKEND_CORS_ORIGINS: List[str] = ["http://localhost:3000", "http://127.0.0.1:3000"]
@@ -35,20 +44,102 @@ class Settings(BaseSettings):
     # Authentication
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    # Token de ?token= do SSE (EventSource não envia cabeçalhos); vale só para conectar
+    STREAM_TOKEN_EXPIRE_SECONDS: int = 60
+    # Validade da identidade do usuário em cache (evita consulta por requisição)
+    USER_CACHE_TTL_SECONDS: int = 60
+    # Usuários no cache LRU do processo (0 desativa)
+    USER_CACHE_MAX_ENTRIES: int = 10000
+    USER_CACHE_REDIS: bool = False  # Compartilhar o cache entre réplicas via Redis
+    
+    # CPU-bound fora do event loop
+    CPU_THREAD_WORKERS: int = 4  # Threads para trabalho que libera o GIL (bcrypt)
+    # Processos para parsing/geração de PDF/DOCX (0 = usar threads)
+    CPU_PROCESS_WORKERS: int = 2
     ALGORITHM: str = "HS256"
     
     # File Upload
     MAX_UPLOAD_SIZE: int = 104857600  # 100MB
     ALLOWED_AUDIO_EXTENSIONS: List[str] = [".mp3", ".wav", ".m4a", ".ogg", ".flac", ".mp4", ".avi", ".mov"]
     UPLOAD_PATH: str = "./uploads"
+    # 10GB, uploads retomáveis (vídeos de audiência)
+    MAX_RESUMABLE_UPLOAD_SIZE: int = 10737418240
+    # PATCH/complete sem conclusão neste prazo (processo morto) libera o upload
+    UPLOAD_CLAIM_TIMEOUT_SECONDS: int = 3600
+    # Uploads retomáveis sem atividade neste prazo são removidos pelo reaper
+    UPLOAD_SESSION_TTL_HOURS: int = 48
+    # Trilha de áudio extraída na ingestão: "opus" (compacto) ou "flac" (sem perdas)
+    INGEST_AUDIO_FORMAT: str = "opus"
+    INGEST_OPUS_BITRATE: str = "32k"  # Bitrate do Opus mono 16 kHz (voz)
+    # Vídeo original após a ingestão: "keep", "cold" (move p/ COLD_STORAGE_PATH) ou
+    # "delete"
+    ORIGINAL_MEDIA_POLICY: str = "keep"
+    # Montar em disco/bucket mais barato em produção
+    COLD_STORAGE_PATH: str = "./uploads/cold"
+    # Exportações (SRT/VTT/TXT/DOCX) de transcrições concluídas
+    EXPORT_CACHE_PATH: str = "./uploads/exports"
+    # Segmentos lidos por lote do cursor ao gerar exportações
+    EXPORT_BATCH_SIZE: int = 1000
     
     # Transcription
+    # "whisper" (openai-whisper), "faster-whisper" (CTranslate2) ou "stub" (testes)
+    ASR_ENGINE: str = "whisper"
+    # Quantização do faster-whisper: "int8", "int8_float16", "float16", "float32"
+    ASR_COMPUTE_TYPE: str = "int8"
+    ASR_BEAM_SIZE: int = 5  # Beam search do faster-whisper
     WHISPER_MODEL: str = "base"
     TRANSCRIPTION_LANGUAGE: str = "pt"
     WHISPER_DEVICE: str = "cpu"  # "cpu" ou "cuda" se GPU disponível
     MAX_CHUNK_MINUTES: int = 30  # Dividir áudios longos em chunks de N minutos
+    ENABLE_VAD: bool = True  # Enviar ao modelo apenas trechos com fala
+    # Margem acima do piso de ruído para considerar fala
+    VAD_ENERGY_MARGIN_DB: float = 12.0
+    # Energia mínima absoluta (dBFS) de um frame de fala
+    VAD_MIN_ENERGY_DB: float = -55.0
+    # Fração mínima da energia na faixa de voz (300-3400 Hz)
+    VAD_SPEECH_BAND_RATIO: float = 0.5
+    VAD_PADDING_SECONDS: float = 0.3  # Margem adicionada a cada região de fala
+    VAD_MIN_SILENCE_SECONDS: float = 1.0  # Pausas menores são unidas à região de fala
+    VAD_MIN_SPEECH_SECONDS: float = 0.25  # Regiões menores são descartadas
+    # Silêncios maiores não são enviados ao modelo
+    VAD_SKIP_SILENCE_SECONDS: float = 10.0
+    # Processos paralelos por job (1 = chunks em sequência)
+    TRANSCRIPTION_WORKERS: int = 1
+    # Threads do torch por processo (0 = núcleos / processos)
+    TRANSCRIPTION_THREADS_PER_WORKER: int = 0
     ENABLE_WORD_TIMESTAMPS: bool = True  # Timestamps detalhados por palavra
+    # Linhas por INSERT executemany ao gravar segmentos
+    SEGMENT_INSERT_BATCH_SIZE: int = 1000
+    # No PostgreSQL, lotes a partir deste tamanho usam COPY
+    SEGMENT_COPY_MIN_ROWS: int = 200
     WHISPER_TEMPERATURE: float = 0.0  # 0.0 = mais conservativo, até 1.0 = mais criativo
+    WHISPER_PRECISION: str = "fp32"  # "fp32" ou "fp16" (fp16 apenas em cuda)
+    # Orçamento de memória para modelos residentes no worker
+    WHISPER_MODEL_POOL_MAX_MB: int = 4096
+    # Modelos carregados na inicialização do worker
+    WHISPER_PRELOAD_MODELS: List[str] = []
+    
+    @field_validator("WHISPER_PRELOAD_MODELS", mode="before")
+    @classmethod
+    def assemble_preload_models(cls, v: Union[str, List[str]]) -> Union[List[str], str]:
+        if isinstance(v, str) and not v.startswith("["):
+            return [i.strip() for i in v.split(",") if i.strip()]
+        return v
+    
+    # Anonimização (LGPD)
+    # Nomes a mascarar (partes, testemunhas), além dos detectores de documentos
+    ANONYMIZATION_NAMES: List[str] = []
+    # Arquivo com um nome por linha (somado a ANONYMIZATION_NAMES)
+    ANONYMIZATION_NAMES_FILE: str = ""
+    
+    @field_validator("ANONYMIZATION_NAMES", mode="before")
+    @classmethod
+    def assemble_anonymization_names(
+        cls, v: Union[str, List[str]]
+    ) -> Union[List[str], str]:
+        if isinstance(v, str) and not v.startswith("["):
+            return [i.strip() for i in v.split(",") if i.strip()]
+        return v
     
     # Email
     SMTP_HOST: str = ""
@@ -58,6 +149,18 @@ class Settings(BaseSettings):
     
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
+    # True = fork por job (modelos não ficam residentes)
+    WORKER_FORK_PER_JOB: bool = False
+    # Validade do registro de progresso publicado pelo worker
+    PROGRESS_TTL_SECONDS: int = 86400
+    SSE_KEEPALIVE_SECONDS: int = 15  # Intervalo dos keep-alives do stream de eventos
+    # Sem renovação neste prazo o job é considerado morto
+    WORKER_HEARTBEAT_TTL_SECONDS: int = 120
+    # Intervalo do reaper de transcrições presas em PROCESSING
+    REAPER_INTERVAL_SECONDS: int = 300
+    # Novas tentativas (retomando de checkpoint) após falha
+    TRANSCRIPTION_MAX_RETRIES: int = 3
+    TRANSCRIPTION_RETRY_INTERVAL_SECONDS: int = 60
     
     # Storage
     USE_S3: bool = False
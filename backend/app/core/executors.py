@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Tuple, TypeVar
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+T = TypeVar("T")
+
+_executors: Dict[str, Executor] = {}
+_pending: Dict[str, int] = {"thread": 0, "process": 0}
+_lock = threading.Lock()
+
+
+def _get_executor(kind: str) -> Tuple[str, Executor]:
+    """Pool do tipo pedido; sem pool de processos configurado, o de threads."""
+    if kind == "process" and settings.CPU_PROCESS_WORKERS <= 0:
+        kind = "thread"
+    with _lock:
+        executor = _executors.get(kind)
+        if executor is None:
+            if kind == "thread":
+                executor = ThreadPoolExecutor(
+                    max_workers=settings.CPU_THREAD_WORKERS, thread_name_prefix="cpu"
+                )
+            else:
+                executor = ProcessPoolExecutor(
+                    max_workers=settings.CPU_PROCESS_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            _executors[kind] = executor
+        return kind, executor
+
+
+def _discard_executor(kind: str, executor: Executor) -> None:
+    with _lock:
+        # Outra chamada pode já ter trocado o pool quebrado
+        if _executors.get(kind) is executor:
+            del _executors[kind]
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def _run(kind: str, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    kind, executor = _get_executor(kind)
+    with _lock:
+        _pending[kind] += 1
+        metrics.set_gauge(f"executor.{kind}.pending", _pending[kind])
+    metrics.incr(f"executor.{kind}.submitted")
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executor, functools.partial(func, *args, **kwargs)
+        )
+    except BrokenProcessPool:
+        # Um worker morreu (OOM, segfault): o pool não aceita mais tarefas.
+        # Descarta-o para que a próxima chamada crie um novo.
+        _discard_executor(kind, executor)
+        metrics.incr(f"executor.{kind}.broken")
+        raise
+    finally:
+        with _lock:
+            _pending[kind] -= 1
+            metrics.set_gauge(f"executor.{kind}.pending", _pending[kind])
+
+
+async def run_in_thread(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Executar trabalho de CPU que libera o GIL (bcrypt, extensões C) em threads."""
+    return await _run("thread", func, *args, **kwargs)
+
+
+async def run_in_process(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Executar trabalho de CPU em Python puro (parsing de PDF/DOCX) em outro processo.
+
+    ``func`` e os argumentos precisam ser serializáveis (funções de módulo).
+    """
+    return await _run("process", func, *args, **kwargs)
+
+
+def shutdown_executors() -> None:
+    with _lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import threading
+from collections import defaultdict
+from typing import Dict, Union
+
+Number = Union[int, float]
+
+
+class Metrics:
+    """Contadores e gauges em memória do processo (expostos em /metrics)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Number] = defaultdict(int)
+        self._gauges: Dict[str, Number] = {}
+
+    def incr(self, name: str, value: Number = 1) -> None:
+        with self._lock:
+            self._counters[name] += value
+
+    def set_gauge(self, name: str, value: Number) -> None:
+        with self._lock:
+            self._gauges[name] = value
+
+    def get(self, name: str) -> Number:
+        with self._lock:
+            return self._counters.get(name, self._gauges.get(name, 0))
+
+    def hit_rate(self, prefix: str) -> float:
+        """Taxa de acerto a partir de ``<prefix>.hits`` e ``<prefix>.misses``."""
+        hits = self.get(f"{prefix}.hits")
+        total = hits + self.get(f"{prefix}.misses")
+        return round(hits / total, 4) if total else 0.0
+
+    def snapshot(self) -> Dict[str, Number]:
+        with self._lock:
+            data: Dict[str, Number] = {**self._counters, **self._gauges}
+        for name in list(data):
+            if name.endswith(".hits"):
+                prefix = name[: -len(".hits")]
+                data[f"{prefix}.hit_rate"] = self.hit_rate(prefix)
+        return dict(sorted(data.items()))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+
+
+metrics = Metrics()
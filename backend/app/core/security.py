@@ -33,6 +33,15 @@ def create_refresh_token(data: Dict[str, Any], expires_delta: Optional[timedelta
     return encoded_jwt
 
 
+def create_stream_token(user_id: str, expires_delta: Optional[timedelta] = None) -> str:
+    """Create short-lived JWT for EventSource streams (sent in the query string)"""
+    expire = datetime.utcnow() + (
+        expires_delta or timedelta(seconds=settings.STREAM_TOKEN_EXPIRE_SECONDS)
+    )
+    to_encode = {"sub": user_id, "exp": expire, "type": "stream"}
+    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify password against hash"""
     return pwd_context.verify(plain_password, hashed_password)
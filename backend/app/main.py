@@ -1,8 +1,10 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.api import api_router
 from app.core.database import engine
+from app.core.executors import shutdown_executors
 from app.models import Base
 
 app = FastAPI(
@@ -21,8 +23,31 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Upload-Offset", "Upload-Length", "Location"],
 )
 
+# Margem para os cabeçalhos multipart e campos do formulário além do arquivo
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+@app.middleware("http")
+async def reject_oversized_uploads(request: Request, call_next):
+    """Recusar uploads pelo Content-Length antes de o corpo ser lido."""
+    content_length = request.headers.get("content-length")
+    if (
+        request.method == "POST"
+        and request.url.path.endswith("/upload")
+        and content_length
+        and content_length.isdigit()
+        and int(content_length) > settings.MAX_UPLOAD_SIZE + MULTIPART_OVERHEAD_BYTES
+    ):
+        return JSONResponse(
+            status_code=413,
+            content={"detail": "Arquivo excede o tamanho máximo permitido"},
+        )
+    return await call_next(request)
+
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
@@ -34,6 +59,11 @@ async def startup_event():
         await conn.run_sync(Base.metadata.create_all)
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    shutdown_executors()
+
+
 @app.get("/")
 async def root():
     return {
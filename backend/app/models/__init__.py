@@ -1,5 +1,19 @@
 from app.core.database import Base
 from app.models.user import User
-from app.models.transcription import Transcription, TranscriptionSegment
+from app.models.transcription import (
+    Transcription,
+    TranscriptionSegment,
+    TranscriptionChunk,
+)
+from app.models.upload import UploadSession
+from app.models.blob import Blob
 
-__all__ = ["Base", "User", "Transcription", "TranscriptionSegment"]
\ No newline at end of file
+__all__ = [
+    "Base",
+    "User",
+    "Transcription",
+    "TranscriptionSegment",
+    "TranscriptionChunk",
+    "UploadSession",
+    "Blob",
+]
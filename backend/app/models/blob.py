@@ -0,0 +1,19 @@
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class Blob(Base):
+    """Content-addressed file shared by every transcription of the same content."""
+
+    __tablename__ = "blobs"
+
+    content_hash = Column(String(64), primary_key=True)  # SHA-256
+    # Sharded path under UPLOAD_PATH/blobs (or cold storage)
+    path = Column(String, nullable=False)
+    size = Column(BigInteger)
+    mime_type = Column(String)
+    # Transcriptions referencing the blob
+    ref_count = Column(Integer, nullable=False, default=0)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,5 +1,20 @@
-from sqlalchemy import Column, Integer, String, Text, Float, DateTime, ForeignKey, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    DDL,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    Float,
+    DateTime,
+    ForeignKey,
+    Enum,
+    Index,
+    UniqueConstraint,
+    event,
+)
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 import enum
 from app.core.database import Base
@@ -13,15 +28,45 @@ class TranscriptionStatus(str, enum.Enum):
     REVIEWED = "reviewed"
 
 
+class MediaStatus(str, enum.Enum):
+    STORED = "stored"  # Original media at file_path (blob store)
+    COLD = "cold"  # Moved to COLD_STORAGE_PATH by ORIGINAL_MEDIA_POLICY
+    # Removed after ingest; file_path keeps the blob location for re-uploads
+    DELETED = "deleted"
+
+
 class Transcription(Base):
     __tablename__ = "transcriptions"
+    # Listing indexes: each filter leads with user_id, ends with id (keyset pagination)
+    __table_args__ = (
+        Index("ix_transcriptions_user_id_id", "user_id", "id"),
+        Index("ix_transcriptions_user_status_id", "user_id", "status", "id"),
+        Index(
+            "ix_transcriptions_user_case_number_id", "user_id", "case_number", "id"
+        ),
+        Index(
+            "ix_transcriptions_user_created_at_id", "user_id", "created_at", "id"
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
     original_filename = Column(String, nullable=False)
     file_path = Column(String, nullable=False)
-    file_size = Column(Integer)
+    # Audio read by the worker: track extracted from video, or the audio upload itself
+    audio_path = Column(String)
+    file_size = Column(BigInteger)
+    content_hash = Column(String(64), index=True)  # SHA-256 of the uploaded file
+    mime_type = Column(String)  # Sniffed from the first bytes of the upload
+    # Whether file_path still exists
+    media_status = Column(Enum(MediaStatus), default=MediaStatus.STORED)
+    # Hash of the ASR options that produced the result
+    asr_fingerprint = Column(String(64))
     duration = Column(Float)  # Duration in seconds
+    # Seconds of audio to transcribe (speech only when VAD is on)
+    total_seconds = Column(Float)
+    # Seconds of audio already transcribed
+    processed_seconds = Column(Float, default=0.0)
     status = Column(Enum(TranscriptionStatus), default=TranscriptionStatus.PENDING)
     language = Column(String, default="pt")
     
@@ -38,18 +83,31 @@ class Transcription(Base):
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    started_at = Column(DateTime(timezone=True))
     completed_at = Column(DateTime(timezone=True))
     
     # Content
     full_text = Column(Text)
     summary = Column(Text)
+    # Packed word timings (app.services.packed), loaded on demand
+    words = deferred(Column(LargeBinary))
     
     # Segments relationship
     segments = relationship("TranscriptionSegment", back_populates="transcription", cascade="all, delete-orphan")
+    chunks = relationship("TranscriptionChunk", cascade="all, delete-orphan")
 
 
 class TranscriptionSegment(Base):
     __tablename__ = "transcription_segments"
+    # Segments of a transcription in time order (time windows and keyset pagination)
+    __table_args__ = (
+        Index(
+            "ix_transcription_segments_transcription_start_id",
+            "transcription_id",
+            "start_time",
+            "id",
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     transcription_id = Column(Integer, ForeignKey("transcriptions.id"), nullable=False)
@@ -64,4 +122,74 @@ class TranscriptionSegment(Base):
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
\ No newline at end of file
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+
+class TranscriptionChunk(Base):
+    """Checkpoint of a transcribed chunk, committed together with its segments."""
+
+    __tablename__ = "transcription_chunks"
+    __table_args__ = (
+        UniqueConstraint(
+            "transcription_id", "chunk_index", name="uq_transcription_chunks_index"
+        ),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    transcription_id = Column(Integer, ForeignKey("transcriptions.id"), nullable=False)
+    chunk_index = Column(Integer, nullable=False)
+    # Chunk start in seconds (original timeline)
+    start_time = Column(Float, nullable=False)
+    end_time = Column(Float, nullable=False)    # Chunk end in seconds
+    text = Column(Text)
+    # Packed word timings of the chunk; merged into Transcription.words at the end
+    words = Column(LargeBinary)
+    completed_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+# Full-text search over segment text. Not mapped on the model: maintained by the
+# database itself, so bulk INSERT/COPY of segments keeps the index current.
+# PostgreSQL: generated tsvector (Portuguese configuration) + GIN index.
+for _statement in (
+    "ALTER TABLE transcription_segments "
+    "ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('portuguese', coalesce(text, ''))) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_transcription_segments_search_vector "
+    "ON transcription_segments USING GIN (search_vector)",
+):
+    event.listen(
+        TranscriptionSegment.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="postgresql"),
+    )
+
+# SQLite (tests): external-content FTS5 table kept in sync by triggers.
+for _statement in (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS transcription_segments_fts USING fts5("
+    "text, content='transcription_segments', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS transcription_segments_fts_insert "
+    "AFTER INSERT ON transcription_segments BEGIN "
+    "INSERT INTO transcription_segments_fts(rowid, text) "
+    "VALUES (new.id, new.text); END",
+    "CREATE TRIGGER IF NOT EXISTS transcription_segments_fts_delete "
+    "AFTER DELETE ON transcription_segments BEGIN "
+    "INSERT INTO transcription_segments_fts(transcription_segments_fts, rowid, text) "
+    "VALUES ('delete', old.id, old.text); END",
+    "CREATE TRIGGER IF NOT EXISTS transcription_segments_fts_update "
+    "AFTER UPDATE OF text ON transcription_segments BEGIN "
+    "INSERT INTO transcription_segments_fts(transcription_segments_fts, rowid, text) "
+    "VALUES ('delete', old.id, old.text); "
+    "INSERT INTO transcription_segments_fts(rowid, text) "
+    "VALUES (new.id, new.text); END",
+):
+    event.listen(
+        TranscriptionSegment.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="sqlite"),
+    )
+event.listen(
+    TranscriptionSegment.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS transcription_segments_fts").execute_if(dialect="sqlite"),
+)
@@ -0,0 +1,49 @@
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Integer,
+    String,
+    DateTime,
+    Enum,
+    ForeignKey,
+)
+from sqlalchemy.sql import func
+import enum
+from app.core.database import Base
+
+
+class UploadStatus(str, enum.Enum):
+    UPLOADING = "uploading"  # Idle, accepting the next part
+    WRITING = "writing"  # A PATCH holds the session while it appends bytes
+    # /complete holds the session while it creates the transcription
+    COMPLETING = "completing"
+    COMPLETED = "completed"
+
+
+class UploadSession(Base):
+    """Resumable upload: bytes are appended at ``offset`` until ``size`` is reached.
+
+    Requests that write (PATCH, complete) claim the row with a conditional
+    UPDATE on ``status``/``offset`` and release it through ``claim_token``,
+    so the guard holds across API workers.
+    """
+
+    __tablename__ = "upload_sessions"
+
+    id = Column(String(32), primary_key=True)  # uuid4 hex
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    title = Column(String, nullable=False)
+    filename = Column(String, nullable=False)
+    size = Column(BigInteger, nullable=False)  # Declared total size in bytes
+    offset = Column(BigInteger, nullable=False, default=0)  # Bytes already stored
+    mime_type = Column(String)  # Sniffed from the first part
+    status = Column(Enum(UploadStatus), nullable=False, default=UploadStatus.UPLOADING)
+    # Identifies the request holding a WRITING/COMPLETING claim
+    claim_token = Column(String(32))
+    # Claims older than UPLOAD_CLAIM_TIMEOUT_SECONDS may be taken over
+    claimed_at = Column(DateTime(timezone=True))
+    # Set when finalized
+    transcription_id = Column(Integer, ForeignKey("transcriptions.id"))
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -38,6 +38,11 @@ class Token(BaseModel):
     expires_in: int
 
 
+class StreamToken(BaseModel):
+    token: str
+    expires_in: int
+
+
 class TokenRefresh(BaseModel):
     refresh_token: str
 
@@ -17,13 +17,40 @@ class TranscriptionSegmentResponse(BaseModel):
         from_attributes = True
 
 
+class TranscriptionSummaryResponse(BaseModel):
+    """Schema da listagem: sem as colunas de texto (``full_text``, ``summary``)."""
+    id: int
+    title: str
+    original_filename: str
+    file_path: str
+    media_status: Optional[str] = None
+    file_size: Optional[int] = None
+    duration: Optional[float] = None
+    total_seconds: Optional[float] = None
+    processed_seconds: Optional[float] = None
+    status: str
+    language: str
+    case_number: Optional[str] = None
+    court: Optional[str] = None
+    hearing_date: Optional[datetime] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
 class TranscriptionResponse(BaseModel):
     id: int
     title: str
     original_filename: str
     file_path: str
+    media_status: Optional[str] = None
     file_size: Optional[int] = None
     duration: Optional[float] = None
+    total_seconds: Optional[float] = None
+    processed_seconds: Optional[float] = None
     status: str
     language: str
     case_number: Optional[str] = None
@@ -42,3 +69,24 @@ class TranscriptionResponse(BaseModel):
 class TranscriptionWithSegmentsResponse(TranscriptionResponse):
     """Schema para transcrição completa com segmentos."""
     segments: List[TranscriptionSegmentResponse] = []
+
+
+class TranscriptSearchHit(BaseModel):
+    """Trecho (segmento) que corresponde à busca, com tempos para o player."""
+    transcription_id: int
+    title: str
+    case_number: Optional[str] = None
+    court: Optional[str] = None
+    segment_id: int
+    start_time: float
+    end_time: float
+    snippet: str
+    rank: float
+
+
+class TranscriptWordResponse(BaseModel):
+    """Palavra com timestamps (tempos na linha do tempo original)."""
+    start: float
+    end: float
+    text: str
+    probability: float
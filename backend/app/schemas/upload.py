@@ -0,0 +1,26 @@
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+class UploadCreate(BaseModel):
+    """Início de um upload retomável."""
+
+    title: str
+    filename: str
+    size: int = Field(..., gt=0)
+
+
+class UploadResponse(BaseModel):
+    id: str
+    title: str
+    filename: str
+    size: int
+    offset: int
+    status: str
+    transcription_id: Optional[int] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
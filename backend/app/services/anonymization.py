@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+
+_DIGIT = re.compile(r"\d")
+_PHONE_PREFIX = re.compile(r"(?:\+55\s?)?(?:\(\d{2}\)\s?|\d{2}\s)")
+
+# Detectores, em ordem de prioridade (o primeiro que casar numa posição vence),
+# agrupados pelo primeiro caractere da ocorrência
+_NUMERIC_DETECTORS: Sequence[Tuple[str, str]] = (
+    # Numeração única CNJ: NNNNNNN-DD.AAAA.J.TR.OOOO
+    ("cnj", r"\d{7}-\d{2}\.\d{4}\.\d\.\d{2}\.\d{4}\b"),
+    ("cnpj", r"\d{2}\.\d{3}\.\d{3}/\d{4}-\d{2}\b"),
+    ("cpf", r"\d{3}\.\d{3}\.\d{3}-\d{2}\b"),
+    ("rg", r"\d{1,2}\.\d{3}\.\d{3}-[\dXx]\b"),
+    # Telefone com DDD, ou celular (9XXXX-XXXX) sem DDD; "2024-2025" não é telefone
+    ("phone", r"(?:(?:\+55\s?)?(?:\(\d{2}\)\s?|\d{2}\s)9?\d{4}|9\d{4})-\d{4}(?![\d-])"),
+    ("cep", r"\d{2}\.?\d{3}-\d{3}(?![\d-])"),
+)
+_WORD_DETECTORS: Sequence[Tuple[str, str]] = (
+    ("email", r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}"),
+    (
+        "oab",
+        r"OAB\s*/?\s*(?:[A-Z]{2}\s*(?:n[º°o.]?\s*)?\d{1,3}\.?\d{3}"
+        r"|(?:n[º°o.]?\s*)?\d{1,3}\.?\d{3}\s*/\s*[A-Z]{2})\b",
+    ),
+    (
+        "bank_account",
+        r"(?i:(?:ag[êe]ncia|ag\.|c/c|conta\s+(?:corrente|poupan[çc]a))"
+        r"\s*(?:n[º°o.]\s*)?\d[\d.]*(?:-[\dXx])?"
+        # "conta" sozinha é comum no texto ("por conta de", "conta 2 versões"):
+        # só vale antes de um número com dígito verificador (12345-6)
+        r"|conta\s*(?:n[º°o.]\s*)?\d[\d.]*-[\dXx])\b",
+    ),
+)
+
+
+def _mask_digits(value: str) -> str:
+    return _DIGIT.sub("*", value)
+
+
+def _mask_email(value: str) -> str:
+    return f"{value[0]}***{value[value.index('@'):]}"
+
+
+def _mask_cnj(value: str) -> str:
+    # Mantém ano, segmento da Justiça e tribunal; oculta número sequencial e origem
+    return f"*******-**{value[10:21]}****"
+
+
+def _mask_phone(value: str) -> str:
+    # Mantém o DDD, se houver
+    ddd = _PHONE_PREFIX.match(value)
+    prefix = ddd.group(0) if ddd else ""
+    return prefix + _mask_digits(value[len(prefix) :])
+
+
+_MASKS: Dict[str, Callable[[str], str]] = {
+    "email": _mask_email,
+    "cnj": _mask_cnj,
+    "cnpj": lambda value: f"{value[:2]}.***.***/****-**",
+    "cpf": lambda value: f"{value[:3]}.***.***-**",
+    "rg": lambda value: re.sub(r"[\dXx]", "*", value),
+    "oab": _mask_digits,
+    "phone": _mask_phone,
+    "cep": _mask_digits,
+    "bank_account": _mask_digits,
+    "name": lambda value: "[NOME]",
+}
+
+
+def _trie_pattern(names: Iterable[str]) -> Optional[str]:
+    """
+    Regex de um trie com os nomes (prefixos compartilhados, como no Aho-Corasick).
+
+    O motor de regex percorre o trie numa única passada junto com os demais
+    detectores; a alternativa mais longa é tentada primeiro.
+    """
+    trie: Dict[str, dict] = {}
+    for name in names:
+        tokens = name.lower().split()
+        if not tokens:
+            continue
+        node = trie
+        for char in " ".join(tokens):
+            node = node.setdefault(char, {})
+        node[""] = {}  # Fim de um nome
+
+    def build(node: Dict[str, dict]) -> str:
+        terminal = "" in node
+        branches = [
+            (r"\s+" if char == " " else re.escape(char)) + build(child)
+            for char, child in sorted(node.items())
+            if char
+        ]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if terminal:
+            return body + "?" if len(branches) > 1 else f"(?:{body})?"
+        return body
+
+    if not trie:
+        return None
+    return r"(?i:" + build(trie) + r")(?!\w)"
+
+
+def _load_names() -> List[str]:
+    names = list(settings.ANONYMIZATION_NAMES)
+    if settings.ANONYMIZATION_NAMES_FILE:
+        path = Path(settings.ANONYMIZATION_NAMES_FILE)
+        names += [
+            line.strip()
+            for line in path.read_text(encoding="utf-8").splitlines()
+            if line.strip()
+        ]
+    return names
+
+
+class Anonymizer:
+    """Mascaramento de dados pessoais numa única passada.
+
+    Todos os detectores (regex e dicionário de nomes) são compilados uma vez
+    num único padrão com grupos nomeados; cada ocorrência é substituída pela
+    máscara do seu tipo.
+    """
+
+    def __init__(self, names: Iterable[str] = ()) -> None:
+        names = sorted({" ".join(name.split()) for name in names if name.strip()})
+        numeric = [f"(?P<{kind}>{pattern})" for kind, pattern in _NUMERIC_DETECTORS]
+        words = [f"(?P<{kind}>{pattern})" for kind, pattern in _WORD_DETECTORS]
+        names_pattern = _trie_pattern(names)
+        if names_pattern:
+            words.append(f"(?P<name>{names_pattern})")
+        # Toda ocorrência começa no início de um token: dentro de palavras e números
+        # a posição é descartada com um único teste; nas demais, o primeiro
+        # caractere escolhe o grupo de detectores a tentar
+        self._pattern = re.compile(
+            r"(?<![\w.%+-])(?:(?=[\d(+])(?:"
+            + "|".join(numeric)
+            + r")|(?=\w)(?:"
+            + "|".join(words)
+            + "))"
+        )
+        # Identifica a configuração (ex.: na chave de cache de exportações anonimizadas)
+        self.fingerprint = hashlib.sha256(
+            self._pattern.pattern.encode("utf-8")
+        ).hexdigest()[:12]
+
+    def _replace(self, match: "re.Match[str]") -> str:
+        kind = match.lastgroup or ""
+        return _MASKS[kind](match.group(kind))
+
+    def anonymize(self, text: str) -> str:
+        if not text:
+            return ""
+        return self._pattern.sub(self._replace, text)
+
+    def anonymize_many(self, texts: Iterable[str]) -> Iterator[str]:
+        """Anonimizar uma sequência de textos (ex.: segmentos) sob demanda, um a um."""
+        for text in texts:
+            yield self.anonymize(text)
+
+
+_anonymizer: Optional[Anonymizer] = None
+_anonymizer_lock = threading.Lock()
+
+
+def get_anonymizer() -> Anonymizer:
+    """Anonimizador do processo, compilado uma vez a partir das configurações."""
+    global _anonymizer
+    if _anonymizer is None:
+        with _anonymizer_lock:
+            if _anonymizer is None:
+                _anonymizer = Anonymizer(_load_names())
+    return _anonymizer
+
+
+def reset_anonymizer() -> None:
+    """Descartar o anonimizador compilado (ex.: dicionário de nomes alterado)."""
+    global _anonymizer
+    with _anonymizer_lock:
+        _anonymizer = None
@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Type
+
+import numpy as np
+import whisper  # type: ignore
+
+from app.core.config import settings
+from app.services.audio import samples_to_seconds
+
+# Tamanho aproximado em memória (fp32) quando não é possível medir os tensores
+_APPROX_MODEL_MB: Dict[str, int] = {
+    "tiny": 150,
+    "base": 290,
+    "small": 970,
+    "medium": 3060,
+    "large": 6170,
+}
+
+# Bytes por parâmetro de cada precisão / compute type
+_BYTES_PER_PARAM: Dict[str, float] = {
+    "fp32": 4.0,
+    "float32": 4.0,
+    "fp16": 2.0,
+    "float16": 2.0,
+    "int8_float16": 1.5,
+    "int8": 1.0,
+}
+
+
+@dataclass
+class WordTiming:
+    word: str
+    start: float
+    end: float
+    probability: float = 0.0
+
+
+@dataclass
+class SegmentResult:
+    id: int
+    start: float
+    end: float
+    text: str
+    no_speech_prob: float = 0.0
+    words: List[WordTiming] = field(default_factory=list)
+
+
+@dataclass
+class TranscriptionResult:
+    """Resultado de um engine para um array de áudio (tempos relativos ao array)."""
+
+    text: str
+    segments: List[SegmentResult]
+    audio_seconds: float = 0.0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def real_time_factor(self) -> float:
+        """Segundos de processamento por segundo de áudio (menor é melhor)."""
+        return self.elapsed_seconds / self.audio_seconds if self.audio_seconds else 0.0
+
+
+def _approx_model_bytes(model_name: str, precision: str) -> int:
+    base_name = model_name.split(".")[0].split("-")[0]
+    fp32_mb = _APPROX_MODEL_MB.get(base_name, _APPROX_MODEL_MB["base"])
+    return int(fp32_mb * 1024 * 1024 * _BYTES_PER_PARAM.get(precision, 4.0) / 4.0)
+
+
+class ASREngine(ABC):
+    """Interface dos engines de transcrição (ASR).
+
+    Um engine carrega um modelo uma vez e transcreve arrays PCM float32 mono
+    16 kHz, devolvendo segmentos e palavras com tempos relativos ao array.
+    Também acumula o throughput (segundos de áudio por segundo de processamento).
+    """
+
+    name = ""
+
+    def __init__(self, model_name: str, device: str, precision: str) -> None:
+        self.model_name = model_name
+        self.device = device
+        self.precision = precision
+        self.audio_seconds_total = 0.0
+        self.elapsed_seconds_total = 0.0
+
+    @abstractmethod
+    def load(self) -> None:
+        """Carregar o modelo em memória."""
+
+    @abstractmethod
+    def _transcribe(
+        self, audio: np.ndarray, options: Dict[str, Any]
+    ) -> TranscriptionResult:
+        """Transcrever o array (implementação do engine)."""
+
+    def transcribe(self, audio: np.ndarray, **options: Any) -> TranscriptionResult:
+        """Transcrever um array ou janela de áudio, registrando o throughput."""
+        started = time.perf_counter()
+        result = self._transcribe(audio, options)
+        result.audio_seconds = samples_to_seconds(len(audio))
+        result.elapsed_seconds = time.perf_counter() - started
+        self.audio_seconds_total += result.audio_seconds
+        self.elapsed_seconds_total += result.elapsed_seconds
+        return result
+
+    def estimate_bytes(self) -> int:
+        """Memória estimada ocupada pelo modelo carregado."""
+        return _approx_model_bytes(self.model_name, self.precision)
+
+    def throughput(self) -> Dict[str, float]:
+        rtf = (
+            self.elapsed_seconds_total / self.audio_seconds_total
+            if self.audio_seconds_total
+            else 0.0
+        )
+        return {
+            "audio_seconds": round(self.audio_seconds_total, 3),
+            "elapsed_seconds": round(self.elapsed_seconds_total, 3),
+            "real_time_factor": round(rtf, 4),
+        }
+
+
+class WhisperEngine(ASREngine):
+    """openai-whisper (PyTorch)."""
+
+    name = "whisper"
+
+    def load(self) -> None:
+        model = whisper.load_model(self.model_name, device=self.device)
+        if self.precision == "fp16" and self.device != "cpu" and hasattr(model, "half"):
+            model = model.half()
+        self.model = model
+
+    def _transcribe(
+        self, audio: np.ndarray, options: Dict[str, Any]
+    ) -> TranscriptionResult:
+        raw = self.model.transcribe(
+            audio, fp16=self.precision == "fp16", verbose=False, **options
+        )
+        segments = [
+            SegmentResult(
+                id=s.get("id", i),
+                start=s["start"],
+                end=s["end"],
+                text=s["text"],
+                no_speech_prob=s.get("no_speech_prob", 0.0),
+                words=[
+                    WordTiming(
+                        w["word"], w["start"], w["end"], w.get("probability", 0.0)
+                    )
+                    for w in s.get("words", [])
+                ],
+            )
+            for i, s in enumerate(raw.get("segments", []))
+        ]
+        return TranscriptionResult(text=raw.get("text", ""), segments=segments)
+
+    def estimate_bytes(self) -> int:
+        try:
+            total = 0
+            for tensor in list(self.model.parameters()) + list(self.model.buffers()):
+                total += tensor.numel() * tensor.element_size()
+            if total > 0:
+                return total
+        except Exception:
+            pass
+        return super().estimate_bytes()
+
+
+class FasterWhisperEngine(ASREngine):
+    """faster-whisper (CTranslate2), com inferência quantizada int8 em CPU."""
+
+    name = "faster-whisper"
+
+    def load(self) -> None:
+        try:
+            from faster_whisper import WhisperModel  # type: ignore
+        except ImportError as exc:  # pragma: no cover
+            raise RuntimeError(
+                "ASR_ENGINE=faster-whisper requer o pacote faster-whisper"
+            ) from exc
+        self.model = WhisperModel(
+            self.model_name,
+            device=self.device,
+            compute_type=self.precision,
+            cpu_threads=settings.TRANSCRIPTION_THREADS_PER_WORKER,
+        )
+
+    def _transcribe(
+        self, audio: np.ndarray, options: Dict[str, Any]
+    ) -> TranscriptionResult:
+        raw_segments, _info = self.model.transcribe(
+            np.ascontiguousarray(audio, dtype=np.float32),
+            language=options.get("language"),
+            word_timestamps=options.get("word_timestamps", False),
+            temperature=options.get("temperature", 0.0),
+            beam_size=settings.ASR_BEAM_SIZE,
+            vad_filter=False,  # silêncios já removidos pelo VAD do pipeline
+        )
+        segments = [
+            SegmentResult(
+                id=s.id,
+                start=s.start,
+                end=s.end,
+                text=s.text,
+                no_speech_prob=s.no_speech_prob,
+                words=[
+                    WordTiming(w.word, w.start, w.end, w.probability)
+                    for w in (s.words or [])
+                ],
+            )
+            for s in raw_segments  # gerador: a inferência acontece aqui
+        ]
+        return TranscriptionResult(
+            text="".join(s.text for s in segments), segments=segments
+        )
+
+
+class StubEngine(ASREngine):
+    """Engine determinístico para testes e benchmarks: um segmento a cada 5 s."""
+
+    name = "stub"
+    segment_seconds = 5.0
+
+    def load(self) -> None:
+        self.model = None
+
+    def _transcribe(
+        self, audio: np.ndarray, options: Dict[str, Any]
+    ) -> TranscriptionResult:
+        duration = samples_to_seconds(len(audio))
+        segments: List[SegmentResult] = []
+        start = 0.0
+        while start < duration:
+            end = min(start + self.segment_seconds, duration)
+            index = len(segments)
+            words = [f"trecho{index + 1}", "de", "teste"]
+            step = (end - start) / len(words)
+            segments.append(
+                SegmentResult(
+                    id=index,
+                    start=start,
+                    end=end,
+                    text=" " + " ".join(words),
+                    words=[
+                        WordTiming(
+                            " " + w, start + j * step, start + (j + 1) * step, 1.0
+                        )
+                        for j, w in enumerate(words)
+                    ],
+                )
+            )
+            start = end
+        return TranscriptionResult(
+            text="".join(s.text for s in segments), segments=segments
+        )
+
+    def estimate_bytes(self) -> int:
+        return 0
+
+
+ENGINES: Dict[str, Type[ASREngine]] = {
+    WhisperEngine.name: WhisperEngine,
+    FasterWhisperEngine.name: FasterWhisperEngine,
+    StubEngine.name: StubEngine,
+}
+
+
+def default_precision(engine_name: Optional[str] = None) -> str:
+    """Precisão padrão do engine configurado (compute type no faster-whisper)."""
+    if (engine_name or settings.ASR_ENGINE) == FasterWhisperEngine.name:
+        return settings.ASR_COMPUTE_TYPE
+    return settings.WHISPER_PRECISION
+
+
+def create_engine(
+    model_name: str, device: str, precision: str, engine_name: Optional[str] = None
+) -> ASREngine:
+    """Instanciar (sem carregar) o engine configurado em ``ASR_ENGINE``."""
+    name = engine_name or settings.ASR_ENGINE
+    engine_cls = ENGINES.get(name)
+    if engine_cls is None:
+        raise ValueError(f"ASR_ENGINE desconhecido: {name}")
+    return engine_cls(model_name, device, precision)
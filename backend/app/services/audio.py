@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import List, Tuple
+
+import ffmpeg  # type: ignore
+import numpy as np
+
+# Taxa de amostragem nativa do Whisper
+SAMPLE_RATE = 16000
+
+# Extensão do cache PCM (float32 mono 16 kHz, sem cabeçalho) gravado ao lado do upload
+PCM_SUFFIX = ".f32"
+
+
+def pcm_path_for(file_path: str, key: str = "") -> Path:
+    """Caminho do cache PCM de um arquivo de áudio/vídeo.
+
+    ``key`` (ex.: id da transcrição) separa o cache de jobs que compartilham
+    o mesmo arquivo armazenado.
+    """
+    path = Path(file_path)
+    return path.with_name(
+        f"{path.name}.{key}{PCM_SUFFIX}" if key else path.name + PCM_SUFFIX
+    )
+
+
+def decode_to_pcm(file_path: str, key: str = "") -> Path:
+    """
+    Decodificar o arquivo uma única vez para PCM float32 mono 16 kHz em disco.
+
+    O ffmpeg grava direto no arquivo de destino (sem passar pela memória do
+    worker); o rename atômico garante que um cache existente está completo,
+    então decodificações seguintes do mesmo arquivo são reaproveitadas.
+    """
+    dest = pcm_path_for(file_path, key)
+    if dest.exists():
+        return dest
+
+    tmp = dest.with_name(f"{dest.name}.{os.getpid()}.tmp")
+    (
+        ffmpeg.input(file_path)
+        .output(str(tmp), vn=None, ac=1, ar=SAMPLE_RATE, acodec="pcm_f32le", f="f32le")
+        .overwrite_output()
+        .run(quiet=True)
+    )
+    os.replace(tmp, dest)
+    return dest
+
+
+def transcode_audio(
+    file_path: str, dest: Path, audio_format: str, bitrate: str = "32k"
+) -> Path:
+    """
+    Extrair a primeira trilha de áudio para um arquivo mono 16 kHz compacto.
+
+    ``audio_format`` é "opus" (Ogg/Opus, perfil de voz) ou "flac". Vídeo e
+    demais trilhas são descartados; a gravação é atômica como no cache PCM.
+    """
+    tmp = dest.with_name(f"{dest.name}.{os.getpid()}.tmp")
+    if audio_format == "opus":
+        # compression_level 5: ~1/3 do tempo de CPU do padrão (10) com o mesmo tamanho
+        codec = {
+            "acodec": "libopus",
+            "audio_bitrate": bitrate,
+            "application": "voip",
+            "compression_level": 5,
+            "f": "ogg",
+        }
+    elif audio_format == "flac":
+        codec = {"acodec": "flac", "sample_fmt": "s16", "f": "flac"}
+    else:
+        raise ValueError(f"Formato de ingestão não suportado: {audio_format}")
+    (
+        ffmpeg.input(file_path)
+        .output(str(tmp), map="0:a:0", vn=None, ac=1, ar=SAMPLE_RATE, **codec)
+        .overwrite_output()
+        .run(quiet=True)
+    )
+    os.replace(tmp, dest)
+    return dest
+
+
+def load_pcm(pcm_path: str, writable: bool = False) -> np.ndarray:
+    """
+    Mapear o cache PCM em memória, sem ler o arquivo.
+
+    Com ``writable=True`` o mapeamento é copy-on-write: fatias continuam
+    sendo views sem cópia, mas consumidores que exigem arrays graváveis
+    (ex.: ``torch.from_numpy``) não emitem avisos e nada volta ao disco.
+    """
+    if os.path.getsize(pcm_path) == 0:
+        return np.zeros(0, dtype=np.float32)
+    return np.memmap(pcm_path, dtype=np.float32, mode="c" if writable else "r")
+
+
+def samples_to_seconds(num_samples: int) -> float:
+    return num_samples / SAMPLE_RATE
+
+
+def plan_chunks(num_samples: int, max_chunk_seconds: float) -> List[Tuple[int, int]]:
+    """Intervalos [início, fim) em amostras de no máximo ``max_chunk_seconds``."""
+    chunk_samples = max(1, int(max_chunk_seconds * SAMPLE_RATE))
+    if num_samples <= chunk_samples:
+        return [(0, num_samples)]
+    return [
+        (start, min(start + chunk_samples, num_samples))
+        for start in range(0, num_samples, chunk_samples)
+    ]
+
+
+def remove_pcm(file_path: str, key: str = "") -> None:
+    """Remover o cache PCM de um arquivo (ignora ausência)."""
+    try:
+        pcm_path_for(file_path, key).unlink()
+    except OSError:
+        pass
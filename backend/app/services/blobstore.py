@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import os
+import uuid
+from dataclasses import replace
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.models.blob import Blob
+from app.models.transcription import MediaStatus, Transcription
+from app.services.storage import StoredUpload
+
+
+def shard_path(root: Path, content_hash: str, suffix: str = "") -> Path:
+    """``root/ab/cd/abcd...``: dois níveis de 256 diretórios mantêm cada um pequeno."""
+    return root / content_hash[:2] / content_hash[2:4] / f"{content_hash}{suffix}"
+
+
+def blob_path(content_hash: str) -> Path:
+    return shard_path(Path(settings.UPLOAD_PATH) / "blobs", content_hash)
+
+
+def staging_path() -> Path:
+    """Arquivo temporário para um upload em andamento (mesmo disco dos blobs)."""
+    directory = Path(settings.UPLOAD_PATH) / "tmp"
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory / uuid.uuid4().hex
+
+
+async def _acquire(db: AsyncSession, staged: StoredUpload) -> Blob:
+    result = await db.execute(
+        update(Blob)
+        .where(Blob.content_hash == staged.content_hash)
+        .values(ref_count=Blob.ref_count + 1)
+    )
+    if result.rowcount == 0:
+        try:
+            async with db.begin_nested():
+                db.add(
+                    Blob(
+                        content_hash=staged.content_hash,
+                        path=str(blob_path(staged.content_hash)),
+                        size=staged.size,
+                        mime_type=staged.mime_type,
+                        ref_count=1,
+                    )
+                )
+        except IntegrityError:
+            # Upload concorrente do mesmo conteúdo criou o registro primeiro
+            return await _acquire(db, staged)
+    return await _get_blob(db, staged.content_hash)
+
+
+async def _get_blob(db: AsyncSession, content_hash: str) -> Optional[Blob]:
+    result = await db.execute(
+        select(Blob)
+        .where(Blob.content_hash == content_hash)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one_or_none()
+
+
+async def store_blob(db: AsyncSession, staged: StoredUpload) -> StoredUpload:
+    """
+    Registrar uma referência ao conteúdo e mover o arquivo temporário para o blob.
+
+    O arquivo vai para ``UPLOAD_PATH/blobs/<ab>/<cd>/<hash>`` por rename atômico;
+    se o blob já existe a cópia temporária é descartada. O nome original fica
+    apenas como metadado da transcrição.
+    """
+    blob = await _acquire(db, staged)
+    if os.path.exists(blob.path):
+        staged.path.unlink(missing_ok=True)
+        metrics.incr("upload_dedupe.files")
+    else:
+        # Blob novo ou arquivo removido pela política de originais ("delete" mantém
+        # Blob.path apontando para o arquivo apagado): recolocar no shard
+        dest = blob_path(staged.content_hash)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(staged.path, dest)
+        blob.path = str(dest)
+        await db.execute(
+            update(Transcription)
+            .where(Transcription.content_hash == staged.content_hash)
+            .values(file_path=blob.path, media_status=MediaStatus.STORED)
+        )
+    return replace(staged, path=Path(blob.path))
+
+
+async def release_blob(db: AsyncSession, content_hash: str) -> bool:
+    """
+    Remover uma referência ao conteúdo.
+
+    Nada é apagado aqui: o arquivo só pode sumir depois que a transação que
+    removeu a última referência for commitada (um rollback a manteria). Quem
+    chama executa ``purge_released_blobs`` após o commit; o reaper faz o
+    mesmo para blobs que ficaram sem referência. Retorna True quando não
+    restam referências.
+    """
+    await db.execute(
+        update(Blob)
+        .where(Blob.content_hash == content_hash)
+        .values(ref_count=Blob.ref_count - 1)
+    )
+    blob = await _get_blob(db, content_hash)
+    return blob is not None and blob.ref_count <= 0
+
+
+async def purge_released_blobs(
+    db: AsyncSession, content_hashes: Optional[Iterable[str]] = None
+) -> List[str]:
+    """
+    Apagar arquivo, trilhas de ingestão e registro dos blobs sem referências.
+
+    Cada blob é apagado em uma transação própria, com a linha bloqueada: um
+    upload concorrente do mesmo conteúdo espera o commit e recria o blob. Se
+    o commit falhar depois do arquivo removido, a linha volta com
+    ``ref_count`` 0 e ``store_blob`` recoloca o arquivo no próximo upload.
+    Sem ``content_hashes`` varre todos os blobs sem referência.
+    """
+    from app.services.ingest import remove_ingested_audio  # ingest importa este módulo
+
+    if content_hashes is None:
+        result = await db.execute(select(Blob.content_hash).where(Blob.ref_count <= 0))
+        content_hashes = list(result.scalars())
+    purged: List[str] = []
+    for content_hash in content_hashes:
+        result = await db.execute(
+            select(Blob.path)
+            .where(Blob.content_hash == content_hash, Blob.ref_count <= 0)
+            .with_for_update()
+        )
+        path = result.scalar_one_or_none()
+        if path is None:
+            await db.rollback()
+            continue
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        remove_ingested_audio(content_hash)
+        await db.execute(delete(Blob).where(Blob.content_hash == content_hash))
+        await db.commit()
+        purged.append(content_hash)
+    if purged:
+        metrics.incr("blobs.purged", len(purged))
+    return purged
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Callable, Optional
+
+from sqlalchemy import insert, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import func
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.models.transcription import (
+    Transcription,
+    TranscriptionSegment,
+    TranscriptionStatus,
+)
+
+
+def asr_fingerprint(model_name: str) -> str:
+    """Hash das configurações que influenciam o resultado da transcrição.
+
+    Junto com o hash do conteúdo forma a chave do cache: o mesmo arquivo com
+    outro engine, modelo, idioma, parâmetros de decodificação (beam,
+    temperatura) ou opções de VAD/chunk gera outra chave. Calculado no worker,
+    com o modelo que ele de fato resolveu e a configuração dele.
+    """
+    options = {
+        "engine": settings.ASR_ENGINE,
+        "model": model_name,
+        "precision": settings.WHISPER_PRECISION,
+        "compute_type": settings.ASR_COMPUTE_TYPE,
+        "device": settings.WHISPER_DEVICE,
+        "beam_size": settings.ASR_BEAM_SIZE,
+        "language": settings.TRANSCRIPTION_LANGUAGE,
+        "word_timestamps": settings.ENABLE_WORD_TIMESTAMPS,
+        "temperature": settings.WHISPER_TEMPERATURE,
+        "max_chunk_minutes": settings.MAX_CHUNK_MINUTES,
+        "vad": settings.ENABLE_VAD
+        and {
+            "margin_db": settings.VAD_ENERGY_MARGIN_DB,
+            "min_energy_db": settings.VAD_MIN_ENERGY_DB,
+            "band_ratio": settings.VAD_SPEECH_BAND_RATIO,
+            "padding": settings.VAD_PADDING_SECONDS,
+            "min_silence": settings.VAD_MIN_SILENCE_SECONDS,
+            "min_speech": settings.VAD_MIN_SPEECH_SECONDS,
+            "skip_silence": settings.VAD_SKIP_SILENCE_SECONDS,
+        },
+    }
+    return hashlib.sha256(json.dumps(options, sort_keys=True).encode()).hexdigest()
+
+
+async def find_cached_result(
+    db: AsyncSession,
+    transcription: Transcription,
+    model_for_duration: Callable[[Optional[float]], str],
+) -> Optional[Transcription]:
+    """Transcrição concluída do mesmo conteúdo com as mesmas opções, se houver.
+
+    O modelo depende da duração, que é a mesma para o mesmo conteúdo: a duração
+    de um resultado anterior indica o modelo que este arquivo usaria, e o
+    fingerprint resultante é comparado ao gravado pelo worker que o produziu.
+    Apenas resultados COMPLETED: transcrições revisadas contêm edições do usuário.
+    """
+    completed = (
+        Transcription.content_hash == transcription.content_hash,
+        Transcription.status == TranscriptionStatus.COMPLETED,
+        Transcription.id != transcription.id,
+    )
+    cached = None
+    duration = None
+    if transcription.content_hash:
+        duration = await db.scalar(
+            select(Transcription.duration)
+            .where(*completed, Transcription.duration.is_not(None))
+            .limit(1)
+        )
+    if duration is not None:
+        fingerprint = asr_fingerprint(model_for_duration(duration))
+        result = await db.execute(
+            select(Transcription)
+            .where(*completed, Transcription.asr_fingerprint == fingerprint)
+            .order_by(Transcription.id.desc())
+            .limit(1)
+        )
+        cached = result.scalar_one_or_none()
+    metrics.incr(
+        "transcription_cache.hits"
+        if cached is not None
+        else "transcription_cache.misses"
+    )
+    return cached
+
+
+async def clone_transcription_result(
+    db: AsyncSession, source: Transcription, target: Transcription
+) -> None:
+    """Copiar texto e segmentos de ``source`` para ``target`` sem rodar o ASR.
+
+    Os segmentos são copiados no banco (INSERT ... SELECT), sem passar pelo Python.
+    """
+    target.duration = source.duration
+    target.total_seconds = source.total_seconds
+    target.processed_seconds = source.processed_seconds
+    target.full_text = source.full_text
+    target.asr_fingerprint = source.asr_fingerprint
+    target.words = await db.scalar(
+        select(Transcription.words).where(Transcription.id == source.id)
+    )
+    target.status = TranscriptionStatus.COMPLETED
+    target.started_at = func.now()
+    target.completed_at = func.now()
+    await db.flush()
+
+    columns = ["start_time", "end_time", "text", "speaker", "confidence"]
+    await db.execute(
+        insert(TranscriptionSegment).from_select(
+            ["transcription_id", *columns],
+            select(
+                literal(target.id), *(getattr(TranscriptionSegment, c) for c in columns)
+            )
+            .where(TranscriptionSegment.transcription_id == source.id)
+            .order_by(TranscriptionSegment.start_time),
+        )
+    )
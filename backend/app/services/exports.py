@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import enum
+import hashlib
+import os
+import shutil
+import uuid
+import zipfile
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+)
+from xml.sax.saxutils import escape
+
+import aiofiles
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.transcription import Transcription, TranscriptionSegment
+from app.services.anonymization import Anonymizer
+
+
+class ExportFormat(str, enum.Enum):
+    SRT = "srt"
+    VTT = "vtt"
+    TXT = "txt"
+    DOCX = "docx"
+
+
+EXPORT_MEDIA_TYPES: Dict[ExportFormat, str] = {
+    ExportFormat.SRT: "application/x-subrip",
+    ExportFormat.VTT: "text/vtt; charset=utf-8",
+    ExportFormat.TXT: "text/plain; charset=utf-8",
+    ExportFormat.DOCX: (
+        "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+    ),
+}
+
+_SEGMENT_COLUMNS = (
+    TranscriptionSegment.start_time,
+    TranscriptionSegment.end_time,
+    TranscriptionSegment.text,
+    TranscriptionSegment.speaker,
+)
+
+
+def _timestamp(seconds: float, separator: str) -> str:
+    millis = int(round(max(seconds, 0.0) * 1000))
+    hours, millis = divmod(millis, 3_600_000)
+    minutes, millis = divmod(millis, 60_000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+
+def _srt_cue(index: int, row: Any) -> str:
+    speaker = f"{row.speaker}: " if row.speaker else ""
+    start, end = _timestamp(row.start_time, ","), _timestamp(row.end_time, ",")
+    return f"{index}\n{start} --> {end}\n{speaker}{row.text}\n\n"
+
+
+def _vtt_cue(index: int, row: Any) -> str:
+    # Texto de cue não pode conter "-->"; voz do falante na tag <v>
+    text = escape(row.text.replace("-->", "->"))
+    if row.speaker:
+        text = f"<v {escape(row.speaker)}>{text}"
+    start, end = _timestamp(row.start_time, "."), _timestamp(row.end_time, ".")
+    return f"{start} --> {end}\n{text}\n\n"
+
+
+def _txt_line(index: int, row: Any) -> str:
+    speaker = f" {row.speaker}:" if row.speaker else ""
+    return f"[{_timestamp(row.start_time, '.')[:8]}]{speaker} {row.text}\n"
+
+
+_TEXT_RENDERERS: Dict[ExportFormat, Callable[[int, Any], str]] = {
+    ExportFormat.SRT: _srt_cue,
+    ExportFormat.VTT: _vtt_cue,
+    ExportFormat.TXT: _txt_line,
+}
+
+# Partes mínimas de um DOCX (WordprocessingML)
+_DOCX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" '
+    'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.'
+    'wordprocessingml.document.main+xml"/>'
+    "</Types>"
+)
+_DOCX_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    "<Relationships "
+    'xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+    'relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    "</Relationships>"
+)
+_DOCX_DOCUMENT_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    "<w:document "
+    'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+    "<w:body>"
+).encode("utf-8")
+_DOCX_DOCUMENT_END = b"</w:body></w:document>"
+
+
+def _docx_run(text: str, bold: bool = False) -> str:
+    properties = "<w:rPr><w:b/></w:rPr>" if bold else ""
+    return f'<w:r>{properties}<w:t xml:space="preserve">{escape(text)}</w:t></w:r>'
+
+
+def _docx_paragraph(row: Any) -> bytes:
+    label = f"[{_timestamp(row.start_time, '.')[:8]}] " + (
+        f"{row.speaker}: " if row.speaker else ""
+    )
+    return f"<w:p>{_docx_run(label, bold=True)}{_docx_run(row.text)}</w:p>".encode(
+        "utf-8"
+    )
+
+
+class _ZipSink:
+    """Destino não posicionável do ZipFile: acumula os bytes até o próximo ``drain``."""
+
+    def __init__(self) -> None:
+        self._parts: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data, self._parts = b"".join(self._parts), []
+        return data
+
+
+class _Segment(NamedTuple):
+    start_time: float
+    end_time: float
+    text: str
+    speaker: Optional[str]
+
+
+async def _segment_batches(
+    db: AsyncSession, transcription_id: int, anonymizer: Optional[Anonymizer]
+) -> AsyncIterator[Sequence[Any]]:
+    # Cursor no servidor: os segmentos chegam em lotes, nunca todos na memória
+    result = await db.stream(
+        select(*_SEGMENT_COLUMNS)
+        .where(TranscriptionSegment.transcription_id == transcription_id)
+        .order_by(TranscriptionSegment.start_time, TranscriptionSegment.id)
+        .execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+    )
+    async for partition in result.partitions():
+        if anonymizer is not None:
+            texts = anonymizer.anonymize_many(row.text for row in partition)
+            partition = [
+                _Segment(row.start_time, row.end_time, text, row.speaker)
+                for row, text in zip(partition, texts)
+            ]
+        yield partition
+
+
+async def _render_text(
+    db: AsyncSession,
+    transcription_id: int,
+    title: str,
+    fmt: ExportFormat,
+    anonymizer: Optional[Anonymizer],
+) -> AsyncIterator[bytes]:
+    if fmt is ExportFormat.VTT:
+        yield b"WEBVTT\n\n"
+    elif fmt is ExportFormat.TXT:
+        yield f"{title}\n\n".encode("utf-8")
+    render = _TEXT_RENDERERS[fmt]
+    index = 0
+    async for rows in _segment_batches(db, transcription_id, anonymizer):
+        parts = []
+        for row in rows:
+            index += 1
+            parts.append(render(index, row))
+        yield "".join(parts).encode("utf-8")
+
+
+async def _render_docx(
+    db: AsyncSession,
+    transcription_id: int,
+    title: str,
+    anonymizer: Optional[Anonymizer],
+) -> AsyncIterator[bytes]:
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", _DOCX_CONTENT_TYPES)
+        archive.writestr("_rels/.rels", _DOCX_RELS)
+        with archive.open("word/document.xml", "w") as document:
+            document.write(_DOCX_DOCUMENT_START)
+            document.write(f"<w:p>{_docx_run(title, bold=True)}</w:p>".encode("utf-8"))
+            async for rows in _segment_batches(db, transcription_id, anonymizer):
+                for row in rows:
+                    document.write(_docx_paragraph(row))
+                yield sink.drain()
+            document.write(_DOCX_DOCUMENT_END)
+    yield sink.drain()
+
+
+def render_export(
+    db: AsyncSession,
+    transcription_id: int,
+    title: str,
+    fmt: ExportFormat,
+    anonymizer: Optional[Anonymizer] = None,
+) -> AsyncIterator[bytes]:
+    """Exportação gerada incrementalmente a partir dos segmentos (um lote por vez).
+
+    Com ``anonymizer`` o título e o texto de cada segmento são anonimizados
+    à medida que os lotes são lidos.
+    """
+    if anonymizer is not None:
+        title = anonymizer.anonymize(title)
+    if fmt is ExportFormat.DOCX:
+        return _render_docx(db, transcription_id, title, anonymizer)
+    return _render_text(db, transcription_id, title, fmt, anonymizer)
+
+
+async def export_version(db: AsyncSession, transcription_id: int) -> str:
+    """Versão do conteúdo exportável: muda com qualquer alteração do conteúdo."""
+    result = await db.execute(
+        select(
+            Transcription.title, Transcription.completed_at, Transcription.updated_at
+        ).where(Transcription.id == transcription_id)
+    )
+    segments = await db.execute(
+        select(
+            func.count(),
+            func.max(TranscriptionSegment.id),
+            func.max(TranscriptionSegment.updated_at),
+        ).where(TranscriptionSegment.transcription_id == transcription_id)
+    )
+    key = "|".join(str(value) for value in (*result.one(), *segments.one()))
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+
+def export_cache_path(
+    transcription_id: int, version: str, fmt: ExportFormat, anonymized: bool = False
+) -> Path:
+    variant = ".anon" if anonymized else ""
+    return (
+        Path(settings.EXPORT_CACHE_PATH)
+        / str(transcription_id)
+        / f"{version}{variant}.{fmt.value}"
+    )
+
+
+def remove_exports(transcription_id: int) -> None:
+    shutil.rmtree(
+        Path(settings.EXPORT_CACHE_PATH) / str(transcription_id), ignore_errors=True
+    )
+
+
+async def cache_export(
+    chunks: AsyncIterator[bytes], dest: Path
+) -> AsyncIterator[bytes]:
+    """
+    Repassar a exportação ao cliente gravando uma cópia em ``dest``.
+
+    O arquivo só é publicado (rename atômico) se o stream terminar; versões
+    anteriores do mesmo formato (e variante) são apagadas. Se o cliente desconectar, a
+    cópia parcial é descartada.
+    """
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(f".{uuid.uuid4().hex}.tmp")
+    try:
+        async with aiofiles.open(tmp, "wb") as out:
+            async for chunk in chunks:
+                await out.write(chunk)
+                yield chunk
+        os.replace(tmp, dest)
+        for stale in dest.parent.glob(f"*{dest.suffix}"):
+            if stale != dest and stale.suffixes == dest.suffixes:
+                stale.unlink(missing_ok=True)
+    finally:
+        tmp.unlink(missing_ok=True)
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import os
+import shutil
+from pathlib import Path
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.blob import Blob
+from app.models.transcription import MediaStatus, Transcription
+from app.services.audio import transcode_audio
+from app.services.blobstore import shard_path
+
+_AUDIO_EXTENSIONS = {"opus": ".opus", "flac": ".flac"}
+_VIDEO_EXTENSIONS = {".mp4", ".avi", ".mov"}
+
+
+def audio_path_for(transcription: Transcription) -> Path:
+    """Trilha de áudio de ingestão, compartilhada por uploads do mesmo conteúdo."""
+    key = transcription.content_hash or f"transcription-{transcription.id}"
+    path = shard_path(
+        Path(settings.UPLOAD_PATH) / "audio",
+        key,
+        _AUDIO_EXTENSIONS[settings.INGEST_AUDIO_FORMAT],
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def remove_ingested_audio(content_hash: str) -> None:
+    """Apagar as trilhas de ingestão de um conteúdo (quando o blob é apagado)."""
+    for suffix in _AUDIO_EXTENSIONS.values():
+        try:
+            shard_path(
+                Path(settings.UPLOAD_PATH) / "audio", content_hash, suffix
+            ).unlink()
+        except OSError:
+            pass
+
+
+def ingest_audio(transcription: Transcription) -> Path:
+    """
+    Demultiplexar o áudio de um vídeo uma única vez para Opus/FLAC mono 16 kHz.
+
+    Todas as etapas seguintes (decodificação PCM, retomadas, reprocessamentos)
+    leem esse arquivo, 10-20x menor que o vídeo da audiência. Um arquivo de
+    ingestão já existente (mesmo conteúdo, outro upload) é reaproveitado.
+    Uploads de áudio são lidos diretamente: uma segunda codificação com perdas
+    antes do ASR só custaria precisão e uma passada extra do ffmpeg.
+    """
+    if not _is_video(transcription):
+        return Path(transcription.file_path)
+    dest = audio_path_for(transcription)
+    if not dest.exists():
+        transcode_audio(
+            transcription.file_path,
+            dest,
+            settings.INGEST_AUDIO_FORMAT,
+            settings.INGEST_OPUS_BITRATE,
+        )
+    return dest
+
+
+def _is_video(transcription: Transcription) -> bool:
+    if transcription.mime_type:
+        return transcription.mime_type.startswith("video/")
+    return os.path.splitext(transcription.file_path)[1].lower() in _VIDEO_EXTENSIONS
+
+
+async def archive_original(session: AsyncSession, transcription: Transcription) -> None:
+    """
+    Aplicar ``ORIGINAL_MEDIA_POLICY`` ao vídeo original após a ingestão.
+
+    "cold" move o arquivo para ``COLD_STORAGE_PATH``; o caminho é atualizado
+    no blob e em todas as transcrições que o compartilham. "delete" o remove
+    e marca essas transcrições com ``media_status`` DELETED, mantendo
+    ``file_path`` e ``Blob.path``: ``store_blob`` depende desse caminho
+    (agora inexistente) para recolocar o arquivo no shard quando o mesmo
+    conteúdo for enviado de novo. Áudios enviados como áudio são sempre
+    mantidos.
+    """
+    policy = settings.ORIGINAL_MEDIA_POLICY
+    original = transcription.file_path
+    if policy == "keep" or not _is_video(transcription) or not os.path.exists(original):
+        return
+
+    if policy == "cold":
+        cold_dir = Path(settings.COLD_STORAGE_PATH)
+        if transcription.content_hash:
+            new_path = str(shard_path(cold_dir, transcription.content_hash))
+        else:
+            new_path = str(cold_dir / f"{transcription.id}_{Path(original).name}")
+        Path(new_path).parent.mkdir(parents=True, exist_ok=True)
+        shutil.move(original, new_path)
+        await session.execute(
+            update(Transcription)
+            .where(Transcription.file_path == original)
+            .values(file_path=new_path, media_status=MediaStatus.COLD)
+        )
+        await session.execute(
+            update(Blob).where(Blob.path == original).values(path=new_path)
+        )
+        transcription.file_path = new_path
+        transcription.media_status = MediaStatus.COLD
+    elif policy == "delete":
+        os.remove(original)
+        await session.execute(
+            update(Transcription)
+            .where(Transcription.file_path == original)
+            .values(media_status=MediaStatus.DELETED)
+        )
+        transcription.media_status = MediaStatus.DELETED
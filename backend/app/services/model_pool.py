@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import gc
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from app.core.config import settings
+from app.services.asr import ASREngine, create_engine, default_precision
+
+logger = logging.getLogger(__name__)
+
+# Chave do pool: (engine, nome do modelo, device, precisão)
+ModelKey = Tuple[str, str, str, str]
+
+
+@dataclass
+class _PoolEntry:
+    model: ASREngine
+    size_bytes: int
+    load_seconds: float
+
+
+class ModelPool:
+    """Registro de modelos ASR residentes no processo, com despejo LRU.
+
+    Os modelos ficam em memória entre jobs e são despejados do menos
+    recentemente usado para o mais recente quando o orçamento
+    ``max_bytes`` é excedido. O modelo recém-carregado nunca é despejado,
+    mesmo que sozinho ultrapasse o orçamento.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[ModelKey, _PoolEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Um lock por modelo em carregamento
+        self._loading: Dict[ModelKey, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.load_seconds_total = 0.0
+
+    def get(
+        self,
+        model_name: str,
+        device: Optional[str] = None,
+        precision: Optional[str] = None,
+    ) -> ASREngine:
+        """Obter engine do ``ASR_ENGINE`` configurado; carrega-o em caso de miss.
+
+        O carregamento (segundos a minutos) acontece fora do lock do pool: só
+        quem pede o mesmo modelo espera por ele, via o lock por chave.
+        """
+        key: ModelKey = (
+            settings.ASR_ENGINE,
+            model_name,
+            device or settings.WHISPER_DEVICE,
+            precision or default_precision(),
+        )
+        with self._lock:
+            model = self._hit(key)
+            if model is not None:
+                return model
+            key_lock = self._loading.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                # carregado por outra thread enquanto esperávamos
+                model = self._hit(key)
+                if model is not None:
+                    return model
+                self.misses += 1
+            try:
+                entry = self._load(key)
+            except BaseException:
+                with self._lock:
+                    self._loading.pop(key, None)
+                raise
+            # Publicar a entrada e liberar o lock da chave na mesma seção crítica:
+            # quem chega entre os dois passos encontraria o pool sem o modelo
+            with self._lock:
+                self._loading.pop(key, None)
+                self.load_seconds_total += entry.load_seconds
+                self._entries[key] = entry
+                self._evict_over_budget(keep=key)
+            return entry.model
+
+    def preload(self, model_names: Iterable[str]) -> None:
+        """Carregar modelos antecipadamente (ex.: na inicialização do worker)."""
+        for name in model_names:
+            if name:
+                self.get(name)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        gc.collect()
+
+    @property
+    def resident_bytes(self) -> int:
+        return sum(e.size_bytes for e in self._entries.values())
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores de uso do pool."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "load_seconds_total": round(self.load_seconds_total, 3),
+                "resident_models": ["/".join(k) for k in self._entries.keys()],
+                "resident_bytes": self.resident_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _hit(self, key: ModelKey) -> Optional[ASREngine]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.model
+
+    def _load(self, key: ModelKey) -> _PoolEntry:
+        engine_name, model_name, device, precision = key
+        started = time.perf_counter()
+        model = create_engine(model_name, device, precision, engine_name)
+        model.load()
+        elapsed = time.perf_counter() - started
+        size = model.estimate_bytes()
+        logger.info(
+            "Modelo %s carregado em %.2fs (%d MB)",
+            "/".join(key),
+            elapsed,
+            size // (1024 * 1024),
+        )
+        return _PoolEntry(model=model, size_bytes=size, load_seconds=elapsed)
+
+    def _evict_over_budget(self, keep: ModelKey) -> None:
+        evicted = False
+        while self.resident_bytes > self.max_bytes and len(self._entries) > 1:
+            oldest = next(iter(self._entries))
+            if oldest == keep:
+                break
+            self._entries.pop(oldest)
+            self.evictions += 1
+            evicted = True
+            logger.info("Modelo %s despejado do pool", "/".join(oldest))
+        if evicted:
+            gc.collect()
+            if keep[2] != "cpu":
+                try:
+                    import torch  # type: ignore
+
+                    torch.cuda.empty_cache()
+                except Exception:
+                    pass
+
+
+_pool: Optional[ModelPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_model_pool() -> ModelPool:
+    """Pool de modelos do processo atual (criado sob demanda)."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ModelPool(
+                    max_bytes=settings.WHISPER_MODEL_POOL_MAX_MB * 1024 * 1024
+                )
+    return _pool
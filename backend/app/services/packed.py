@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import struct
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from app.services.asr import SegmentResult
+
+# Cabeçalho do blob (antes da compressão): assinatura, versão e número de palavras
+_MAGIC = b"PKW"
+_VERSION = 1
+_HEADER = struct.Struct("<3sBI")
+
+
+class PackedWords:
+    """Palavras de uma transcrição em arrays compactos, ordenadas pelo início.
+
+    ``starts``/``ends``/``probabilities`` são float32 e o texto fica num único
+    buffer UTF-8 com ``offsets`` (uint32, n + 1 posições). Serializado com
+    ``to_bytes`` como um blob zlib: 16 bytes por palavra mais o texto antes
+    da compressão, contra uma linha de banco por palavra.
+    """
+
+    def __init__(
+        self,
+        starts: np.ndarray,
+        ends: np.ndarray,
+        probabilities: np.ndarray,
+        text: bytes,
+        offsets: np.ndarray,
+    ) -> None:
+        self.starts = starts
+        self.ends = ends
+        self.probabilities = probabilities
+        self.text = text
+        self.offsets = offsets
+        # Máximo acumulado dos fins: permite busca binária mesmo com palavras
+        # sobrepostas
+        self._ends_max = np.maximum.accumulate(ends) if len(ends) else ends
+
+    @classmethod
+    def from_segments(
+        cls, segments: Iterable[SegmentResult], offset: float = 0.0
+    ) -> "PackedWords":
+        """Empacotar as palavras dos segmentos do ASR (tempos somados a ``offset``)."""
+        words = [word for segment in segments for word in segment.words]
+        words.sort(key=lambda word: word.start)
+        encoded = [word.word.strip().encode("utf-8") for word in words]
+        offsets = np.zeros(len(words) + 1, dtype=np.uint32)
+        if encoded:
+            offsets[1:] = np.cumsum([len(chunk) for chunk in encoded])
+        return cls(
+            np.array([word.start + offset for word in words], dtype=np.float32),
+            np.array([word.end + offset for word in words], dtype=np.float32),
+            np.array([word.probability for word in words], dtype=np.float32),
+            b"".join(encoded),
+            offsets,
+        )
+
+    @classmethod
+    def concat(cls, parts: Sequence["PackedWords"]) -> "PackedWords":
+        """Juntar partes já ordenadas e sem sobreposição (ex.: chunks em ordem)."""
+        parts = [part for part in parts if len(part)]
+        if not parts:
+            return cls.empty()
+        offsets = [np.zeros(1, dtype=np.uint32)]
+        base = 0
+        for part in parts:
+            offsets.append(part.offsets[1:] + np.uint32(base))
+            base += len(part.text)
+        return cls(
+            np.concatenate([part.starts for part in parts]),
+            np.concatenate([part.ends for part in parts]),
+            np.concatenate([part.probabilities for part in parts]),
+            b"".join(part.text for part in parts),
+            np.concatenate(offsets),
+        )
+
+    @classmethod
+    def empty(cls) -> "PackedWords":
+        floats = np.zeros(0, dtype=np.float32)
+        return cls(floats, floats, floats, b"", np.zeros(1, dtype=np.uint32))
+
+    def to_bytes(self) -> bytes:
+        raw = b"".join(
+            (
+                _HEADER.pack(_MAGIC, _VERSION, len(self)),
+                self.starts.astype("<f4").tobytes(),
+                self.ends.astype("<f4").tobytes(),
+                self.probabilities.astype("<f4").tobytes(),
+                self.offsets.astype("<u4").tobytes(),
+                self.text,
+            )
+        )
+        return zlib.compress(raw, 6)
+
+    @classmethod
+    def from_bytes(cls, blob: Optional[bytes]) -> "PackedWords":
+        if not blob:
+            return cls.empty()
+        raw = zlib.decompress(blob)
+        magic, version, count = _HEADER.unpack_from(raw)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("Blob de palavras inválido")
+        position = _HEADER.size
+        arrays = []
+        for dtype, length in (
+            ("<f4", count),
+            ("<f4", count),
+            ("<f4", count),
+            ("<u4", count + 1),
+        ):
+            arrays.append(
+                np.frombuffer(raw, dtype=dtype, count=length, offset=position)
+            )
+            position += length * 4
+        starts, ends, probabilities, offsets = arrays
+        return cls(starts, ends, probabilities, raw[position:], offsets)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def word(self, index: int) -> Dict[str, Any]:
+        return {
+            "start": float(self.starts[index]),
+            "end": float(self.ends[index]),
+            "text": self.text[self.offsets[index] : self.offsets[index + 1]].decode(
+                "utf-8"
+            ),
+            "probability": float(self.probabilities[index]),
+        }
+
+    def index_at(self, time: float) -> Optional[int]:
+        """Índice da palavra falada em ``time`` (última iniciada até ali).
+
+        None antes da primeira palavra.
+        """
+        index = int(np.searchsorted(self.starts, time, side="right")) - 1
+        return index if index >= 0 else None
+
+    def window(self, start: float, end: float) -> List[Dict[str, Any]]:
+        """Palavras que se sobrepõem a [start, end), por busca binária."""
+        first = int(np.searchsorted(self._ends_max, start, side="right"))
+        last = int(np.searchsorted(self.starts, end, side="left"))
+        return [
+            self.word(index) for index in range(first, last) if self.ends[index] > start
+        ]
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+# Tempos acumulados por estágio do pipeline; None = coleta desligada
+_stage_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar(
+    "stage_timings", default=None
+)
+
+
+def record_stage(name: str, seconds: float) -> None:
+    """Somar ``seconds`` ao estágio ``name`` se houver coleta ativa."""
+    timings = _stage_timings.get()
+    if timings is not None:
+        timings[name] = timings.get(name, 0.0) + seconds
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Medir o tempo de parede de um estágio do pipeline."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(name, time.perf_counter() - started)
+
+
+@contextmanager
+def collect_stage_timings() -> Iterator[Dict[str, float]]:
+    """Ativar a coleta de tempos por estágio no contexto atual.
+
+    ``asyncio.to_thread`` copia o contexto, então estágios medidos em threads
+    também são contabilizados; processos do pool de chunks não são.
+    """
+    timings: Dict[str, float] = {}
+    token = _stage_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _stage_timings.reset(token)
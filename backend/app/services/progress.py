@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import json
+import threading
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from redis import Redis  # type: ignore
+from redis import asyncio as aioredis  # type: ignore
+
+from app.core.config import settings
+
+# Tipos dos campos do registro (o Redis guarda tudo como string)
+_FLOAT_FIELDS = {"processed_seconds", "total_seconds", "duration"}
+_INT_FIELDS = {"user_id", "segment_count"}
+_DATETIME_FIELDS = {"created_at", "started_at", "completed_at", "updated_at"}
+
+_sync_client: Optional[Redis] = None
+_sync_lock = threading.Lock()
+_async_client: Optional[aioredis.Redis] = None
+
+
+def progress_key(transcription_id: int) -> str:
+    return f"transcription:{transcription_id}:progress"
+
+
+def user_channel(user_id: int) -> str:
+    """Canal pub/sub com os eventos de todas as transcrições de um usuário."""
+    return f"transcriptions:user:{user_id}:events"
+
+
+def _redis() -> Redis:
+    """Cliente Redis do processo (pool de conexões reaproveitado entre publicações)."""
+    global _sync_client
+    if _sync_client is None:
+        with _sync_lock:
+            if _sync_client is None:
+                _sync_client = Redis.from_url(
+                    settings.REDIS_URL, socket_timeout=2, socket_connect_timeout=2
+                )
+    return _sync_client
+
+
+def _async_redis() -> aioredis.Redis:
+    global _async_client
+    if _async_client is None:
+        _async_client = aioredis.Redis.from_url(
+            settings.REDIS_URL, socket_timeout=2, socket_connect_timeout=2
+        )
+    return _async_client
+
+
+def _encode(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if hasattr(value, "value"):  # Enum
+        return str(value.value)
+    return str(value)
+
+
+def _queue_progress(
+    pipe: Any,
+    transcription_id: int,
+    user_id: Optional[int],
+    reset: bool,
+    fields: Dict[str, Any],
+) -> None:
+    mapping = {k: _encode(v) for k, v in fields.items() if v is not None}
+    mapping["updated_at"] = datetime.now(timezone.utc).isoformat()
+    if user_id is not None:
+        mapping["user_id"] = str(user_id)
+    key = progress_key(transcription_id)
+    if reset:
+        pipe.delete(key)
+    pipe.hset(key, mapping=mapping)
+    pipe.expire(key, settings.PROGRESS_TTL_SECONDS)
+    if user_id is not None:
+        event = {"event": "progress", "transcription_id": transcription_id, **mapping}
+        pipe.publish(user_channel(user_id), json.dumps(event))
+
+
+def publish_progress(
+    transcription_id: int,
+    *,
+    user_id: Optional[int] = None,
+    reset: bool = False,
+    **fields: Any,
+) -> None:
+    """
+    Atualizar o registro de progresso da transcrição no Redis (hash com TTL).
+
+    Com ``user_id`` a atualização também é publicada como evento "progress"
+    no canal do usuário. Campos ``None`` são ignorados; ``reset`` apaga o
+    registro antes (ex.: job devolvido à fila). Falhas do Redis são
+    ignoradas: o status sempre pode ser reconstruído do banco. Bloqueante:
+    em handlers async use ``publish_progress_async``.
+    """
+    try:
+        pipe = _redis().pipeline()
+        _queue_progress(pipe, transcription_id, user_id, reset, fields)
+        pipe.execute()
+    except Exception:
+        pass
+
+
+async def publish_progress_async(
+    transcription_id: int,
+    *,
+    user_id: Optional[int] = None,
+    reset: bool = False,
+    **fields: Any,
+) -> None:
+    """``publish_progress`` com o cliente assíncrono, sem bloquear o event loop."""
+    try:
+        pipe = _async_redis().pipeline()
+        _queue_progress(pipe, transcription_id, user_id, reset, fields)
+        await pipe.execute()
+    except Exception:
+        pass
+
+
+def publish_segments(
+    transcription_id: int, user_id: int, segments: List[Dict[str, Any]]
+) -> None:
+    """Publicar os segmentos recém-gravados de um chunk (evento "segments")."""
+    event = {
+        "event": "segments",
+        "transcription_id": transcription_id,
+        "segments": segments,
+    }
+    try:
+        _redis().publish(user_channel(user_id), json.dumps(event))
+    except Exception:
+        pass
+
+
+def clear_progress(transcription_id: int) -> None:
+    try:
+        _redis().delete(progress_key(transcription_id))
+    except Exception:
+        pass
+
+
+async def clear_progress_async(transcription_id: int) -> None:
+    try:
+        await _async_redis().delete(progress_key(transcription_id))
+    except Exception:
+        pass
+
+
+def _decode(record: Dict[bytes, bytes]) -> Dict[str, Any]:
+    decoded: Dict[str, Any] = {}
+    for raw_key, raw_value in record.items():
+        key, value = raw_key.decode(), raw_value.decode()
+        if key in _FLOAT_FIELDS:
+            decoded[key] = float(value)
+        elif key in _INT_FIELDS:
+            decoded[key] = int(value)
+        elif key in _DATETIME_FIELDS:
+            decoded[key] = datetime.fromisoformat(value)
+        else:
+            decoded[key] = value
+    return decoded
+
+
+async def read_progress(transcription_id: int) -> Optional[Dict[str, Any]]:
+    """Registro de progresso publicado pelo worker (None se ausente ou sem Redis)."""
+    try:
+        record = await _async_redis().hgetall(progress_key(transcription_id))
+    except Exception:
+        return None
+    if not record:
+        return None
+    return _decode(record)
+
+
+async def iter_user_events(
+    user_id: int, keepalive_seconds: float
+) -> AsyncIterator[Optional[Dict[str, Any]]]:
+    """
+    Eventos publicados pelos workers para as transcrições do usuário.
+
+    Produz ``None`` a cada ``keepalive_seconds`` sem eventos, para o stream
+    poder enviar keep-alives e notar clientes desconectados.
+    """
+    pubsub = _async_redis().pubsub()
+    await pubsub.subscribe(user_channel(user_id))
+    try:
+        while True:
+            message = await pubsub.get_message(
+                ignore_subscribe_messages=True, timeout=keepalive_seconds
+            )
+            yield json.loads(message["data"]) if message else None
+    finally:
+        await pubsub.unsubscribe()
+        await pubsub.aclose()
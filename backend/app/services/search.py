@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import html
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# PostgreSQL: ranking sobre o índice GIN; ts_headline (caro) só nas linhas da página
+_POSTGRES_SEARCH = """
+SELECT hit.*,
+       ts_headline('portuguese', s.text, hit_query.q, :headline_options) AS snippet
+FROM (
+    SELECT s.id AS segment_id, s.transcription_id, t.title, t.case_number, t.court,
+           s.start_time, s.end_time, ts_rank_cd(s.search_vector, q) AS rank
+    FROM transcription_segments s
+    JOIN transcriptions t ON t.id = s.transcription_id,
+         websearch_to_tsquery('portuguese', :query) q
+    WHERE s.search_vector @@ q AND t.user_id = :user_id {filters}
+    ORDER BY rank DESC, s.id
+    LIMIT :limit OFFSET :offset
+) hit
+JOIN transcription_segments s ON s.id = hit.segment_id,
+     websearch_to_tsquery('portuguese', :query) hit_query(q)
+ORDER BY hit.rank DESC, hit.segment_id
+"""
+
+# SQLite (testes): FTS5; bm25 é menor para os melhores resultados
+_SQLITE_SEARCH = """
+SELECT s.id AS segment_id, s.transcription_id, t.title, t.case_number, t.court,
+       s.start_time, s.end_time, -bm25(transcription_segments_fts) AS rank,
+       snippet(transcription_segments_fts, 0, :mark_start, :mark_end, '…', 16)
+           AS snippet
+FROM transcription_segments_fts
+JOIN transcription_segments s ON s.id = transcription_segments_fts.rowid
+JOIN transcriptions t ON t.id = s.transcription_id
+WHERE transcription_segments_fts MATCH :query AND t.user_id = :user_id {filters}
+ORDER BY rank DESC, s.id
+LIMIT :limit OFFSET :offset
+"""
+
+
+# O banco marca os termos com caracteres de controle; o texto é escapado antes
+# de virarem <mark> (o snippet é HTML e o texto da transcrição não é confiável)
+_MARK_START, _MARK_END = "\x02", "\x03"
+_HEADLINE_OPTIONS = (
+    f"StartSel={_MARK_START}, StopSel={_MARK_END}, MaxWords=30, MinWords=10"
+)
+
+
+def _highlight(snippet: Optional[str]) -> Optional[str]:
+    if snippet is None:
+        return None
+    escaped = html.escape(snippet)
+    return escaped.replace(_MARK_START, "<mark>").replace(_MARK_END, "</mark>")
+
+
+def _fts5_query(query: str) -> str:
+    # Cada termo entre aspas: a entrada do usuário não é interpretada como sintaxe FTS5
+    return " ".join('"{}"'.format(term.replace('"', '""')) for term in query.split())
+
+
+async def search_segments(
+    db: AsyncSession,
+    user_id: int,
+    query: str,
+    *,
+    case_number: Optional[str] = None,
+    court: Optional[str] = None,
+    limit: int,
+    offset: int = 0,
+) -> List[Dict[str, Any]]:
+    """
+    Buscar nos segmentos das transcrições do usuário (busca textual em português).
+
+    Devolve os trechos mais relevantes primeiro, com os termos marcados por
+    ``<mark>`` no snippet (HTML, com o texto escapado) e os tempos do
+    segmento. Como ``full_text`` é a junção dos segmentos, a busca
+    cobre também o texto completo de cada transcrição.
+    """
+    params: Dict[str, Any] = {"user_id": user_id, "limit": limit, "offset": offset}
+    filters = ""
+    if case_number is not None:
+        filters += " AND t.case_number = :case_number"
+        params["case_number"] = case_number
+    if court is not None:
+        filters += " AND t.court = :court"
+        params["court"] = court
+
+    if db.get_bind().dialect.name == "postgresql":
+        statement, params["query"] = _POSTGRES_SEARCH, query
+        params["headline_options"] = _HEADLINE_OPTIONS
+    else:
+        statement, params["query"] = _SQLITE_SEARCH, _fts5_query(query)
+        if not params["query"]:
+            return []
+        params["mark_start"], params["mark_end"] = _MARK_START, _MARK_END
+    result = await db.execute(text(statement.format(filters=filters)), params)
+    return [{**row, "snippet": _highlight(row["snippet"])} for row in result.mappings()]
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List
+
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.transcription import TranscriptionSegment
+from app.services.asr import SegmentResult
+
+_segments_table = TranscriptionSegment.__table__
+
+# Colunas gravadas pelo COPY (created_at fica com o default do servidor)
+_COPY_COLUMNS = (
+    "id",
+    "transcription_id",
+    "start_time",
+    "end_time",
+    "text",
+    "speaker",
+    "confidence",
+)
+
+
+def segment_rows(
+    transcription_id: int, offset: float, segments: Iterable[SegmentResult]
+) -> List[Dict[str, Any]]:
+    """Linhas de ``transcription_segments`` de um chunk, na linha do tempo original."""
+    return [
+        {
+            "transcription_id": transcription_id,
+            "start_time": segment.start + offset,
+            "end_time": segment.end + offset,
+            "text": segment.text.strip(),
+            "speaker": f"Speaker_{segment.id % 5}",  # Rotação básica de speakers
+            "confidence": segment.no_speech_prob,
+        }
+        for segment in segments
+    ]
+
+
+async def _copy_segments(
+    session: AsyncSession, rows: List[Dict[str, Any]]
+) -> List[int]:
+    """COPY binário via asyncpg, com IDs reservados antes na sequence da tabela."""
+    connection = await session.connection()
+    ids = list(
+        await connection.scalars(
+            text(
+                "SELECT nextval("
+                "pg_get_serial_sequence('transcription_segments', 'id')) "
+                "FROM generate_series(1, :n)"
+            ),
+            {"n": len(rows)},
+        )
+    )
+    raw = await connection.get_raw_connection()
+    # Mesma conexão (e transação) da sessão: o COPY é commitado junto com o checkpoint
+    await raw.driver_connection.copy_records_to_table(
+        _segments_table.name,
+        records=[
+            (segment_id, *(row[column] for column in _COPY_COLUMNS[1:]))
+            for segment_id, row in zip(ids, rows)
+        ],
+        columns=list(_COPY_COLUMNS),
+    )
+    return ids
+
+
+async def bulk_insert_segments(
+    session: AsyncSession, rows: List[Dict[str, Any]]
+) -> List[int]:
+    """
+    Gravar segmentos sem o unit of work do ORM; devolve os IDs na ordem de ``rows``.
+
+    No PostgreSQL (asyncpg) lotes a partir de ``SEGMENT_COPY_MIN_ROWS`` usam
+    COPY; nos demais casos (inclusive SQLite nos testes) um INSERT Core
+    executemany em lotes de ``SEGMENT_INSERT_BATCH_SIZE``.
+    """
+    if not rows:
+        return []
+    bind = session.get_bind()
+    if (
+        bind.dialect.name == "postgresql"
+        and bind.dialect.driver == "asyncpg"
+        and len(rows) >= settings.SEGMENT_COPY_MIN_ROWS
+    ):
+        return await _copy_segments(session, rows)
+
+    statement = insert(_segments_table).returning(
+        _segments_table.c.id, sort_by_parameter_order=True
+    )
+    batch_size = max(1, settings.SEGMENT_INSERT_BATCH_SIZE)
+    ids: List[int] = []
+    for start in range(0, len(rows), batch_size):
+        result = await session.execute(statement, rows[start : start + batch_size])
+        ids.extend(result.scalars())
+    return ids
@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+import aiofiles
+import aiofiles.os
+from fastapi import UploadFile
+from starlette.requests import ClientDisconnect
+
+from app.core.config import settings
+
+# Tamanho dos blocos lidos do upload e gravados em disco
+UPLOAD_BLOCK_SIZE = 1024 * 1024
+
+# Bytes iniciais usados na detecção do tipo do conteúdo
+SNIFF_BYTES = 8192
+
+# Tipos aceitos além de audio/* e video/* (contêineres que a libmagic classifica assim)
+_ACCEPTED_MIME_TYPES = {"application/ogg", "application/octet-stream"}
+
+
+class UploadTooLargeError(Exception):
+    """Upload ultrapassou ``MAX_UPLOAD_SIZE`` durante a gravação."""
+
+
+class UnsupportedMediaError(Exception):
+    """Conteúdo do upload não é áudio nem vídeo."""
+
+
+@dataclass
+class StoredUpload:
+    path: Path
+    size: int
+    content_hash: str  # SHA-256 do conteúdo
+    mime_type: str
+
+
+# Assinaturas conhecidas: ((offset, bytes), ...) que precisam casar -> tipo MIME.
+# A ordem importa: a primeira entrada que casar vale.
+_SIGNATURES: Tuple[Tuple[Tuple[Tuple[int, bytes], ...], str], ...] = (
+    (((0, b"RIFF"), (8, b"WAVE")), "audio/x-wav"),
+    (((0, b"RIFF"), (8, b"AVI ")), "video/x-msvideo"),
+    (((0, b"ID3"),), "audio/mpeg"),
+    (((0, b"OggS"),), "audio/ogg"),
+    (((0, b"fLaC"),), "audio/flac"),
+    (((4, b"ftyp"), (8, b"M4A")), "audio/mp4"),
+    (((4, b"ftyp"), (8, b"qt  ")), "video/quicktime"),
+    (((4, b"ftyp"),), "video/mp4"),
+)
+
+
+def _sniff_signature(head: bytes) -> str:
+    """Detecção por assinatura (usada quando a libmagic não está disponível)."""
+    for checks, mime_type in _SIGNATURES:
+        if all(head[offset : offset + len(magic)] == magic for offset, magic in checks):
+            return mime_type
+    # Quadro MPEG sem tag ID3: 11 bits de sincronismo
+    if len(head) > 1 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0:
+        return "audio/mpeg"
+    try:
+        head.decode("utf-8")
+        return "text/plain"
+    except UnicodeDecodeError:
+        return "application/octet-stream"
+
+
+def sniff_mime_type(head: bytes) -> str:
+    """Tipo MIME a partir dos primeiros bytes (libmagic quando instalada)."""
+    try:
+        import magic  # type: ignore
+
+        return magic.from_buffer(head, mime=True)
+    except Exception:
+        return _sniff_signature(head)
+
+
+def is_media_mime_type(mime_type: str) -> bool:
+    return (
+        mime_type.startswith(("audio/", "video/")) or mime_type in _ACCEPTED_MIME_TYPES
+    )
+
+
+async def save_upload(
+    upload: UploadFile, dest_path: Path, max_bytes: int
+) -> StoredUpload:
+    """
+    Gravar o upload em disco em blocos, sem manter o arquivo em memória.
+
+    Hash SHA-256 e detecção do tipo acontecem na mesma passada. A gravação é
+    abortada (e o arquivo parcial removido) assim que o total passa de
+    ``max_bytes`` ou quando o início do conteúdo não é áudio/vídeo.
+    """
+    hasher = hashlib.sha256()
+    size = 0
+    mime_type: Optional[str] = None
+    try:
+        async with aiofiles.open(dest_path, "wb") as out:
+            while block := await upload.read(UPLOAD_BLOCK_SIZE):
+                size += len(block)
+                if size > max_bytes:
+                    raise UploadTooLargeError(f"Upload excede {max_bytes} bytes")
+                if mime_type is None:
+                    mime_type = sniff_mime_type(block[:SNIFF_BYTES])
+                    if not is_media_mime_type(mime_type):
+                        raise UnsupportedMediaError(mime_type)
+                hasher.update(block)
+                await out.write(block)
+    except BaseException:
+        try:
+            await aiofiles.os.remove(dest_path)
+        except OSError:
+            pass
+        raise
+    return StoredUpload(
+        path=dest_path,
+        size=size,
+        content_hash=hasher.hexdigest(),
+        mime_type=mime_type or "application/octet-stream",
+    )
+
+
+# Hash incremental dos uploads retomáveis deste processo: id -> (offset, hasher, último
+# uso).
+# Se o PATCH seguinte cair em outro processo (ou após reinício) o hash é
+# recalculado a partir do arquivo na finalização.
+_part_hashers: Dict[str, Tuple[int, "hashlib._Hash", float]] = {}
+
+
+def _prune_part_hashers() -> None:
+    """Descartar hashes de uploads sem PATCH há ``UPLOAD_SESSION_TTL_HOURS``."""
+    cutoff = time.monotonic() - settings.UPLOAD_SESSION_TTL_HOURS * 3600
+    for upload_id in [key for key, state in _part_hashers.items() if state[2] < cutoff]:
+        _part_hashers.pop(upload_id, None)
+
+
+def partial_upload_path(upload_id: str) -> Path:
+    """Arquivo parcial de um upload retomável (mesmo disco do destino final)."""
+    directory = Path(settings.UPLOAD_PATH) / ".partial"
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory / upload_id
+
+
+@dataclass
+class PartResult:
+    written: int
+    mime_type: Optional[str] = None  # Detectado quando a parte começa no offset 0
+
+
+def _resume_hasher(upload_id: str, offset: int) -> Optional["hashlib._Hash"]:
+    """Hash incremental que continua em ``offset`` (None: recalcular no fim)."""
+    _prune_part_hashers()
+    previous = _part_hashers.pop(upload_id, None)
+    if offset == 0:
+        return hashlib.sha256()
+    if previous is not None and previous[0] == offset:
+        return previous[1]
+    return None
+
+
+def _check_part_block(
+    block: bytes, offset: int, result: PartResult, max_end: int
+) -> None:
+    """Recusar o bloco que ultrapassa ``max_end`` ou que não começa com mídia."""
+    if offset + result.written + len(block) > max_end:
+        raise UploadTooLargeError(f"Upload excede {max_end} bytes")
+    if offset == 0 and result.mime_type is None:
+        result.mime_type = sniff_mime_type(block[:SNIFF_BYTES])
+        if not is_media_mime_type(result.mime_type):
+            raise UnsupportedMediaError(result.mime_type)
+
+
+async def _discard_part(out: Any, offset: int, result: PartResult) -> None:
+    """Desfazer a parte recusada: o arquivo volta a ``offset`` e nada é contado."""
+    result.written = 0
+    result.mime_type = None
+    await out.truncate(offset)
+
+
+async def append_upload_part(
+    upload_id: str,
+    offset: int,
+    chunks: AsyncIterator[bytes],
+    max_end: int,
+    result: Optional[PartResult] = None,
+) -> PartResult:
+    """
+    Gravar uma parte de upload retomável a partir de ``offset``.
+
+    Os bytes vão direto para o arquivo parcial, sem montagem posterior. Se a
+    conexão cair no meio, o que já chegou é mantido e o cliente retoma do novo
+    offset. Partes que ultrapassam ``max_end`` ou cujo início não é
+    áudio/vídeo são descartadas por inteiro (``written`` volta a 0). Erros de
+    disco propagam.
+
+    ``result`` permite ao chamador ler os bytes gravados mesmo quando a
+    tarefa é cancelada (o cancelamento é repassado).
+    """
+    path = partial_upload_path(upload_id)
+    hasher = _resume_hasher(upload_id, offset)
+    if result is None:
+        result = PartResult(written=0)
+    async with aiofiles.open(path, "r+b" if path.exists() else "wb") as out:
+        # Bytes além do offset registrado (de uma parte que falhou) são descartados
+        await out.truncate(offset)
+        await out.seek(offset)
+        try:
+            async for block in chunks:
+                if not block:
+                    continue
+                _check_part_block(block, offset, result, max_end)
+                await out.write(block)
+                if hasher is not None:
+                    hasher.update(block)
+                result.written += len(block)
+        except (UploadTooLargeError, UnsupportedMediaError):
+            await _discard_part(out, offset, result)
+            hasher = None  # estado do hash já avançou: recalcular na finalização
+            raise
+        except ClientDisconnect:
+            pass  # os bytes recebidos ficam gravados
+        except Exception:
+            hasher = None  # falha de disco: recalcular o hash na finalização
+            raise
+        finally:
+            if hasher is not None:
+                _part_hashers[upload_id] = (
+                    offset + result.written,
+                    hasher,
+                    time.monotonic(),
+                )
+    return result
+
+
+def _hash_file(path: Path) -> str:
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(UPLOAD_BLOCK_SIZE):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+async def finalize_upload(
+    upload_id: str, size: int, mime_type: Optional[str]
+) -> StoredUpload:
+    """Upload retomável completo: arquivo parcial e hash, prontos para virar blob."""
+    path = partial_upload_path(upload_id)
+    state = _part_hashers.pop(upload_id, None)
+    if state is not None and state[0] == size:
+        content_hash = state[1].hexdigest()
+    else:
+        content_hash = await asyncio.to_thread(_hash_file, path)
+    return StoredUpload(
+        path=path,
+        size=size,
+        content_hash=content_hash,
+        mime_type=mime_type or "application/octet-stream",
+    )
+
+
+async def discard_upload(upload_id: str) -> None:
+    """Remover o arquivo parcial e o estado do hash de um upload abandonado."""
+    _part_hashers.pop(upload_id, None)
+    try:
+        await aiofiles.os.remove(partial_upload_path(upload_id))
+    except OSError:
+        pass
@@ -4,6 +4,8 @@ import io
 import re
 from typing import Dict, Optional
 
+from app.services.anonymization import get_anonymizer
+
 # Lazy imports for optional features (avoid crashing app if packages are missing)
 
 
@@ -26,20 +28,12 @@ def normalize_text(text: str) -> str:
 
 
 def anonymize_text(text: str) -> str:
-    """Optionally mask sensitive patterns (CPF/CNPJ, emails). Minimal MVP.
+    """Mask sensitive data (documents, CNJ numbers, contacts, bank data) in one pass.
 
-    Note: do not attempt to mask names automatically to avoid false positives.
+    Note: names are only masked when listed in ``ANONYMIZATION_NAMES``; they
+    are not detected automatically to avoid false positives.
     """
-    if not text:
-        return ""
-    masked = text
-    # Emails
-    masked = re.sub(r"([A-Za-z0-9._%+-])[A-Za-z0-9._%+-]*(@[A-Za-z0-9.-]+\.[A-Za-z]{2,})", r"\1***\2", masked)
-    # CPF: 000.000.000-00
-    masked = re.sub(r"\b(\d{3})\.(\d{3})\.(\d{3})-(\d{2})\b", r"\1.***.***-**", masked)
-    # CNPJ: 00.000.000/0000-00
-    masked = re.sub(r"\b(\d{2})\.(\d{3})\.(\d{3})/(\d{4})-(\d{2})\b", r"\1.***.***/****-**", masked)
-    return masked
+    return get_anonymizer().anonymize(text)
 
 
 def apply_template(template: Optional[str], content: str, metadata: Optional[Dict[str, str]] = None) -> str:
@@ -2,36 +2,51 @@ from __future__ import annotations
 
 import asyncio
 import math
+import multiprocessing
 import os
-from pathlib import Path
-from typing import List, Dict, Any, Optional
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 
-import ffmpeg  # type: ignore
-import whisper  # type: ignore
-from pydub import AudioSegment  # type: ignore
-from sqlalchemy import select
+from rq import Retry, get_current_job  # type: ignore
+from sqlalchemy import delete, select, update
 from sqlalchemy.sql import func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.database import AsyncSessionLocal
-from app.models.transcription import Transcription, TranscriptionStatus, TranscriptionSegment
-from app.core.queue import get_queue
-
-
-def _probe_duration(path: str) -> Optional[float]:
-    """Obter duração do arquivo de áudio/vídeo."""
-    try:
-        probe = ffmpeg.probe(path)
-        for s in probe.get("streams", []):
-            if s.get("codec_type") in ("audio", "video") and s.get("duration"):
-                return float(s["duration"])  # seconds
-        fmt = probe.get("format", {})
-        if fmt.get("duration"):
-            return float(fmt["duration"])  # seconds
-    except Exception:
-        return None
-    return None
+from app.core.database import AsyncSessionLocal, engine
+from app.models.transcription import (
+    Transcription,
+    TranscriptionStatus,
+    TranscriptionSegment,
+    TranscriptionChunk,
+)
+from app.core.queue import get_queue, get_redis_connection
+from app.services.asr import TranscriptionResult
+from app.services.audio import (
+    decode_to_pcm,
+    load_pcm,
+    plan_chunks,
+    remove_pcm,
+    samples_to_seconds,
+)
+from app.services.blobstore import purge_released_blobs
+from app.services.dedup import (
+    asr_fingerprint,
+    clone_transcription_result,
+    find_cached_result,
+)
+from app.services.ingest import archive_original, ingest_audio
+from app.services.model_pool import get_model_pool
+from app.services.profiling import stage
+from app.services.packed import PackedWords
+from app.services.progress import clear_progress, publish_progress, publish_segments
+from app.services.segments import bulk_insert_segments, segment_rows
+from app.services.uploads import expire_stale_uploads
+from app.services.vad import detect_speech, plan_speech_chunks
 
 
 def _choose_whisper_model(duration: Optional[float]) -> str:
@@ -53,169 +68,537 @@ def _choose_whisper_model(duration: Optional[float]) -> str:
         return "large"
 
 
-def _chunk_audio_if_needed(file_path: str, max_chunk_minutes: Optional[int] = None) -> List[str]:
+def _plan_transcription_chunks(pcm_path: str) -> List[Tuple[int, int]]:
+    """Intervalos [início, fim) em amostras a transcrever."""
+    audio = load_pcm(pcm_path)
+    max_chunk_seconds = settings.MAX_CHUNK_MINUTES * 60
+    if settings.ENABLE_VAD:
+        return plan_speech_chunks(audio, detect_speech(audio), max_chunk_seconds)
+    return plan_chunks(len(audio), max_chunk_seconds)
+
+
+def _asr_options() -> Dict[str, Any]:
+    """Opções de transcrição comuns a todos os engines."""
+    return {
+        "language": settings.TRANSCRIPTION_LANGUAGE,
+        "word_timestamps": settings.ENABLE_WORD_TIMESTAMPS,
+        "temperature": settings.WHISPER_TEMPERATURE,
+    }
+
+
+# Configurações repassadas aos processos do pool: com "spawn" eles releem o
+# ambiente, e alterações feitas em ``settings`` no processo pai (benchmark,
+# testes) se perderiam
+_CHUNK_WORKER_SETTINGS = (
+    "ASR_ENGINE",
+    "ASR_COMPUTE_TYPE",
+    "ASR_BEAM_SIZE",
+    "WHISPER_DEVICE",
+    "WHISPER_PRECISION",
+    "WHISPER_MODEL_POOL_MAX_MB",
+)
+
+
+def _chunk_worker_settings() -> Dict[str, Any]:
+    return {name: getattr(settings, name) for name in _CHUNK_WORKER_SETTINGS}
+
+
+def _init_chunk_worker(threads: int, overrides: Dict[str, Any]) -> None:
+    """Inicializador dos processos do pool: configuração do pai e threads."""
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+    # Lido pelos engines na carga do modelo (cpu_threads do CTranslate2)
+    settings.TRANSCRIPTION_THREADS_PER_WORKER = threads
+    if threads > 0:
+        try:
+            import torch  # type: ignore
+
+            torch.set_num_threads(threads)
+        except Exception:
+            pass
+
+
+def _transcribe_chunk(
+    model_name: str,
+    pcm_path: str,
+    start_sample: int,
+    end_sample: int,
+    options: Dict[str, Any],
+) -> TranscriptionResult:
+    """Transcrever um chunk com o modelo residente do processo atual.
+
+    O chunk é uma fatia (view, sem cópia) do cache PCM mapeado em memória,
+    entregue ao modelo como array: nada de WAV temporário nem ffmpeg extra.
     """
-    Dividir áudio em chunks se for muito longo.
-    Retorna lista de paths dos chunks ou [file_path] se não precisar dividir.
+    with stage("load_model"):
+        engine = get_model_pool().get(model_name)
+    audio = load_pcm(pcm_path, writable=True)[start_sample:end_sample]
+    with stage("transcribe"):
+        return engine.transcribe(audio, **options)
+
+
+_chunk_executor: Optional[ProcessPoolExecutor] = None
+_chunk_executor_key: Optional[Tuple[int, Tuple[Any, ...]]] = None
+
+
+def _get_chunk_executor(workers: int) -> ProcessPoolExecutor:
+    """Pool de processos persistente; cada processo mantém seu próprio pool de modelos.
+
+    Recriado se o número de processos ou a configuração do ASR mudar.
     """
-    if max_chunk_minutes is None:
-        max_chunk_minutes = settings.MAX_CHUNK_MINUTES
-        
-    try:
-        duration = _probe_duration(file_path)
-        if not duration or duration <= (max_chunk_minutes * 60):
-            return [file_path]
-        
-        # Dividir áudio em chunks de max_chunk_minutes
-        audio = AudioSegment.from_file(file_path)
-        chunk_length_ms = max_chunk_minutes * 60 * 1000
-        
-        chunks = []
-        base_path = Path(file_path)
-        chunk_dir = base_path.parent / f"chunks_{base_path.stem}"
-        chunk_dir.mkdir(exist_ok=True)
-        
-        for i in range(0, len(audio), chunk_length_ms):
-            chunk = audio[i:i + chunk_length_ms]
-            chunk_path = chunk_dir / f"chunk_{i//chunk_length_ms:03d}.wav"
-            chunk.export(chunk_path, format="wav")
-            chunks.append(str(chunk_path))
-        
-        return chunks
-        
-    except Exception:
-        # Se falhar ao dividir, usar arquivo original
-        return [file_path]
+    global _chunk_executor, _chunk_executor_key
+    overrides = _chunk_worker_settings()
+    key = (workers, tuple(overrides.values()))
+    if _chunk_executor is None or _chunk_executor_key != key:
+        if _chunk_executor is not None:
+            _chunk_executor.shutdown(wait=False, cancel_futures=True)
+        threads = settings.TRANSCRIPTION_THREADS_PER_WORKER or max(
+            1, (os.cpu_count() or 1) // workers
+        )
+        _chunk_executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_chunk_worker,
+            initargs=(threads, overrides),
+        )
+        _chunk_executor_key = key
+    return _chunk_executor
 
 
-def _cleanup_chunks(chunk_paths: List[str], original_path: str) -> None:
-    """Limpar arquivos de chunk temporários."""
-    if len(chunk_paths) <= 1:
+def _chunk_worker_pids() -> List[int]:
+    """PIDs dos processos vivos do pool de chunks (medições de memória)."""
+    if _chunk_executor is None:
+        return []
+    return list(getattr(_chunk_executor, "_processes", None) or {})
+
+
+def _reset_chunk_executor(wait: bool = False) -> None:
+    global _chunk_executor, _chunk_executor_key
+    if _chunk_executor is not None:
+        _chunk_executor.shutdown(wait=wait, cancel_futures=True)
+    _chunk_executor = None
+    _chunk_executor_key = None
+
+
+async def _iter_chunk_results(
+    model_name: str,
+    pcm_path: str,
+    chunks: List[Tuple[int, int]],
+    options: Dict[str, Any],
+    pending: Optional[List[int]] = None,
+) -> AsyncIterator[Tuple[int, TranscriptionResult]]:
+    """
+    Transcrever chunks e entregar resultados na ordem dos chunks.
+
+    ``pending`` restringe os índices a transcrever (retomada de checkpoint).
+    Com TRANSCRIPTION_WORKERS > 1 os chunks são despachados para um pool de
+    processos e concluem fora de ordem; os resultados ficam retidos até que
+    todos os chunks anteriores estejam prontos.
+    """
+    order = list(range(len(chunks))) if pending is None else list(pending)
+    workers = min(settings.TRANSCRIPTION_WORKERS, len(order))
+    if workers <= 1:
+        for chunk_idx in order:
+            start, end = chunks[chunk_idx]
+            yield chunk_idx, await asyncio.to_thread(
+                _transcribe_chunk, model_name, pcm_path, start, end, options
+            )
         return
-        
+
+    loop = asyncio.get_running_loop()
+    executor = _get_chunk_executor(workers)
+
+    async def _run(
+        position: int, start: int, end: int
+    ) -> Tuple[int, TranscriptionResult]:
+        result = await loop.run_in_executor(
+            executor, _transcribe_chunk, model_name, pcm_path, start, end, options
+        )
+        return position, result
+
+    tasks = [
+        asyncio.ensure_future(_run(pos, *chunks[idx])) for pos, idx in enumerate(order)
+    ]
+    ready: Dict[int, TranscriptionResult] = {}
+    next_pos = 0
     try:
-        # Remover chunks individuais
-        for chunk_path in chunk_paths:
-            if chunk_path != original_path and os.path.exists(chunk_path):
-                os.remove(chunk_path)
-        
-        # Remover diretório de chunks se vazio
-        if chunk_paths:
-            chunk_dir = Path(chunk_paths[0]).parent
-            if chunk_dir.exists() and chunk_dir.name.startswith("chunks_"):
-                try:
-                    chunk_dir.rmdir()
-                except OSError:
-                    pass  # Diretório não vazio
-                    
-    except Exception:
-        pass  # Ignorar erros de limpeza
+        for next_done in asyncio.as_completed(tasks):
+            position, result = await next_done
+            ready[position] = result
+            while next_pos in ready:
+                yield order[next_pos], ready.pop(next_pos)
+                next_pos += 1
+    except BrokenProcessPool:
+        _reset_chunk_executor()
+        raise
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def _heartbeat_key(transcription_id: int) -> str:
+    return f"transcription:{transcription_id}:heartbeat"
+
+
+class _Heartbeat:
+    """Renova periodicamente uma chave com TTL no Redis enquanto o job roda.
+
+    Se o worker morrer a chave expira e o reaper devolve a transcrição à fila.
+    Falhas do Redis são ignoradas: o heartbeat nunca derruba o pipeline.
+    """
+
+    def __init__(self, transcription_id: int) -> None:
+        self.key = _heartbeat_key(transcription_id)
+        self.ttl = settings.WORKER_HEARTBEAT_TTL_SECONDS
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _beat(self) -> None:
+        try:
+            get_redis_connection().set(self.key, "1", ex=self.ttl)
+        except Exception:
+            pass
+
+    def _run(self) -> None:
+        while not self._stop.wait(max(1, self.ttl // 3)):
+            self._beat()
+
+    def __enter__(self) -> "_Heartbeat":
+        self._beat()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._stop.set()
+        try:
+            get_redis_connection().delete(self.key)
+        except Exception:
+            pass
+
+
+async def _load_checkpoints(
+    session: AsyncSession, transcription: Transcription, chunks: List[Tuple[int, int]]
+) -> Dict[int, TranscriptionChunk]:
+    """
+    Carregar chunks já concluídos de uma execução anterior.
+
+    Se o plano de chunks mudou (outra configuração de VAD/tamanho de chunk),
+    checkpoints e segmentos antigos são descartados e o job recomeça do zero.
+    """
+    result = await session.execute(
+        select(TranscriptionChunk).where(
+            TranscriptionChunk.transcription_id == transcription.id
+        )
+    )
+    done = {c.chunk_index: c for c in result.scalars().all()}
+    consistent = all(
+        idx < len(chunks)
+        and abs(c.start_time - samples_to_seconds(chunks[idx][0])) < 1e-3
+        and abs(c.end_time - samples_to_seconds(chunks[idx][1])) < 1e-3
+        for idx, c in done.items()
+    )
+    if consistent:
+        return done
+
+    await session.execute(
+        delete(TranscriptionSegment).where(
+            TranscriptionSegment.transcription_id == transcription.id
+        )
+    )
+    await session.execute(
+        delete(TranscriptionChunk).where(
+            TranscriptionChunk.transcription_id == transcription.id
+        )
+    )
+    return {}
 
 
 async def _run_pipeline(session: AsyncSession, transcription: Transcription) -> None:
-    """Pipeline completo de transcrição com chunks e segmentos."""
+    """Pipeline completo de transcrição com chunks e segmentos.
+
+    Cada chunk concluído é gravado (segmentos, texto parcial, progresso e
+    checkpoint) e commitado imediatamente: o progresso real fica visível para
+    o endpoint de status, a sessão não acumula os segmentos de horas de
+    audiência e uma nova execução retoma a partir do último chunk gravado.
+    """
+    # 0. Mesmo conteúdo já transcrito com o modelo e as opções que este worker
+    # usaria: copiar o resultado, sem ingestão nem ASR
+    cached = await find_cached_result(session, transcription, _choose_whisper_model)
+    if cached is not None:
+        await clone_transcription_result(session, cached, transcription)
+        return
+
     transcription.status = TranscriptionStatus.PROCESSING
+    # Retomadas mantêm o início original: o ETA conta o tempo gasto nos chunks
+    # restaurados dos checkpoints, não os trata como transcritos em tempo zero
+    if transcription.started_at is None:
+        transcription.started_at = datetime.now(timezone.utc)
     await session.flush()
+    publish_progress(
+        transcription.id,
+        reset=True,
+        user_id=transcription.user_id,
+        status=TranscriptionStatus.PROCESSING,
+        stage="ingest",
+        created_at=transcription.created_at,
+        started_at=transcription.started_at,
+        segment_count=0,
+    )
 
     try:
-        # 1. Obter duração e escolher modelo otimizado
-        duration = _probe_duration(transcription.file_path)
+        # 1. Ingestão: extrair a trilha de áudio (Opus/FLAC mono) uma única vez;
+        # o vídeo original não é mais lido e pode ir para armazenamento frio
+        with stage("ingest"):
+            transcription.audio_path = str(
+                await asyncio.to_thread(ingest_audio, transcription)
+            )
+            await archive_original(session, transcription)
+        await session.commit()
+
+        # 2. Decodificar uma única vez para PCM 16 kHz; duração vem do número de
+        # amostras
+        publish_progress(
+            transcription.id, user_id=transcription.user_id, stage="decode"
+        )
+        with stage("decode"):
+            pcm_path = str(
+                await asyncio.to_thread(
+                    decode_to_pcm, transcription.audio_path, str(transcription.id)
+                )
+            )
+        with stage("probe"):
+            num_samples = len(load_pcm(pcm_path))
+            duration = samples_to_seconds(num_samples)
         transcription.duration = duration
-        await session.flush()
 
         model_name = _choose_whisper_model(duration)
-        model = whisper.load_model(model_name, device=settings.WHISPER_DEVICE)
         
-        # 2. Dividir áudio em chunks se necessário
-        chunk_paths = _chunk_audio_if_needed(transcription.file_path)
-        
-        all_segments = []
-        full_text_parts = []
-        total_offset = 0.0  # Offset cumulativo para chunks
+        # 3. Dividir em chunks (fatias do array, sem arquivos temporários); com VAD
+        # apenas trechos com fala viram chunks e as fronteiras caem em silêncios
+        with stage("chunk"):
+            chunks = await asyncio.to_thread(_plan_transcription_chunks, pcm_path)
+        transcription.total_seconds = samples_to_seconds(
+            sum(end - start for start, end in chunks)
+        )
+
+        # 4. Retomar de checkpoints: chunks concluídos não são transcritos de novo
+        done = await _load_checkpoints(session, transcription, chunks)
+        pending = [idx for idx in range(len(chunks)) if idx not in done]
+        text_by_chunk = {idx: c.text or "" for idx, c in done.items()}
+        transcription.processed_seconds = samples_to_seconds(
+            sum(chunks[idx][1] - chunks[idx][0] for idx in done)
+        )
+        await session.commit()
+        segment_count = 0
+        if done:
+            segment_count = await session.scalar(
+                select(func.count()).select_from(TranscriptionSegment).where(
+                    TranscriptionSegment.transcription_id == transcription.id
+                )
+            )
+        publish_progress(
+            transcription.id,
+            user_id=transcription.user_id,
+            stage="transcribe",
+            duration=duration,
+            total_seconds=transcription.total_seconds,
+            processed_seconds=transcription.processed_seconds,
+            segment_count=segment_count,
+        )
         
-        # 3. Processar cada chunk
-        for chunk_idx, chunk_path in enumerate(chunk_paths):
-            # Configurações otimizadas para Whisper
-            whisper_options = {
-                "language": settings.TRANSCRIPTION_LANGUAGE,
-                "word_timestamps": settings.ENABLE_WORD_TIMESTAMPS,
-                "temperature": settings.WHISPER_TEMPERATURE,
-                "verbose": False
-            }
-            
-            # Transcrever chunk com segmentos detalhados
-            chunk_result = model.transcribe(chunk_path, **whisper_options)
+        # 5. Processar cada chunk pendente (em paralelo se TRANSCRIPTION_WORKERS > 1),
+        # na ordem dos chunks
+        async for chunk_idx, chunk_result in _iter_chunk_results(
+            model_name, pcm_path, chunks, _asr_options(), pending
+        ):
+            chunk_start, chunk_end = chunks[chunk_idx]
+            # Offset do chunk na linha do tempo
+            total_offset = samples_to_seconds(chunk_start)
             
-            chunk_text = chunk_result.get("text", "").strip()
-            full_text_parts.append(chunk_text)
+            text_by_chunk[chunk_idx] = chunk_result.text.strip()
             
-            # 4. Processar segmentos do chunk
-            for segment_data in chunk_result.get("segments", []):
-                # Ajustar timestamps com offset do chunk
-                start_time = segment_data["start"] + total_offset
-                end_time = segment_data["end"] + total_offset
-                
-                segment = TranscriptionSegment(
-                    transcription_id=transcription.id,
-                    start_time=start_time,
-                    end_time=end_time,
-                    text=segment_data["text"].strip(),
-                    confidence=segment_data.get("no_speech_prob", 0.0),
-                    speaker=f"Speaker_{segment_data.get('id', 0) % 5}"  # Rotação básica de speakers
-                )
-                all_segments.append(segment)
-            
-            # Atualizar offset para próximo chunk
-            if len(chunk_paths) > 1:
-                chunk_duration = _probe_duration(chunk_path)
-                if chunk_duration:
-                    total_offset += chunk_duration
-
-        # 5. Salvar resultados no banco
-        transcription.full_text = " ".join(full_text_parts).strip()
-        
-        # Salvar todos os segmentos de uma vez
-        session.add_all(all_segments)
-        await session.flush()
+            # Segmentos do chunk como linhas simples (sem instâncias ORM)
+            rows = segment_rows(transcription.id, total_offset, chunk_result.segments)
+
+            # 6. Salvar o chunk: segmentos + checkpoint na mesma transação, texto
+            # parcial e progresso
+            checkpoint = TranscriptionChunk(
+                transcription_id=transcription.id,
+                chunk_index=chunk_idx,
+                start_time=samples_to_seconds(chunk_start),
+                end_time=samples_to_seconds(chunk_end),
+                text=text_by_chunk[chunk_idx],
+                words=PackedWords.from_segments(
+                    chunk_result.segments, total_offset
+                ).to_bytes(),
+            )
+            with stage("persist"):
+                segment_ids = await bulk_insert_segments(session, rows)
+                session.add(checkpoint)
+                transcription.full_text = _join_chunk_texts(text_by_chunk)
+                transcription.processed_seconds = (
+                    transcription.processed_seconds or 0.0
+                ) + samples_to_seconds(chunk_end - chunk_start)
+                await session.commit()
+                session.expunge(checkpoint)
+            segment_count += len(rows)
+            publish_progress(
+                transcription.id,
+                user_id=transcription.user_id,
+                processed_seconds=transcription.processed_seconds,
+                segment_count=segment_count,
+            )
+            publish_segments(transcription.id, transcription.user_id, [
+                {
+                    "id": segment_id,
+                    "start_time": row["start_time"],
+                    "end_time": row["end_time"],
+                    "text": row["text"],
+                    "speaker": row["speaker"],
+                }
+                for segment_id, row in zip(segment_ids, rows)
+            ])
         
-        # 6. Marcar como concluído
+        # 7. Marcar como concluído; as palavras dos checkpoints viram um único blob
+        transcription.full_text = _join_chunk_texts(text_by_chunk)
+        with stage("persist"):
+            merged_words = await _merge_chunk_words(session, transcription.id)
+            if merged_words is not None:
+                transcription.words = merged_words
+        transcription.asr_fingerprint = asr_fingerprint(model_name)
         transcription.status = TranscriptionStatus.COMPLETED
         transcription.completed_at = func.now()
         await session.flush()
+        # (o estado "done" é publicado por quem commita: ver _publish_completed)
         
-        # 7. Limpeza de arquivos temporários
-        _cleanup_chunks(chunk_paths, transcription.file_path)
+        # 8. Limpeza do cache PCM
+        remove_pcm(transcription.audio_path, str(transcription.id))
         
     except Exception as e:
-        # Em caso de erro, marcar como falhado
+        # Em caso de erro, marcar como falhado (checkpoints já commitados são mantidos)
+        # (o estado final — falha ou nova tentativa — é publicado pelo runner após o
+        # commit)
         transcription.status = TranscriptionStatus.FAILED
         await session.flush()
         
         # Limpeza de emergência
-        if 'chunk_paths' in locals():
-            _cleanup_chunks(chunk_paths, transcription.file_path)
+        if transcription.audio_path:
+            remove_pcm(transcription.audio_path, str(transcription.id))
         
         # Re-raise para logging no nível superior
         raise e
 
 
-def run_transcription_background(transcription_id: int) -> None:
-    """Sync wrapper to run the async pipeline in background tasks."""
+async def _merge_chunk_words(
+    session: AsyncSession, transcription_id: int
+) -> Optional[bytes]:
+    """
+    Juntar as palavras empacotadas dos checkpoints (em ordem) e liberá-las dos chunks.
+
+    Devolve None se os chunks já foram mesclados (nova execução de uma
+    transcrição concluída): o blob atual da transcrição deve ser mantido.
+    """
+    blobs = list(
+        await session.scalars(
+            select(TranscriptionChunk.words)
+            .where(TranscriptionChunk.transcription_id == transcription_id)
+            .order_by(TranscriptionChunk.chunk_index)
+        )
+    )
+    if all(blob is None for blob in blobs):
+        return None
+    merged = PackedWords.concat([PackedWords.from_bytes(blob) for blob in blobs])
+    await session.execute(
+        update(TranscriptionChunk)
+        .where(TranscriptionChunk.transcription_id == transcription_id)
+        .values(words=None)
+    )
+    return merged.to_bytes()
+
+
+def _join_chunk_texts(text_by_chunk: Dict[int, str]) -> str:
+    return " ".join(text_by_chunk[idx] for idx in sorted(text_by_chunk)).strip()
+
+
+def _publish_completed(transcription: Transcription) -> None:
+    """Publicar a conclusão (após o commit: o cliente não vê "done" antes do banco)."""
+    publish_progress(
+        transcription.id,
+        user_id=transcription.user_id,
+        status=TranscriptionStatus.COMPLETED,
+        stage="done",
+        processed_seconds=transcription.total_seconds,
+        completed_at=datetime.now(timezone.utc),
+    )
+
+
+def _retries_left() -> int:
+    """Novas tentativas que o RQ ainda fará para o job atual (0 fora de um worker)."""
+    job = get_current_job()
+    return (job.retries_left or 0) if job is not None else 0
+
+
+def run_transcription_background(
+    transcription_id: int, raise_errors: bool = False
+) -> None:
+    """Sync wrapper to run the async pipeline in background tasks.
+
+    RQ jobs pass ``raise_errors=True`` so a failure reaches RQ and triggers
+    its retry; the retried job resumes from the chunk checkpoints.
+    """
 
     async def _runner() -> None:
-        async with AsyncSessionLocal() as session:
-            # Em testes, use DB em memória se DATABASE_URL apontar para sqlite
-            # (AsyncSessionLocal já foi criado com settings.DATABASE_URL)
-            result = await session.execute(select(Transcription).where(Transcription.id == transcription_id))
-            transcription: Optional[Transcription] = result.scalar_one_or_none()
-            if transcription is None:
-                return
-            try:
-                await _run_pipeline(session, transcription)
-                await session.commit()
-            except Exception:
-                transcription.status = TranscriptionStatus.FAILED
-                await session.commit()
+        try:
+            async with AsyncSessionLocal() as session:
+                # Em testes, use DB em memória se DATABASE_URL apontar para sqlite
+                # (AsyncSessionLocal já foi criado com settings.DATABASE_URL)
+                result = await session.execute(
+                    select(Transcription).where(Transcription.id == transcription_id)
+                )
+                transcription: Optional[Transcription] = result.scalar_one_or_none()
+                if transcription is None:
+                    return
+                user_id = transcription.user_id
+                # Heartbeat liberado só depois do commit final: até lá o reaper
+                # ainda vê o job vivo e não o devolve à fila
+                with _Heartbeat(transcription_id):
+                    try:
+                        await _run_pipeline(session, transcription)
+                        await session.commit()
+                        _publish_completed(transcription)
+                    except Exception:
+                        await session.rollback()
+                        # Com tentativas restantes o RQ reenfileira o job: continua
+                        # pendente
+                        retries_left = _retries_left() if raise_errors else 0
+                        transcription.status = (
+                            TranscriptionStatus.PENDING
+                            if retries_left
+                            else TranscriptionStatus.FAILED
+                        )
+                        session.add(transcription)
+                        await session.commit()
+                        if retries_left:
+                            publish_progress(
+                                transcription_id,
+                                user_id=user_id,
+                                status=TranscriptionStatus.PENDING,
+                                stage="retrying",
+                                retries_left=retries_left,
+                            )
+                        else:
+                            publish_progress(
+                                transcription_id,
+                                user_id=user_id,
+                                status=TranscriptionStatus.FAILED,
+                                stage="failed",
+                            )
+                        if raise_errors:
+                            raise
+        finally:
+            # Cada job roda em um event loop novo: conexões do pool não podem ser
+            # reaproveitadas
+            await engine.dispose()
 
     asyncio.run(_runner())
 
@@ -223,7 +606,118 @@ def run_transcription_background(transcription_id: int) -> None:
 def enqueue_transcription_job(transcription_id: int) -> str:
     """Enqueue job on Redis RQ; returns job id."""
     q = get_queue()
-    job = q.enqueue(run_transcription_background, transcription_id)
+    job = q.enqueue(
+        run_transcription_background,
+        transcription_id,
+        True,
+        retry=Retry(
+            max=settings.TRANSCRIPTION_MAX_RETRIES,
+            interval=settings.TRANSCRIPTION_RETRY_INTERVAL_SECONDS,
+        ),
+    )
     return job.id
 
 
+async def requeue_stale_transcriptions(session: AsyncSession) -> List[int]:
+    """
+    Devolver à fila transcrições presas em PROCESSING cujo heartbeat expirou.
+
+    Retorna os ids re-enfileirados. Sem Redis não há como distinguir um
+    worker vivo de um morto, então nada é feito.
+    """
+    try:
+        redis = get_redis_connection()
+        redis.ping()
+    except Exception:
+        return []
+
+    result = await session.execute(
+        select(Transcription.id).where(
+            Transcription.status == TranscriptionStatus.PROCESSING
+        )
+    )
+    candidates = [
+        tid for tid in result.scalars().all() if not redis.exists(_heartbeat_key(tid))
+    ]
+    stale: List[int] = []
+    for tid in candidates:
+        # Condicional: o job pode ter concluído (ou falhado) depois da consulta
+        updated = await session.execute(
+            update(Transcription)
+            .where(
+                Transcription.id == tid,
+                Transcription.status == TranscriptionStatus.PROCESSING,
+            )
+            .values(status=TranscriptionStatus.PENDING)
+        )
+        if updated.rowcount == 1:
+            stale.append(tid)
+    await session.commit()
+    for tid in stale:
+        clear_progress(tid)
+        enqueue_transcription_job(tid)
+    return stale
+
+
+# Id do job agendado do reaper; o SET NX garante uma única cadeia de reagendamento
+REAPER_SCHEDULE_KEY = "reaper:scheduled"
+
+# Libera a chave só se ainda pertence ao job que terminou (outra cadeia pode tê-la
+# assumido)
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def reap_stale_transcriptions_job() -> List[int]:
+    """
+    Job RQ do reaper: transcrições órfãs, uploads abandonados e blobs sem referência.
+
+    Reagenda a si mesmo a cada ``REAPER_INTERVAL_SECONDS``.
+    """
+
+    async def _runner() -> List[int]:
+        try:
+            async with AsyncSessionLocal() as session:
+                await expire_stale_uploads(session)
+                await purge_released_blobs(session)
+                return await requeue_stale_transcriptions(session)
+        finally:
+            await engine.dispose()
+
+    try:
+        return asyncio.run(_runner())
+    finally:
+        job = get_current_job()
+        if job is not None:
+            get_redis_connection().eval(_RELEASE_SCRIPT, 1, REAPER_SCHEDULE_KEY, job.id)
+        schedule_reaper()
+
+
+def schedule_reaper(delay_seconds: Optional[int] = None) -> Optional[str]:
+    """
+    Agendar a próxima execução do reaper, se nenhuma estiver agendada.
+
+    Cada execução tem um job id próprio (sem ``result_ttl``: o registro some
+    ao terminar) e a chave ``REAPER_SCHEDULE_KEY`` aponta para a pendente;
+    chamadas concorrentes (vários workers iniciando) agendam uma só. A chave
+    expira se a cadeia morrer (ex.: Redis sem persistência), e o próximo
+    worker a iniciar volta a agendar. Devolve o job id agendado, ou None.
+    """
+    if delay_seconds is None:
+        delay_seconds = settings.REAPER_INTERVAL_SECONDS
+    job_id = f"reap-stale-transcriptions-{uuid.uuid4().hex}"
+    # Folga para o job esperar na fila atrás de transcrições longas
+    lease = delay_seconds + settings.REAPER_INTERVAL_SECONDS + 4 * 60 * 60
+    if not get_redis_connection().set(REAPER_SCHEDULE_KEY, job_id, nx=True, ex=lease):
+        return None
+    get_queue().enqueue_in(
+        timedelta(seconds=delay_seconds),
+        reap_stale_transcriptions_job,
+        job_id=job_id,
+        result_ttl=0,
+    )
+    return job_id
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import logging
+import os
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import ColumnElement, and_, delete, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.upload import UploadSession, UploadStatus
+from app.services.storage import discard_upload, partial_upload_path
+
+logger = logging.getLogger(__name__)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def claimable() -> ColumnElement[bool]:
+    """Upload livre para nova requisição: ocioso ou com claim expirado."""
+    stale = _now() - timedelta(seconds=settings.UPLOAD_CLAIM_TIMEOUT_SECONDS)
+    return or_(
+        UploadSession.status == UploadStatus.UPLOADING,
+        and_(
+            UploadSession.status.in_([UploadStatus.WRITING, UploadStatus.COMPLETING]),
+            UploadSession.claimed_at < stale,
+        ),
+    )
+
+
+async def claim_upload(
+    db: AsyncSession, upload_id: str, status: UploadStatus, expected_offset: int
+) -> Optional[str]:
+    """
+    Reservar o upload para um PATCH (``WRITING``) ou a finalização (``COMPLETING``).
+
+    UPDATE condicional no offset e no estado, commitado antes de qualquer
+    gravação: entre workers só uma requisição obtém o claim. Devolve o token
+    a ser passado a ``release_upload``, ou None se o upload estiver ocupado
+    ou com offset diferente de ``expected_offset``.
+    """
+    token = uuid.uuid4().hex
+    result = await db.execute(
+        update(UploadSession)
+        .where(
+            UploadSession.id == upload_id,
+            UploadSession.offset == expected_offset,
+            claimable(),
+        )
+        .values(status=status, claim_token=token, claimed_at=_now())
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return token if result.rowcount == 1 else None
+
+
+async def release_upload(
+    db: AsyncSession,
+    upload_id: str,
+    token: str,
+    written: int = 0,
+    mime_type: Optional[str] = None,
+    restart: bool = False,
+) -> bool:
+    """Devolver o upload ao estado ocioso somando ``written`` ao offset.
+
+    ``restart`` zera o offset: o arquivo parcial não existe mais e o cliente
+    precisa reenviar desde o início. Devolve False se o claim foi perdido.
+    """
+    values: Dict[str, Any] = {
+        "status": UploadStatus.UPLOADING,
+        "claim_token": None,
+        "claimed_at": None,
+        "offset": 0 if restart else UploadSession.offset + written,
+    }
+    if mime_type is not None:
+        values["mime_type"] = mime_type
+    result = await db.execute(
+        update(UploadSession)
+        .where(UploadSession.id == upload_id, UploadSession.claim_token == token)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return result.rowcount == 1
+
+
+async def expire_stale_uploads(db: AsyncSession) -> List[str]:
+    """
+    Remover uploads abandonados e arquivos parciais órfãos.
+
+    Sessões não finalizadas sem atividade há ``UPLOAD_SESSION_TTL_HOURS`` são
+    apagadas (com o arquivo parcial), assim como arquivos em ``.partial`` sem
+    sessão e com a mesma idade. Devolve os IDs das sessões removidas.
+    """
+    cutoff = _now() - timedelta(hours=settings.UPLOAD_SESSION_TTL_HOURS)
+    stale = and_(
+        UploadSession.status != UploadStatus.COMPLETED,
+        func.coalesce(UploadSession.updated_at, UploadSession.created_at) < cutoff,
+        claimable(),
+    )
+    result = await db.execute(select(UploadSession.id).where(stale))
+    candidates = list(result.scalars())
+    expired: List[str] = []
+    for upload_id in candidates:
+        # Condicional: um PATCH pode ter reativado a sessão depois da consulta
+        deleted = await db.execute(
+            delete(UploadSession)
+            .where(UploadSession.id == upload_id, stale)
+            .execution_options(synchronize_session=False)
+        )
+        if deleted.rowcount == 1:
+            expired.append(upload_id)
+    await db.commit()
+    for upload_id in expired:
+        await discard_upload(upload_id)
+
+    directory = partial_upload_path("_").parent
+    known = set((await db.execute(select(UploadSession.id))).scalars())
+    cutoff_ts = time.time() - settings.UPLOAD_SESSION_TTL_HOURS * 3600
+    for entry in os.scandir(directory):
+        if (
+            entry.is_file()
+            and entry.name not in known
+            and entry.stat().st_mtime < cutoff_ts
+        ):
+            await discard_upload(entry.name)
+            expired.append(entry.name)
+    if expired:
+        logger.info("Uploads abandonados removidos: %s", expired)
+    return expired
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from redis import asyncio as aioredis  # type: ignore
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.schemas.auth import UserResponse
+
+_redis_client: Optional[aioredis.Redis] = None
+
+
+def _identity_key(user_id: int) -> str:
+    return f"user:{user_id}:identity"
+
+
+def _redis() -> aioredis.Redis:
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = aioredis.Redis.from_url(
+            settings.REDIS_URL, socket_timeout=2, socket_connect_timeout=2
+        )
+    return _redis_client
+
+
+class UserCache:
+    """Cache LRU com TTL da identidade dos usuários autenticados.
+
+    Evita a consulta ao banco em cada requisição autenticada. Guarda o
+    ``UserResponse`` (inclui ``is_active``); alterações que afetam o acesso
+    devem chamar ``invalidate`` após o commit (``app.services.users`` faz
+    isso para toda alteração de ``User`` confirmada). Com ``USER_CACHE_REDIS``
+    o cache local é complementado por um registro compartilhado entre
+    réplicas — nas demais réplicas uma entrada local invalidada expira em
+    até ``ttl_seconds``.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[int, Tuple[float, UserResponse]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_local(self, user_id: int) -> Optional[UserResponse]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, user = entry
+            if expires_at <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return user
+
+    def _set_local(self, user: UserResponse) -> None:
+        with self._lock:
+            self._entries[user.id] = (time.monotonic() + self.ttl_seconds, user)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                metrics.incr("user_cache.evictions")
+            metrics.set_gauge("user_cache.size", len(self._entries))
+
+    async def get(self, user_id: int) -> Optional[UserResponse]:
+        """Usuário em cache (local e, se habilitado, Redis), ou None em caso de miss."""
+        user = self._get_local(user_id)
+        if user is None and settings.USER_CACHE_REDIS:
+            try:
+                raw = await _redis().get(_identity_key(user_id))
+            except Exception:
+                raw = None
+            if raw:
+                user = UserResponse.model_validate_json(raw)
+                self._set_local(user)
+        metrics.incr("user_cache.hits" if user is not None else "user_cache.misses")
+        return user
+
+    async def set(self, user: UserResponse) -> None:
+        if self.max_entries <= 0:
+            return
+        self._set_local(user)
+        if settings.USER_CACHE_REDIS:
+            try:
+                await _redis().set(
+                    _identity_key(user.id),
+                    user.model_dump_json(),
+                    ex=int(self.ttl_seconds),
+                )
+            except Exception:
+                pass
+
+    def invalidate_local(self, user_id: int) -> None:
+        """Remover o usuário apenas do cache deste processo."""
+        with self._lock:
+            self._entries.pop(user_id, None)
+            metrics.set_gauge("user_cache.size", len(self._entries))
+        metrics.incr("user_cache.invalidations")
+
+    async def invalidate(self, user_id: int) -> None:
+        """Remover o usuário do cache (ex.: desativação, troca de dados de acesso).
+
+        Deve ser chamada depois do commit: antes dele uma requisição
+        concorrente ainda leria o estado antigo do banco e o recolocaria
+        no cache.
+        """
+        self.invalidate_local(user_id)
+        await self.invalidate_shared(user_id)
+
+    async def invalidate_shared(self, user_id: int) -> None:
+        """Remover o usuário do registro compartilhado (Redis), se habilitado."""
+        if settings.USER_CACHE_REDIS:
+            try:
+                await _redis().delete(_identity_key(user_id))
+            except Exception:
+                pass
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache(settings.USER_CACHE_MAX_ENTRIES, settings.USER_CACHE_TTL_SECONDS)
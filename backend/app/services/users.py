@@ -1,8 +1,17 @@
-from typing import Optional
+import asyncio
+from typing import Optional, Set
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, UOWTransaction
 from app.models.user import User
+from app.core.executors import run_in_thread
 from app.core.security import get_password_hash
+from app.services.user_cache import user_cache
+
+# Chave em Session.info com os ids de usuários alterados ainda não confirmados
+_CHANGED_USERS = "changed_user_ids"
+# Referências às remoções no Redis agendadas pelo hook de commit
+_pending_invalidations: Set["asyncio.Task[None]"] = set()
 
 
 async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
@@ -16,9 +25,58 @@ async def get_user_by_id(db: AsyncSession, user_id: int) -> Optional[User]:
 
 
 async def create_user(db: AsyncSession, *, email: str, full_name: str, password: str) -> User:
-    hashed_password = get_password_hash(password)
+    hashed_password = await run_in_thread(get_password_hash, password)
     user = User(email=email, full_name=full_name, hashed_password=hashed_password)
     db.add(user)
     await db.flush()
     await db.refresh(user)
     return user
+
+
+async def deactivate_user(db: AsyncSession, user: User) -> User:
+    """Desativar o usuário e confirmar; o cache só é limpo após o commit."""
+    user.is_active = False
+    await db.commit()
+    await user_cache.invalidate(int(user.id))
+    return user
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session: Session, flush_context: UOWTransaction) -> None:
+    # Ainda no estado pré-flush: dirty/deleted refletem o que foi gravado
+    changed = {obj.id for obj in session.deleted if isinstance(obj, User)}
+    changed.update(
+        obj.id
+        for obj in session.dirty
+        if isinstance(obj, User) and session.is_modified(obj)
+    )
+    if changed:
+        session.info.setdefault(_CHANGED_USERS, set()).update(changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session: Session) -> None:
+    """Invalidar o cache de todo usuário alterado na transação confirmada.
+
+    Cobre qualquer caminho que altere ``User`` (ativação, senha, permissões)
+    sem depender de cada endpoint lembrar de chamar ``invalidate``. O hook é
+    síncrono: a remoção no Redis é agendada no loop corrente, se houver.
+    """
+    user_ids = session.info.pop(_CHANGED_USERS, None)
+    if not user_ids:
+        return
+    try:
+        loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    for user_id in user_ids:
+        user_cache.invalidate_local(user_id)
+        if loop is not None:
+            task = loop.create_task(user_cache.invalidate_shared(user_id))
+            _pending_invalidations.add(task)
+            task.add_done_callback(_pending_invalidations.discard)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session: Session) -> None:
+    session.info.pop(_CHANGED_USERS, None)
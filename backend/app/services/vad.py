@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from typing import List, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.audio import SAMPLE_RATE
+
+# Janelas de 30 ms (480 amostras a 16 kHz)
+FRAME_SAMPLES = 480
+# Frames analisados por bloco: limita a memória em gravações de horas
+_BLOCK_FRAMES = 2000
+# Faixa de frequências da voz (Hz) usada na razão espectral
+_SPEECH_BAND_HZ = (300.0, 3400.0)
+
+Region = Tuple[int, int]
+
+
+def _frame_features(block: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Energia (dBFS) e fração de energia na faixa de voz para cada frame do bloco."""
+    n_frames = len(block) // FRAME_SAMPLES
+    frames = np.asarray(block[: n_frames * FRAME_SAMPLES], dtype=np.float32).reshape(
+        n_frames, FRAME_SAMPLES
+    )
+    energy_db = 10.0 * np.log10(np.mean(frames * frames, axis=1) + 1e-10)
+
+    spectrum = (
+        np.abs(
+            np.fft.rfft(frames * np.hanning(FRAME_SAMPLES).astype(np.float32), axis=1)
+        )
+        ** 2
+    )
+    freqs = np.fft.rfftfreq(FRAME_SAMPLES, d=1.0 / SAMPLE_RATE)
+    band = (freqs >= _SPEECH_BAND_HZ[0]) & (freqs <= _SPEECH_BAND_HZ[1])
+    band_ratio = spectrum[:, band].sum(axis=1) / (spectrum.sum(axis=1) + 1e-10)
+    return energy_db, band_ratio
+
+
+def frame_features(audio: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Calcular as features de todos os frames, bloco a bloco."""
+    energies = []
+    ratios = []
+    block_samples = _BLOCK_FRAMES * FRAME_SAMPLES
+    for start in range(0, len(audio) - FRAME_SAMPLES + 1, block_samples):
+        energy_db, band_ratio = _frame_features(audio[start : start + block_samples])
+        energies.append(energy_db)
+        ratios.append(band_ratio)
+    if not energies:
+        return np.zeros(0, dtype=np.float32), np.zeros(0, dtype=np.float32)
+    return np.concatenate(energies), np.concatenate(ratios)
+
+
+def detect_speech(audio: np.ndarray) -> List[Region]:
+    """
+    Detectar regiões de fala em um array PCM mono 16 kHz.
+
+    Um frame é fala quando a energia supera o piso de ruído da gravação
+    (percentil 10) por ``VAD_ENERGY_MARGIN_DB`` e a maior parte da energia
+    está na faixa de voz. Regiões recebem ``VAD_PADDING_SECONDS`` de margem,
+    pausas menores que ``VAD_MIN_SILENCE_SECONDS`` são unidas e trechos
+    menores que ``VAD_MIN_SPEECH_SECONDS`` descartados.
+
+    Retorna intervalos [início, fim) em amostras.
+    """
+    energy_db, band_ratio = frame_features(audio)
+    if len(energy_db) == 0:
+        return []
+
+    noise_floor = float(np.percentile(energy_db, 10))
+    threshold = max(
+        noise_floor + settings.VAD_ENERGY_MARGIN_DB, settings.VAD_MIN_ENERGY_DB
+    )
+    speech = (energy_db > threshold) & (band_ratio >= settings.VAD_SPEECH_BAND_RATIO)
+
+    # Bordas das sequências de frames de fala
+    padded = np.concatenate(([False], speech, [False])).astype(np.int8)
+    edges = np.flatnonzero(np.diff(padded))
+    starts, ends = edges[0::2], edges[1::2]
+
+    pad = int(settings.VAD_PADDING_SECONDS * SAMPLE_RATE)
+    min_silence = int(settings.VAD_MIN_SILENCE_SECONDS * SAMPLE_RATE)
+    min_speech = int(settings.VAD_MIN_SPEECH_SECONDS * SAMPLE_RATE)
+
+    regions: List[Region] = []
+    for start_frame, end_frame in zip(starts, ends):
+        start = max(0, int(start_frame) * FRAME_SAMPLES - pad)
+        end = min(len(audio), int(end_frame) * FRAME_SAMPLES + pad)
+        if regions and start - regions[-1][1] < min_silence:
+            regions[-1] = (regions[-1][0], end)
+        else:
+            regions.append((start, end))
+    return [r for r in regions if r[1] - r[0] >= min_speech]
+
+
+def _quietest_cut(audio: np.ndarray, lo: int, hi: int) -> int:
+    """Amostra de início do frame de menor energia em [lo, hi)."""
+    energy_db, _ = frame_features(audio[lo:hi])
+    if len(energy_db) == 0:
+        return hi
+    return lo + int(np.argmin(energy_db)) * FRAME_SAMPLES
+
+
+def plan_speech_chunks(
+    audio: np.ndarray, regions: List[Region], max_chunk_seconds: float
+) -> List[Region]:
+    """
+    Agrupar regiões de fala em chunks de até ``max_chunk_seconds``.
+
+    Regiões próximas (pausa até ``VAD_SKIP_SILENCE_SECONDS``) ficam no mesmo
+    chunk, que é uma fatia contínua do áudio; silêncios maiores ficam fora
+    de qualquer chunk e não são enviados ao modelo. Assim as fronteiras caem
+    sempre em silêncio; uma fala contínua maior que o limite é cortada no
+    frame mais silencioso do último quinto da janela.
+    """
+    max_samples = max(FRAME_SAMPLES, int(max_chunk_seconds * SAMPLE_RATE))
+    max_gap = int(settings.VAD_SKIP_SILENCE_SECONDS * SAMPLE_RATE)
+
+    chunks: List[Region] = []
+    for start, end in regions:
+        if (
+            chunks
+            and start - chunks[-1][1] <= max_gap
+            and end - chunks[-1][0] <= max_samples
+        ):
+            chunks[-1] = (chunks[-1][0], end)
+            continue
+        while end - start > max_samples:
+            cut = _quietest_cut(
+                audio, start + max_samples * 4 // 5, start + max_samples
+            )
+            chunks.append((start, cut))
+            start = cut
+        chunks.append((start, end))
+    return chunks
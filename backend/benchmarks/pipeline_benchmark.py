@@ -0,0 +1,281 @@
+"""Benchmark do pipeline de transcrição com áudio sintético.
+
+Gera um áudio "parecido com fala" (sílabas harmônicas com pausas e silêncios
+longos), roda ``_run_pipeline`` contra SQLite e registra tempo de parede,
+fator de tempo real, pico de RSS e o tempo de cada estágio em um histórico
+JSON, comparando com a execução anterior de mesmos parâmetros.
+
+Uso (a partir de ``backend/``)::
+
+    python -m benchmarks.pipeline_benchmark --seconds 600 --format mp3
+    python -m benchmarks.pipeline_benchmark --engine whisper --model tiny --workers 4
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import resource
+import subprocess
+import tempfile
+import time
+import wave
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import ffmpeg  # type: ignore
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.database import Base
+from app.models.transcription import Transcription, TranscriptionStatus
+from app.models.user import User
+from app.services import transcription_pipeline as pipeline
+from app.services.audio import SAMPLE_RATE
+from app.services.model_pool import get_model_pool
+from app.services.profiling import collect_stage_timings
+
+DEFAULT_HISTORY = Path(__file__).parent / "history.json"
+
+
+def synthesize_speech_like(seconds: float, seed: int = 0) -> np.ndarray:
+    """Áudio mono 16 kHz com "sílabas" harmônicas, pausas curtas e silêncios longos."""
+    rng = np.random.default_rng(seed)
+    total = int(seconds * SAMPLE_RATE)
+    audio = rng.normal(0, 0.002, total).astype(np.float32)  # ruído de sala
+    pos = 0
+    while pos < total:
+        if rng.random() < 0.05:
+            pos += int(rng.uniform(10, 40) * SAMPLE_RATE)  # recesso / microfone mudo
+            continue
+        for _ in range(int(rng.integers(3, 12))):  # uma frase
+            n = int(rng.uniform(0.12, 0.35) * SAMPLE_RATE)
+            if pos + n >= total:
+                break
+            t = np.arange(n) / SAMPLE_RATE
+            f0 = rng.uniform(100, 240)
+            # harmônicos da fundamental com ênfase nos formantes (faixa de voz)
+            syllable = sum(
+                np.sin(2 * np.pi * f0 * h * t)
+                * (1.0 if 300 <= f0 * h <= 3400 else 0.2)
+                / np.sqrt(h)
+                for h in range(1, 16)
+            )
+            envelope = np.sin(np.pi * np.arange(n) / n) ** 2
+            audio[pos:pos + n] += (0.05 * syllable * envelope).astype(np.float32)
+            pos += n + int(rng.uniform(0.03, 0.15) * SAMPLE_RATE)
+        pos += int(rng.uniform(0.4, 2.5) * SAMPLE_RATE)
+    return np.clip(audio, -1.0, 1.0)
+
+
+def write_audio(audio: np.ndarray, dest_dir: Path, fmt: str) -> Path:
+    """Gravar o áudio em wav, mp3 ou mp4 (vídeo preto + AAC, como uma audiência)."""
+    wav_path = dest_dir / "synthetic.wav"
+    with wave.open(str(wav_path), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(SAMPLE_RATE)
+        w.writeframes((audio * 32767).astype("<i2").tobytes())
+    if fmt == "wav":
+        return wav_path
+
+    out_path = dest_dir / f"synthetic.{fmt}"
+    audio_in = ffmpeg.input(str(wav_path))
+    if fmt == "mp3":
+        stream = ffmpeg.output(
+            audio_in, str(out_path), acodec="libmp3lame", audio_bitrate="64k"
+        )
+    elif fmt == "mp4":
+        video_in = ffmpeg.input("color=c=black:s=320x240:r=5", f="lavfi")
+        stream = ffmpeg.output(
+            video_in,
+            audio_in,
+            str(out_path),
+            vcodec="libx264",
+            acodec="aac",
+            shortest=None,
+            pix_fmt="yuv420p",
+        )
+    else:
+        raise ValueError(f"Formato não suportado: {fmt}")
+    stream.overwrite_output().run(quiet=True)
+    return out_path
+
+
+async def run_once(media_path: Path, work_dir: Path) -> Dict[str, Any]:
+    """Rodar o pipeline uma vez contra um SQLite descartável."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{work_dir / 'bench.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with session_factory() as session:
+        user = User(
+            email="bench@example.com", full_name="Benchmark", hashed_password="x"
+        )
+        session.add(user)
+        await session.flush()
+        transcription = Transcription(
+            title="Benchmark",
+            original_filename=media_path.name,
+            file_path=str(media_path),
+            status=TranscriptionStatus.PENDING,
+            user_id=user.id,
+        )
+        session.add(transcription)
+        await session.commit()
+
+        loads_before = get_model_pool().load_seconds_total
+        with collect_stage_timings() as timings:
+            started = time.perf_counter()
+            await pipeline._run_pipeline(session, transcription)
+            await session.commit()
+            wall = time.perf_counter() - started
+
+        result = {
+            "wall_seconds": round(wall, 3),
+            "audio_seconds": transcription.duration,
+            "transcribed_seconds": transcription.total_seconds,
+            "real_time_factor": (
+                round(wall / transcription.duration, 4)
+                if transcription.duration
+                else None
+            ),
+            "stages": {
+                name: round(value, 3) for name, value in sorted(timings.items())
+            },
+            "model_load_seconds": round(
+                get_model_pool().load_seconds_total - loads_before, 3
+            ),
+        }
+    await engine.dispose()
+    return result
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+def _vm_hwm_mb(pid: int) -> Optional[float]:
+    """Pico de RSS (VmHWM) de um processo vivo, em MB; None sem /proc."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+
+def _peak_rss_mb() -> Dict[str, Any]:
+    """Pico de RSS do processo e de cada processo do pool de chunks.
+
+    Os processos do pool ainda estão vivos (RUSAGE_CHILDREN não os enxerga) e
+    são medidos pelo VmHWM, antes de o pool ser encerrado. O ffmpeg fica de
+    fora: no Linux o ru_maxrss de um filho criado por fork parte do RSS do pai.
+    """
+    workers = [
+        peak
+        for peak in map(_vm_hwm_mb, pipeline._chunk_worker_pids())
+        if peak is not None
+    ]
+    return {
+        # KB no Linux
+        "self": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "pool_workers": workers,
+        "pool_workers_total": round(sum(workers), 1),
+    }
+
+
+def append_history(
+    history_path: Path, entry: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    """Acrescentar ao histórico; retorna a última execução com os mesmos parâmetros."""
+    history: List[Dict[str, Any]] = (
+        json.loads(history_path.read_text()) if history_path.exists() else []
+    )
+    previous = next(
+        (h for h in reversed(history) if h.get("params") == entry["params"]), None
+    )
+    history.append(entry)
+    history_path.write_text(json.dumps(history, indent=2, ensure_ascii=False) + "\n")
+    return previous
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--seconds", type=float, default=300.0, help="duração do áudio sintético"
+    )
+    parser.add_argument("--format", choices=["wav", "mp3", "mp4"], default="wav")
+    parser.add_argument(
+        "--engine", default="stub", help="ASR_ENGINE (stub, whisper, faster-whisper)"
+    )
+    parser.add_argument(
+        "--model",
+        default=None,
+        help="força o modelo (ex.: tiny) em vez da escolha por duração",
+    )
+    parser.add_argument("--workers", type=int, default=1, help="TRANSCRIPTION_WORKERS")
+    parser.add_argument("--no-vad", action="store_true", help="desligar o VAD")
+    parser.add_argument("--history", type=Path, default=DEFAULT_HISTORY)
+    args = parser.parse_args()
+
+    # Repassadas também aos processos do pool de chunks (ver _CHUNK_WORKER_SETTINGS)
+    settings.ASR_ENGINE = args.engine
+    settings.TRANSCRIPTION_WORKERS = args.workers
+    settings.ENABLE_VAD = not args.no_vad
+    if args.model:
+        pipeline._choose_whisper_model = (  # type: ignore[assignment]
+            lambda _duration: args.model
+        )
+
+    with tempfile.TemporaryDirectory(prefix="pipeline-bench-") as tmp:
+        work_dir = Path(tmp)
+        settings.UPLOAD_PATH = str(work_dir)
+        media_path = write_audio(
+            synthesize_speech_like(args.seconds), work_dir, args.format
+        )
+        result = asyncio.run(run_once(media_path, work_dir))
+        peak_rss = _peak_rss_mb()
+        pipeline._reset_chunk_executor(wait=True)
+
+    entry = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "params": {
+            "seconds": args.seconds,
+            "format": args.format,
+            "engine": args.engine,
+            "model": args.model,
+            "workers": args.workers,
+            "vad": not args.no_vad,
+        },
+        **result,
+        "peak_rss_mb": peak_rss,
+    }
+    previous = append_history(args.history, entry)
+
+    print(json.dumps(entry, indent=2, ensure_ascii=False))
+    if previous is not None and previous.get("wall_seconds"):
+        delta = (
+            (entry["wall_seconds"] - previous["wall_seconds"])
+            / previous["wall_seconds"]
+            * 100
+        )
+        reference = previous.get("commit") or previous["timestamp"]
+        print(f"Tempo de parede vs. {reference}: {delta:+.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ from sqlalchemy.orm import sessionmaker
 from app.main import app
 from app.core.database import Base, get_db
 from app.core.config import settings
+from app.services.user_cache import user_cache
 from pathlib import Path
 import tempfile
 from unittest.mock import patch
@@ -58,6 +59,8 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
         yield db_session
     
     app.dependency_overrides[get_db] = get_test_db
+    # IDs de usuário se repetem entre testes (banco recriado)
+    user_cache.clear()
 
     # Isola uploads em diretório temporário gravável
     tmp_upload_dir = Path(tempfile.gettempdir()) / "transcritor_uploads"
@@ -66,7 +69,9 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
     transport = ASGITransport(app=app)
     # Evita uso real de Redis/Whisper/ffmpeg em testes
     with patch("app.api.transcriptions.enqueue_transcription_job") as mock_enqueue, \
-         patch("app.services.transcription_pipeline.whisper.load_model") as mock_whisper_load:
+         patch("app.api.transcriptions.publish_progress_async"), \
+         patch("app.api.transcriptions.read_progress", return_value=None), \
+         patch("app.services.asr.whisper.load_model") as mock_whisper_load:
         mock_enqueue.return_value = "test-job-id"
         mock_whisper_load.return_value = type("M", (), {"transcribe": lambda *_args, **_kw: {"text": ""}})()
         async with AsyncClient(transport=transport, base_url="http://test") as ac:
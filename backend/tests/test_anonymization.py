@@ -0,0 +1,52 @@
+from app.services.anonymization import Anonymizer
+from app.services.text_processing import anonymize_text
+
+
+def test_anonymize_text_keeps_existing_masks():
+    text = (
+        "Contato joao.silva@exemplo.com.br, CPF 123.456.789-01, "
+        "CNPJ 12.345.678/0001-90."
+    )
+    assert (
+        anonymize_text(text)
+        == "Contato j***@exemplo.com.br, CPF 123.***.***-**, CNPJ 12.***.***/****-**."
+    )
+
+
+def test_single_pass_masks_brazilian_legal_identifiers():
+    anonymizer = Anonymizer()
+    text = (
+        "RG 12.345.678-X, OAB/SP 123.456 e OAB nº 98.765/RJ. "
+        "Processo 0001234-56.2024.8.26.0100. "
+        "Tel. (11) 98765-4321, 21 3456-7890 ou 98765-4321. CEP 01310-100. "
+        "Agência 1234, conta corrente 12345-6. Audiência de 2024-2025, ramal 3456-7890."
+    )
+    assert anonymizer.anonymize(text) == (
+        "RG **.***.***-*, OAB/SP ***.*** e OAB nº **.***/RJ. "
+        "Processo *******-**.2024.8.26.****. "
+        "Tel. (11) *****-****, 21 ****-**** ou *****-****. CEP *****-***. "
+        "Agência ****, conta corrente *****-*. Audiência de 2024-2025, ramal 3456-7890."
+    )
+
+
+def test_bare_conta_needs_an_account_number():
+    anonymizer = Anonymizer()
+    text = (
+        "O documento conta 2 versões; por conta de 3 atrasos, "
+        "depósito na conta 12345-6 e na conta nº 987.654-0."
+    )
+    assert anonymizer.anonymize(text) == (
+        "O documento conta 2 versões; por conta de 3 atrasos, "
+        "depósito na conta *****-* e na conta nº ***.***-*."
+    )
+
+
+def test_names_dictionary_matches_whole_words_longest_first():
+    anonymizer = Anonymizer(["João da Silva", "João", "Ana"])
+    texts = ["JOÃO DA  SILVA confirmou.", "Ana e Anamaria", "João da Costa"]
+    assert list(anonymizer.anonymize_many(texts)) == [
+        "[NOME] confirmou.",
+        "[NOME] e Anamaria",
+        "[NOME] da Costa",
+    ]
+    assert Anonymizer(["Ana"]).fingerprint != Anonymizer().fingerprint
@@ -40,3 +40,64 @@ async def test_register_and_login_flow(client: AsyncClient):
     assert resp.status_code == 200
     refreshed = resp.json()
     assert "access_token" in refreshed
+
+
+@pytest.mark.asyncio
+async def test_current_user_is_cached_until_deactivated(
+    client: AsyncClient, db_session
+):
+    from app.core.metrics import metrics
+    from app.services.users import deactivate_user, get_user_by_email
+
+    payload = {
+        "email": "cache@example.com",
+        "full_name": "Cache User",
+        "password": "StrongP@ssw0rd",
+    }
+    assert (await client.post("/api/v1/auth/register", json=payload)).status_code == 201
+    login = await client.post(
+        "/api/v1/auth/login",
+        data={"username": payload["email"], "password": payload["password"]},
+    )
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    hits = metrics.get("user_cache.hits")
+    assert (await client.get("/api/v1/auth/me", headers=headers)).status_code == 200
+    assert (await client.get("/api/v1/auth/me", headers=headers)).status_code == 200
+    assert metrics.get("user_cache.hits") == hits + 1
+
+    user = await get_user_by_email(db_session, payload["email"])
+    await deactivate_user(db_session, user)
+    resp = await client.get("/api/v1/auth/me", headers=headers)
+    assert resp.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_user_cache_is_invalidated_only_after_commit(
+    client: AsyncClient, db_session
+):
+    from app.services.users import get_user_by_email
+
+    payload = {
+        "email": "commit@example.com",
+        "full_name": "Commit User",
+        "password": "StrongP@ssw0rd",
+    }
+    assert (await client.post("/api/v1/auth/register", json=payload)).status_code == 201
+    login = await client.post(
+        "/api/v1/auth/login",
+        data={"username": payload["email"], "password": payload["password"]},
+    )
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    assert (await client.get("/api/v1/auth/me", headers=headers)).status_code == 200
+
+    # Alteração direta, sem passar por deactivate_user
+    user = await get_user_by_email(db_session, payload["email"])
+    user.is_active = False
+    await db_session.flush()
+    # Ainda não confirmada: o cache não pode ser limpo antes do commit
+    assert (await client.get("/api/v1/auth/me", headers=headers)).status_code == 200
+
+    await db_session.commit()
+    resp = await client.get("/api/v1/auth/me", headers=headers)
+    assert resp.status_code == 401
@@ -0,0 +1,136 @@
+import os
+import shutil
+
+import ffmpeg
+import pytest
+
+from app.core.config import settings
+from app.models.transcription import Transcription, TranscriptionStatus
+from app.models.user import User
+from app.services.audio import decode_to_pcm, load_pcm
+from app.services.ingest import archive_original, ingest_audio
+
+pytestmark = pytest.mark.skipif(
+    shutil.which("ffmpeg") is None, reason="ffmpeg não instalado"
+)
+
+
+@pytest.mark.asyncio
+async def test_ingest_extracts_audio_and_moves_video_to_cold_storage(
+    db_session, monkeypatch, tmp_path
+):
+    monkeypatch.setattr(settings, "UPLOAD_PATH", str(tmp_path / "uploads"))
+    monkeypatch.setattr(settings, "COLD_STORAGE_PATH", str(tmp_path / "cold"))
+    monkeypatch.setattr(settings, "ORIGINAL_MEDIA_POLICY", "cold")
+    video = tmp_path / "audiencia.mp4"
+    (
+        ffmpeg.output(
+            ffmpeg.input("color=c=black:s=320x240:r=25:d=3", f="lavfi"),
+            ffmpeg.input("sine=frequency=440:duration=3", f="lavfi"),
+            str(video), vcodec="libx264", acodec="aac", pix_fmt="yuv420p",
+        )
+        .overwrite_output()
+        .run(quiet=True)
+    )
+
+    user = User(
+        email="ingest@example.com", full_name="Ingest User", hashed_password="x"
+    )
+    db_session.add(user)
+    await db_session.flush()
+    transcription = Transcription(
+        title="Vídeo",
+        original_filename="audiencia.mp4",
+        file_path=str(video),
+        mime_type="video/mp4",
+        content_hash="ab" * 32,
+        status=TranscriptionStatus.PENDING,
+        user_id=user.id,
+    )
+    db_session.add(transcription)
+    await db_session.flush()
+
+    audio_path = ingest_audio(transcription)
+    await archive_original(db_session, transcription)
+
+    assert audio_path.suffix == ".opus"
+    assert os.path.getsize(audio_path) < os.path.getsize(transcription.file_path)
+    assert not video.exists()
+    assert transcription.file_path.startswith(str(tmp_path / "cold"))
+    assert transcription.media_status == "cold"
+    assert abs(len(load_pcm(str(decode_to_pcm(str(audio_path))))) / 16000 - 3.0) < 0.1
+
+
+@pytest.mark.asyncio
+async def test_deleted_original_is_marked_and_replaced_on_reupload(
+    db_session, monkeypatch, tmp_path
+):
+    import hashlib
+
+    from app.models.blob import Blob
+    from app.models.transcription import MediaStatus
+    from app.services.blobstore import blob_path, store_blob
+    from app.services.storage import StoredUpload
+
+    monkeypatch.setattr(settings, "UPLOAD_PATH", str(tmp_path / "uploads"))
+    monkeypatch.setattr(settings, "ORIGINAL_MEDIA_POLICY", "delete")
+    content = b"\x00\x00\x00\x18ftypmp42" + b"video" * 100
+    content_hash = hashlib.sha256(content).hexdigest()
+
+    def _staged() -> StoredUpload:
+        staged = tmp_path / "staged.mp4"
+        staged.write_bytes(content)
+        return StoredUpload(
+            path=staged,
+            size=len(content),
+            content_hash=content_hash,
+            mime_type="video/mp4",
+        )
+
+    stored = await store_blob(db_session, _staged())
+    user = User(
+        email="delete-policy@example.com",
+        full_name="Delete Policy",
+        hashed_password="x",
+    )
+    db_session.add(user)
+    await db_session.flush()
+    transcription = Transcription(
+        title="Vídeo",
+        original_filename="audiencia.mp4",
+        file_path=str(stored.path),
+        mime_type="video/mp4",
+        content_hash=content_hash,
+        status=TranscriptionStatus.PENDING,
+        user_id=user.id,
+    )
+    db_session.add(transcription)
+    await db_session.flush()
+
+    await archive_original(db_session, transcription)
+    assert not stored.path.exists()
+    assert transcription.media_status == MediaStatus.DELETED
+    blob = await db_session.get(Blob, content_hash)
+    assert blob.path == str(blob_path(content_hash))  # caminho mantido para o reenvio
+
+    # Reenvio do mesmo conteúdo recoloca o arquivo e as transcrições voltam a tê-lo
+    await store_blob(db_session, _staged())
+    await db_session.refresh(transcription)
+    assert stored.path.read_bytes() == content
+    assert transcription.media_status == MediaStatus.STORED
+
+
+def test_audio_uploads_are_not_transcoded(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "UPLOAD_PATH", str(tmp_path / "uploads"))
+    audio = tmp_path / "audiencia.mp3"
+    audio.write_bytes(b"ID3" + bytes(64))
+    transcription = Transcription(
+        title="Áudio",
+        original_filename="audiencia.mp3",
+        file_path=str(audio),
+        mime_type="audio/mpeg",
+        content_hash="cd" * 32,
+    )
+
+    assert ingest_audio(transcription) == audio
+    assert not (tmp_path / "uploads" / "audio").exists()
@@ -0,0 +1,126 @@
+from unittest.mock import patch
+
+import numpy as np
+
+from app.services.asr import StubEngine, create_engine
+from app.services.audio import SAMPLE_RATE
+from app.services.model_pool import ModelPool
+
+
+class _FakeEngine(StubEngine):
+    def estimate_bytes(self):
+        return 100
+
+
+def test_model_pool_reuses_and_evicts_lru():
+    loaded = []
+
+    def fake_create(name, device, precision, engine_name=None):
+        loaded.append(name)
+        return _FakeEngine(name, device, precision)
+
+    with patch("app.services.model_pool.create_engine", side_effect=fake_create), \
+         patch("app.services.model_pool.settings.ASR_ENGINE", "whisper"):
+        pool = ModelPool(max_bytes=250)
+        tiny = pool.get("tiny", device="cpu", precision="fp32")
+        assert pool.get("tiny", device="cpu", precision="fp32") is tiny
+        pool.get("base", device="cpu", precision="fp32")
+        # tiny passa a ser o mais recente
+        pool.get("tiny", device="cpu", precision="fp32")
+        pool.get("small", device="cpu", precision="fp32")  # despeja base
+
+        stats = pool.stats()
+        assert loaded == ["tiny", "base", "small"]
+        assert stats["hits"] == 2
+        assert stats["misses"] == 3
+        assert stats["evictions"] == 1
+        assert stats["resident_models"] == [
+            "whisper/tiny/cpu/fp32",
+            "whisper/small/cpu/fp32",
+        ]
+
+
+def test_stub_engine_is_deterministic_and_reports_throughput():
+    engine = create_engine("tiny", "cpu", "fp32", engine_name="stub")
+    engine.load()
+    audio = np.zeros(12 * SAMPLE_RATE, dtype=np.float32)
+
+    first = engine.transcribe(audio, language="pt")
+    second = engine.transcribe(audio, language="pt")
+
+    assert (
+        first.text
+        == second.text
+        == " trecho1 de teste trecho2 de teste trecho3 de teste"
+    )
+    assert [(s.start, s.end) for s in first.segments] == [
+        (0.0, 5.0),
+        (5.0, 10.0),
+        (10.0, 12.0),
+    ]
+    assert len(first.segments[0].words) == 3
+    assert first.audio_seconds == 12.0
+    assert engine.throughput()["audio_seconds"] == 24.0
+
+
+def test_model_pool_loads_outside_the_pool_lock():
+    import threading
+
+    slow_started, release = threading.Event(), threading.Event()
+    loaded = []
+
+    def fake_create(name, device, precision, engine_name=None):
+        loaded.append(name)
+        if name == "large":
+            slow_started.set()
+            assert release.wait(5)
+        return _FakeEngine(name, device, precision)
+
+    with patch("app.services.model_pool.create_engine", side_effect=fake_create), \
+         patch("app.services.model_pool.settings.ASR_ENGINE", "whisper"):
+        pool = ModelPool(max_bytes=1000)
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    pool.get("large", device="cpu", precision="fp32")
+                )
+            )
+            for _ in range(2)
+        ]
+        for thread in threads:
+            thread.start()
+        assert slow_started.wait(5)
+        # Outro modelo não espera o carregamento em andamento
+        pool.get("tiny", device="cpu", precision="fp32")
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert results[0] is results[1]
+        assert sorted(loaded) == ["large", "tiny"]  # "large" carregado uma única vez
+        assert pool.stats()["hits"] == 1
+
+
+def test_model_pool_failed_load_releases_the_key():
+    attempts = []
+
+    def fake_create(name, device, precision, engine_name=None):
+        attempts.append(name)
+        if len(attempts) == 1:
+            raise RuntimeError("sem memória")
+        return _FakeEngine(name, device, precision)
+
+    with patch("app.services.model_pool.create_engine", side_effect=fake_create), \
+         patch("app.services.model_pool.settings.ASR_ENGINE", "whisper"):
+        pool = ModelPool(max_bytes=1000)
+        try:
+            pool.get("tiny", device="cpu", precision="fp32")
+        except RuntimeError:
+            pass
+        assert pool._loading == {}
+
+        model = pool.get("tiny", device="cpu", precision="fp32")
+        assert pool.get("tiny", device="cpu", precision="fp32") is model
+        assert attempts == ["tiny", "tiny"]
+        assert pool._loading == {}
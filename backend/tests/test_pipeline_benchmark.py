@@ -0,0 +1,40 @@
+import asyncio
+import shutil
+
+import pytest
+
+from app.core.config import settings
+from app.services import transcription_pipeline as pipeline
+from app.services.audio import SAMPLE_RATE
+from benchmarks import pipeline_benchmark as bench
+
+
+def test_synthetic_audio_is_speech_like():
+    audio = bench.synthesize_speech_like(30)
+    assert len(audio) == 30 * SAMPLE_RATE
+    assert audio.dtype.name == "float32"
+    assert -1.0 <= audio.min() and audio.max() <= 1.0
+    assert audio.std() > 0.005  # há "sílabas", não só o ruído de sala
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg não instalado")
+def test_benchmark_runs_with_chunk_pool(tmp_path, monkeypatch):
+    # O engine escolhido no pai precisa chegar aos processos "spawn" do pool
+    monkeypatch.delenv("ASR_ENGINE", raising=False)
+    monkeypatch.setattr(settings, "ASR_ENGINE", "stub")
+    monkeypatch.setattr(settings, "TRANSCRIPTION_WORKERS", 2)
+    monkeypatch.setattr(settings, "ENABLE_VAD", False)
+    monkeypatch.setattr(settings, "MAX_CHUNK_MINUTES", 1)
+    monkeypatch.setattr(settings, "UPLOAD_PATH", str(tmp_path))
+
+    media_path = bench.write_audio(bench.synthesize_speech_like(150), tmp_path, "wav")
+    try:
+        result = asyncio.run(bench.run_once(media_path, tmp_path))
+        peak_rss = bench._peak_rss_mb()
+    finally:
+        pipeline._reset_chunk_executor(wait=True)
+
+    assert result["transcribed_seconds"] == pytest.approx(150, abs=0.1)
+    assert {"ingest", "decode", "persist"} <= set(result["stages"])
+    assert len(peak_rss["pool_workers"]) == 2
+    assert peak_rss["pool_workers_total"] > 0
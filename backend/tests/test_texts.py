@@ -0,0 +1,60 @@
+import pytest
+from httpx import AsyncClient
+
+from app.core.metrics import metrics
+
+
+async def _auth_headers(client: AsyncClient) -> dict:
+    payload = {
+        "email": "texts@example.com",
+        "full_name": "Texts User",
+        "password": "StrongP@ssw0rd",
+    }
+    assert (await client.post("/api/v1/auth/register", json=payload)).status_code == 201
+    resp = await client.post(
+        "/api/v1/auth/login",
+        data={"username": payload["email"], "password": payload["password"]},
+    )
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+@pytest.mark.asyncio
+async def test_docx_export_and_extract_run_off_the_event_loop(client: AsyncClient):
+    headers = await _auth_headers(client)
+    submitted = metrics.get("executor.process.submitted")
+
+    resp = await client.post(
+        "/api/v1/texts/export/docx",
+        data={
+            "content": "Termo de audiência",
+            "title": "Ata",
+            "processo": "0001234-56.2024.8.26.0100",
+        },
+        headers=headers,
+    )
+    assert resp.status_code == 200
+    resp = await client.post(
+        "/api/v1/texts/extract",
+        files={"file": ("ata.docx", resp.content, "application/octet-stream")},
+        headers=headers,
+    )
+    assert resp.status_code == 200
+    assert "Termo de audiência" in resp.json()["content"]
+    assert metrics.get("executor.process.submitted") == submitted + 2
+    assert metrics.get("executor.process.pending") == 0
+    # hash no registro + verificação no login
+    assert metrics.get("executor.thread.submitted") >= 2
+
+
+@pytest.mark.asyncio
+async def test_broken_process_pool_is_recreated(monkeypatch):
+    import os
+    from concurrent.futures.process import BrokenProcessPool
+
+    from app.core import executors
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "CPU_PROCESS_WORKERS", 1)
+    with pytest.raises(BrokenProcessPool):
+        await executors.run_in_process(os._exit, 1)  # Worker morre no meio da tarefa
+    assert await executors.run_in_process(abs, -3) == 3
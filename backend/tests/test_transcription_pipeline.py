@@ -0,0 +1,409 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.models.transcription import (
+    Transcription,
+    TranscriptionSegment,
+    TranscriptionStatus,
+)
+from app.models.user import User
+from app.services.asr import SegmentResult, TranscriptionResult
+from app.services.audio import SAMPLE_RATE, plan_chunks
+from app.services import transcription_pipeline as pipeline
+
+
+async def _create_transcription(db_session) -> Transcription:
+    user = User(
+        email="pipeline@example.com", full_name="Pipeline User", hashed_password="x"
+    )
+    db_session.add(user)
+    await db_session.flush()
+    transcription = Transcription(
+        title="Audiência",
+        original_filename="audiencia.wav",
+        file_path="/tmp/audiencia.wav",
+        status=TranscriptionStatus.PENDING,
+        user_id=user.id,
+    )
+    db_session.add(transcription)
+    await db_session.flush()
+    return transcription
+
+
+def _fake_pcm(tmp_path, seconds: float) -> str:
+    # Arquivo esparso: zeros float32 sem ocupar disco
+    pcm_path = tmp_path / "audiencia.wav.f32"
+    with open(pcm_path, "wb") as f:
+        f.truncate(int(seconds * SAMPLE_RATE) * 4)
+    return str(pcm_path)
+
+
+def _media_patches(pcm_path: str):
+    # Sem ffmpeg: ingestão e decodificação devolvem arquivos prontos
+    return (
+        patch.object(
+            pipeline, "ingest_audio", return_value=pcm_path.replace(".wav.f32", ".opus")
+        ),
+        patch.object(pipeline, "decode_to_pcm", return_value=pcm_path),
+    )
+
+
+def _slow_first_chunk(model_name, pcm_path, start, end, options):
+    # Chunks iniciais terminam por último para exercitar o merge ordenado
+    name = "abc"[start // (600 * SAMPLE_RATE)]
+    time.sleep({"a": 0.15, "b": 0.05, "c": 0.0}[name])
+    return TranscriptionResult(
+        text=f" texto {name} ",
+        segments=[SegmentResult(id=0, start=1.0, end=2.0, text=f" {name} ")],
+    )
+
+
+@pytest.mark.asyncio
+async def test_parallel_chunks_are_merged_in_order_with_offsets(
+    db_session, monkeypatch, tmp_path
+):
+    transcription = await _create_transcription(db_session)
+    monkeypatch.setattr(settings, "TRANSCRIPTION_WORKERS", 3)
+    monkeypatch.setattr(settings, "MAX_CHUNK_MINUTES", 10)
+    monkeypatch.setattr(settings, "ENABLE_VAD", False)
+    pcm_path = _fake_pcm(tmp_path, 1800)
+
+    ingest, decode = _media_patches(pcm_path)
+    with ThreadPoolExecutor(max_workers=3) as executor, ingest, decode, \
+         patch.object(pipeline, "_get_chunk_executor", return_value=executor), \
+         patch.object(pipeline, "_transcribe_chunk", side_effect=_slow_first_chunk):
+        await pipeline._run_pipeline(db_session, transcription)
+
+    assert transcription.status == TranscriptionStatus.COMPLETED
+    assert transcription.duration == 1800.0
+    assert transcription.full_text == "texto a texto b texto c"
+    result = await db_session.execute(
+        select(TranscriptionSegment).order_by(TranscriptionSegment.id)
+    )
+    segments = result.scalars().all()
+    assert [(s.text, s.start_time) for s in segments] == [
+        ("a", 1.0),
+        ("b", 601.0),
+        ("c", 1201.0),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_with_stub_engine(db_session, monkeypatch, tmp_path):
+    transcription = await _create_transcription(db_session)
+    monkeypatch.setattr(settings, "ASR_ENGINE", "stub")
+    monkeypatch.setattr(settings, "ENABLE_VAD", False)
+    pcm_path = _fake_pcm(tmp_path, 12)
+
+    ingest, decode = _media_patches(pcm_path)
+    with ingest, decode:
+        await pipeline._run_pipeline(db_session, transcription)
+
+    assert transcription.status == TranscriptionStatus.COMPLETED
+    assert (
+        transcription.full_text == "trecho1 de teste trecho2 de teste trecho3 de teste"
+    )
+    assert transcription.total_seconds == transcription.processed_seconds == 12.0
+    result = await db_session.execute(
+        select(TranscriptionSegment).order_by(TranscriptionSegment.start_time)
+    )
+    assert [s.end_time for s in result.scalars().all()] == [5.0, 10.0, 12.0]
+
+
+@pytest.mark.asyncio
+async def test_failed_job_resumes_from_checkpoints(db_session, monkeypatch, tmp_path):
+    transcription = await _create_transcription(db_session)
+    monkeypatch.setattr(settings, "ASR_ENGINE", "stub")
+    monkeypatch.setattr(settings, "ENABLE_VAD", False)
+    monkeypatch.setattr(settings, "MAX_CHUNK_MINUTES", 1)
+    pcm_path = _fake_pcm(tmp_path, 150)  # chunks de 60 s, 60 s e 30 s
+
+    real_transcribe = pipeline._transcribe_chunk
+    calls = []
+
+    def flaky(model_name, pcm, start, end, options):
+        calls.append(start // SAMPLE_RATE)
+        if start == 60 * SAMPLE_RATE and calls.count(60) == 1:
+            raise RuntimeError("worker morreu")
+        return real_transcribe(model_name, pcm, start, end, options)
+
+    ingest, decode = _media_patches(pcm_path)
+    with ingest, decode, patch.object(pipeline, "_transcribe_chunk", side_effect=flaky):
+        with pytest.raises(RuntimeError):
+            await pipeline._run_pipeline(db_session, transcription)
+        assert transcription.status == TranscriptionStatus.FAILED
+        assert transcription.processed_seconds == 60.0
+        started_at = transcription.started_at
+
+        await pipeline._run_pipeline(db_session, transcription)
+
+    assert calls == [0, 60, 60, 120]  # o primeiro chunk não é transcrito de novo
+    assert transcription.status == TranscriptionStatus.COMPLETED
+    assert transcription.processed_seconds == transcription.total_seconds == 150.0
+    assert transcription.started_at == started_at  # ETA conta a primeira tentativa
+    result = await db_session.execute(
+        select(TranscriptionSegment.start_time).order_by(
+            TranscriptionSegment.start_time
+        )
+    )
+    starts = result.scalars().all()
+    assert len(starts) == len(set(starts)) == 30
+
+
+@pytest.mark.asyncio
+async def test_reaper_requeues_processing_jobs_without_heartbeat(db_session):
+    stale = await _create_transcription(db_session)
+    alive = Transcription(
+        title="Outra", original_filename="b.wav", file_path="/tmp/b.wav",
+        status=TranscriptionStatus.PROCESSING, user_id=stale.user_id,
+    )
+    finished = Transcription(
+        title="Concluída", original_filename="c.wav", file_path="/tmp/c.wav",
+        status=TranscriptionStatus.PROCESSING, user_id=stale.user_id,
+    )
+    db_session.add_all([alive, finished])
+    stale.status = TranscriptionStatus.PROCESSING
+    await db_session.flush()
+
+    class FakeRedis:
+        def ping(self):
+            return True
+
+        def exists(self, key):
+            if key == pipeline._heartbeat_key(finished.id):
+                # Job concluído entre a consulta e o UPDATE do reaper
+                finished.status = TranscriptionStatus.COMPLETED
+            return key == pipeline._heartbeat_key(alive.id)
+
+    with patch.object(pipeline, "get_redis_connection", return_value=FakeRedis()), \
+         patch.object(pipeline, "enqueue_transcription_job") as enqueue:
+        requeued = await pipeline.requeue_stale_transcriptions(db_session)
+
+    assert requeued == [stale.id]
+    enqueue.assert_called_once_with(stale.id)
+    await db_session.refresh(stale)
+    assert stale.status == TranscriptionStatus.PENDING
+    await db_session.refresh(finished)
+    assert finished.status == TranscriptionStatus.COMPLETED
+
+
+class _ScheduleRedis:
+    """SET NX/EX e o script de liberação do reaper sobre um dict."""
+
+    def __init__(self):
+        self.values = {}
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    def eval(self, script, numkeys, key, value):
+        if self.values.get(key) == value:
+            del self.values[key]
+            return 1
+        return 0
+
+
+def test_reaper_keeps_a_single_schedule_with_unique_job_ids():
+    redis = _ScheduleRedis()
+    with patch.object(pipeline, "get_redis_connection", return_value=redis), \
+         patch.object(pipeline, "get_queue") as get_queue:
+        first = pipeline.schedule_reaper(delay_seconds=0)
+        # outro worker iniciando
+        assert pipeline.schedule_reaper(delay_seconds=0) is None
+        assert get_queue.return_value.enqueue_in.call_count == 1
+        assert get_queue.return_value.enqueue_in.call_args.kwargs == {
+            "job_id": first,
+            "result_ttl": 0,
+        }
+
+        job = type("Job", (), {"id": first})()
+        with patch.object(pipeline, "get_current_job", return_value=job), \
+             patch.object(pipeline, "expire_stale_uploads"), \
+             patch.object(pipeline, "purge_released_blobs"), \
+             patch.object(pipeline, "requeue_stale_transcriptions", return_value=[]):
+            pipeline.reap_stale_transcriptions_job()
+
+    second = get_queue.return_value.enqueue_in.call_args.kwargs["job_id"]
+    assert second != first
+    assert redis.values[pipeline.REAPER_SCHEDULE_KEY] == second
+
+
+def test_runner_publishes_terminal_state_after_commit(tmp_path):
+    import asyncio
+    import sqlite3
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.core.database import Base
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'retry.db'}")
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def _setup() -> int:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with session_factory() as session:
+            transcription = await _create_transcription(session)
+            await session.commit()
+            return transcription.id
+
+    async def _status(transcription_id: int) -> TranscriptionStatus:
+        async with session_factory() as session:
+            return (await session.get(Transcription, transcription_id)).status
+
+    transcription_id = asyncio.run(_setup())
+    for retries_left, status, stage in (
+        (2, TranscriptionStatus.PENDING, "retrying"),
+        (0, TranscriptionStatus.FAILED, "failed"),
+    ):
+        job = type("Job", (), {"retries_left": retries_left})()
+        with (
+            patch.object(pipeline, "AsyncSessionLocal", session_factory),
+            patch.object(pipeline, "engine", engine),
+            patch.object(pipeline, "_run_pipeline", side_effect=RuntimeError("ffmpeg")),
+            patch.object(pipeline, "get_current_job", return_value=job),
+            patch.object(pipeline, "publish_progress") as publish,
+        ):
+            with pytest.raises(RuntimeError):
+                pipeline.run_transcription_background(
+                    transcription_id, raise_errors=True
+                )
+        assert publish.call_args.kwargs["stage"] == stage
+        assert asyncio.run(_status(transcription_id)) == status
+
+    # "done" só é publicado depois do commit: quem reage ao evento já lê o resultado no
+    # banco
+    def _complete(session, transcription):
+        transcription.status = TranscriptionStatus.COMPLETED
+
+    def _published(transcription_id, **fields):
+        with sqlite3.connect(tmp_path / "retry.db") as conn:
+            published_status.append(
+                conn.execute("SELECT status FROM transcriptions").fetchone()[0]
+            )
+
+    class HeartbeatRedis:
+        def set(self, key, value, ex=None):
+            pass
+
+        def delete(self, key):
+            # Heartbeat liberado só depois do commit final
+            _published(transcription_id)
+
+    published_status = []
+    with (
+        patch.object(pipeline, "AsyncSessionLocal", session_factory),
+        patch.object(pipeline, "engine", engine),
+        patch.object(pipeline, "get_redis_connection", return_value=HeartbeatRedis()),
+        patch.object(pipeline, "_run_pipeline", side_effect=_complete),
+        patch.object(pipeline, "publish_progress", side_effect=_published) as publish,
+    ):
+        pipeline.run_transcription_background(transcription_id, raise_errors=True)
+    assert publish.call_args.kwargs["stage"] == "done"
+    assert published_status == ["COMPLETED", "COMPLETED"]
+
+
+def test_plan_chunks_covers_all_samples():
+    chunks = plan_chunks(25 * SAMPLE_RATE + 7, max_chunk_seconds=10)
+    assert chunks == [
+        (0, 10 * SAMPLE_RATE),
+        (10 * SAMPLE_RATE, 20 * SAMPLE_RATE),
+        (20 * SAMPLE_RATE, 25 * SAMPLE_RATE + 7),
+    ]
+    assert plan_chunks(5, max_chunk_seconds=10) == [(0, 5)]
+
+
+@pytest.mark.asyncio
+async def test_bulk_segment_insert_returns_ids_in_row_order(db_session, monkeypatch):
+    from app.services.segments import bulk_insert_segments, segment_rows
+
+    transcription = await _create_transcription(db_session)
+    monkeypatch.setattr(settings, "SEGMENT_INSERT_BATCH_SIZE", 3)
+    rows = segment_rows(
+        transcription.id,
+        60.0,
+        [
+            SegmentResult(id=i, start=float(i), end=i + 0.5, text=f" s{i} ")
+            for i in range(7)
+        ],
+    )
+
+    ids = await bulk_insert_segments(db_session, rows)
+
+    result = await db_session.execute(
+        select(
+            TranscriptionSegment.id,
+            TranscriptionSegment.text,
+            TranscriptionSegment.start_time,
+        )
+    )
+    stored = {segment_id: (text, start) for segment_id, text, start in result}
+    assert [stored[i] for i in ids] == [(f"s{i}", 60.0 + i) for i in range(7)]
+
+
+def _chunk_with_words(model_name, pcm_path, start, end, options):
+    from app.services.asr import WordTiming
+
+    return TranscriptionResult(
+        text=" bom dia ",
+        segments=[SegmentResult(id=0, start=1.0, end=2.0, text=" bom dia ", words=[
+            WordTiming(" bom", 1.0, 1.4, 0.9), WordTiming(" dia", 1.5, 2.0, 0.8),
+        ])],
+    )
+
+
+@pytest.mark.asyncio
+async def test_word_timings_are_packed_into_one_blob(db_session, monkeypatch, tmp_path):
+    from app.models.transcription import TranscriptionChunk
+    from app.services.packed import PackedWords
+
+    transcription = await _create_transcription(db_session)
+    monkeypatch.setattr(settings, "TRANSCRIPTION_WORKERS", 1)
+    monkeypatch.setattr(settings, "MAX_CHUNK_MINUTES", 10)
+    monkeypatch.setattr(settings, "ENABLE_VAD", False)
+    pcm_path = _fake_pcm(tmp_path, 1200)
+
+    ingest, decode = _media_patches(pcm_path)
+    with (
+        ingest,
+        decode,
+        patch.object(pipeline, "_transcribe_chunk", side_effect=_chunk_with_words),
+    ):
+        await pipeline._run_pipeline(db_session, transcription)
+
+    words = PackedWords.from_bytes(transcription.words)
+    assert len(words) == 4
+    assert [w["text"] for w in words.window(600.0, 602.0)] == ["bom", "dia"]
+    # janela dentro da palavra
+    assert [w["text"] for w in words.window(1.2, 1.3)] == ["bom"]
+    assert words.window(1.41, 1.49) == []  # pausa entre as palavras
+    assert words.word(words.index_at(601.7))["text"] == "dia"
+    assert words.index_at(0.5) is None
+    leftover = await db_session.scalars(
+        select(TranscriptionChunk.words).where(TranscriptionChunk.words.isnot(None))
+    )
+    assert leftover.all() == []
+
+    # Nova execução com todos os chunks em checkpoint: as palavras são mantidas
+    blob = transcription.words
+    with ingest, decode, patch.object(pipeline, "_transcribe_chunk") as transcribe:
+        await pipeline._run_pipeline(db_session, transcription)
+    transcribe.assert_not_called()
+    assert transcription.words == blob
+
+
+def test_chunk_worker_initializer_sets_engine_threads():
+    with patch.object(settings, "TRANSCRIPTION_THREADS_PER_WORKER", 0), \
+         patch.object(settings, "ASR_BEAM_SIZE", settings.ASR_BEAM_SIZE):
+        pipeline._init_chunk_worker(3, {"ASR_BEAM_SIZE": 2})
+
+        # FasterWhisperEngine lê o valor como cpu_threads ao carregar o modelo
+        assert settings.TRANSCRIPTION_THREADS_PER_WORKER == 3
+        assert settings.ASR_BEAM_SIZE == 2
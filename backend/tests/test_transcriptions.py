@@ -1,4 +1,3 @@
-import io
 import pytest
 from httpx import AsyncClient
 
@@ -44,3 +43,663 @@ async def test_upload_and_list_transcriptions(client: AsyncClient):
     assert resp.status_code == 200
     detail = resp.json()
     assert detail["id"] == tid
+
+
+async def _auth_headers(client: AsyncClient, email: str) -> dict:
+    payload = {"email": email, "full_name": "Clerk User", "password": "StrongP@ssw0rd"}
+    resp = await client.post("/api/v1/auth/register", json=payload)
+    assert resp.status_code == 201
+    resp = await client.post(
+        "/api/v1/auth/login", data={"username": email, "password": payload["password"]}
+    )
+    assert resp.status_code == 200
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+async def _upload(
+    client: AsyncClient,
+    headers: dict,
+    title: str = "Audiência",
+    content: bytes = b"RIFF....WAVEfmt ",
+) -> dict:
+    files = {"file": ("teste.wav", content, "audio/wav")}
+    resp = await client.post(
+        "/api/v1/transcriptions/upload",
+        headers=headers,
+        files=files,
+        data={"title": title},
+    )
+    assert resp.status_code == 201, resp.text
+    return resp.json()
+
+
+@pytest.mark.asyncio
+async def test_status_reports_real_progress(client: AsyncClient, db_session):
+    from datetime import datetime, timedelta, timezone
+    from app.models.transcription import (
+        Transcription,
+        TranscriptionSegment,
+        TranscriptionStatus,
+    )
+
+    headers = await _auth_headers(client, "progress@example.com")
+    created = await _upload(client, headers)
+
+    transcription = await db_session.get(Transcription, created["id"])
+    transcription.status = TranscriptionStatus.PROCESSING
+    transcription.started_at = datetime.now(timezone.utc) - timedelta(seconds=60)
+    transcription.total_seconds = 400.0
+    transcription.processed_seconds = 100.0
+    db_session.add(
+        TranscriptionSegment(
+            transcription_id=transcription.id, start_time=0, end_time=5, text="Bom dia"
+        )
+    )
+    await db_session.flush()
+
+    resp = await client.get(
+        f"/api/v1/transcriptions/{created['id']}/status", headers=headers
+    )
+    assert resp.status_code == 200, resp.text
+    status = resp.json()
+    assert status["progress"] == 25
+    assert status["segment_count"] == 1
+    assert 170 <= status["eta_seconds"] <= 190
+
+
+@pytest.mark.asyncio
+async def test_status_is_served_from_worker_progress_record(
+    client: AsyncClient, monkeypatch
+):
+    from datetime import datetime, timedelta, timezone
+    from app.api import transcriptions as transcriptions_api
+
+    headers = await _auth_headers(client, "redis-status@example.com")
+    me = (await client.get("/api/v1/auth/me", headers=headers)).json()
+    record = {
+        "user_id": int(me["id"]),
+        "status": "processing",
+        "stage": "transcribe",
+        "processed_seconds": 30.0,
+        "total_seconds": 120.0,
+        "segment_count": 12,
+        "started_at": datetime.now(timezone.utc) - timedelta(seconds=10),
+    }
+
+    async def fake_read_progress(transcription_id):
+        return record if transcription_id == 999999 else None
+
+    monkeypatch.setattr(transcriptions_api, "read_progress", fake_read_progress)
+    # Sem linha no banco: a resposta vem inteira do registro publicado pelo worker
+    resp = await client.get("/api/v1/transcriptions/999999/status", headers=headers)
+    assert resp.status_code == 200, resp.text
+    status = resp.json()
+    assert (status["stage"], status["progress"], status["segment_count"]) == (
+        "transcribe",
+        25,
+        12,
+    )
+
+    # registro de outro usuário: cai no banco, que não tem a linha
+    record["user_id"] += 1
+    resp = await client.get("/api/v1/transcriptions/999999/status", headers=headers)
+    assert resp.status_code == 404
+
+    # Registro terminal não esconde mudanças posteriores feitas no banco
+    created = await _upload(client, headers)
+    record.update(user_id=int(me["id"]), status="completed", stage="done")
+
+    async def stale_read_progress(transcription_id):
+        return record
+
+    monkeypatch.setattr(transcriptions_api, "read_progress", stale_read_progress)
+    resp = await client.get(
+        f"/api/v1/transcriptions/{created['id']}/status", headers=headers
+    )
+    assert resp.json()["status"] == "pending"
+
+
+@pytest.mark.asyncio
+async def test_reupload_of_completed_recording_reuses_result(
+    client: AsyncClient, db_session, monkeypatch
+):
+    from unittest.mock import patch
+
+    from sqlalchemy import update
+
+    from app.core.config import settings
+    from app.models.transcription import (
+        Transcription,
+        TranscriptionSegment,
+        TranscriptionStatus,
+    )
+    from app.services import transcription_pipeline as pipeline
+    from app.services.dedup import asr_fingerprint, find_cached_result
+
+    headers = await _auth_headers(client, "dedupe@example.com")
+    content = b"RIFF" + bytes(range(256)) * 64
+    first = await _upload(client, headers, "Primeira", content)
+
+    # Resultado gravado pelo worker, com o modelo que ele resolveu pela duração
+    original = await db_session.get(Transcription, first["id"])
+    original.status = TranscriptionStatus.COMPLETED
+    original.duration = 120.0
+    original.asr_fingerprint = asr_fingerprint(pipeline._choose_whisper_model(120.0))
+    original.full_text = "Bom dia a todos"
+    db_session.add(
+        TranscriptionSegment(
+            transcription_id=original.id,
+            start_time=0,
+            end_time=2,
+            text="Bom dia a todos",
+        )
+    )
+    await db_session.flush()
+
+    second = await _upload(client, headers, "Segunda", content)
+    assert second["status"] == "pending"
+    assert second["file_path"] == first["file_path"]
+
+    # O worker reaproveita o resultado sem ingestão nem ASR
+    reused = await db_session.get(Transcription, second["id"])
+    with patch.object(pipeline, "ingest_audio") as ingest:
+        await pipeline._run_pipeline(db_session, reused)
+    ingest.assert_not_called()
+    await db_session.flush()
+
+    resp = await client.get(f"/api/v1/transcriptions/{second['id']}", headers=headers)
+    assert resp.json()["status"] == "completed"
+    assert resp.json()["full_text"] == "Bom dia a todos"
+    resp = await client.get(
+        f"/api/v1/transcriptions/{second['id']}/segments", headers=headers
+    )
+    assert [s["text"] for s in resp.json()] == ["Bom dia a todos"]
+
+    third = await db_session.get(
+        Transcription, (await _upload(client, headers, "Terceira", content))["id"]
+    )
+    completed = update(Transcription).where(
+        Transcription.status == TranscriptionStatus.COMPLETED
+    )
+    # Resultado de outro modelo não é reaproveitado
+    await db_session.execute(
+        completed.values(asr_fingerprint=asr_fingerprint("large"))
+    )
+    assert (
+        await find_cached_result(db_session, third, pipeline._choose_whisper_model)
+        is None
+    )
+
+    # Outros parâmetros de decodificação: o resultado não é reaproveitado
+    await db_session.execute(
+        completed.values(
+            asr_fingerprint=asr_fingerprint(pipeline._choose_whisper_model(120.0))
+        )
+    )
+    monkeypatch.setattr(settings, "ASR_BEAM_SIZE", settings.ASR_BEAM_SIZE + 1)
+    assert (
+        await find_cached_result(db_session, third, pipeline._choose_whisper_model)
+        is None
+    )
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "")
+    # desativado por padrão
+    assert (await client.get("/api/v1/metrics", headers=headers)).status_code == 404
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scraper-secret")
+    assert (await client.get("/api/v1/metrics")).status_code == 401
+    # JWT de usuário não basta
+    assert (await client.get("/api/v1/metrics", headers=headers)).status_code == 401
+    resp = await client.get(
+        "/api/v1/metrics", headers={"Authorization": "Bearer scraper-secret"}
+    )
+    assert resp.json()["transcription_cache.hits"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_upload_aborts_oversized_and_non_media_files(
+    client: AsyncClient, monkeypatch
+):
+    import os
+    from app.core.config import settings
+    from app.services import storage
+
+    headers = await _auth_headers(client, "limits@example.com")
+
+    # Blocos pequenos: a gravação é interrompida antes do fim do arquivo
+    monkeypatch.setattr(storage, "UPLOAD_BLOCK_SIZE", 1024)
+    monkeypatch.setattr(settings, "MAX_UPLOAD_SIZE", 4096)
+    files = {"file": ("grande.wav", b"RIFF....WAVEfmt " + bytes(8192), "audio/wav")}
+    resp = await client.post(
+        "/api/v1/transcriptions/upload",
+        headers=headers,
+        files=files,
+        data={"title": "Grande"},
+    )
+    assert resp.status_code == 413
+
+    files = {
+        "file": ("nota.mp3", "Isto é um texto, não um áudio.".encode(), "audio/mpeg")
+    }
+    resp = await client.post(
+        "/api/v1/transcriptions/upload",
+        headers=headers,
+        files=files,
+        data={"title": "Texto"},
+    )
+    assert resp.status_code == 415
+
+    assert os.listdir(os.path.join(settings.UPLOAD_PATH, "tmp")) == []
+
+
+@pytest.mark.asyncio
+async def test_uploads_share_sharded_blob_until_last_delete(
+    client: AsyncClient, db_session
+):
+    import os
+    from app.services.blobstore import purge_released_blobs, release_blob
+
+    headers = await _auth_headers(client, "blobs@example.com")
+    content = b"RIFF\x00\x00\x00\x00WAVEfmt " + b"blob" * 1000
+    first = await _upload(client, headers, "Primeira", content)
+    second = await _upload(client, headers, "Segunda", content)
+
+    path = first["file_path"]
+    assert second["file_path"] == path
+    assert (
+        os.path.join("blobs", os.path.basename(path)[:2], os.path.basename(path)[2:4])
+        in path
+    )
+    assert second["original_filename"] == "teste.wav"
+
+    resp = await client.delete(f"/api/v1/transcriptions/{first['id']}", headers=headers)
+    assert resp.status_code == 204
+    assert os.path.exists(path)
+
+    # Última referência removida numa transação desfeita: o arquivo continua lá
+    content_hash = os.path.basename(path)
+    await db_session.commit()
+    assert await release_blob(db_session, content_hash)
+    await db_session.rollback()
+    assert os.path.exists(path)
+    assert await purge_released_blobs(db_session) == []
+
+    resp = await client.delete(
+        f"/api/v1/transcriptions/{second['id']}", headers=headers
+    )
+    assert resp.status_code == 204
+    assert not os.path.exists(path)
+    resp = await client.get(f"/api/v1/transcriptions/{second['id']}", headers=headers)
+    assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_list_is_paginated_by_cursor_without_text_columns(
+    client: AsyncClient, db_session
+):
+    from app.models.transcription import Transcription
+
+    headers = await _auth_headers(client, "pages@example.com")
+    ids = []
+    for i in range(5):
+        created = await _upload(
+            client, headers, f"Audiência {i}", b"RIFF....WAVEfmt " + bytes([i]) * 64
+        )
+        ids.append(created["id"])
+    done = await db_session.get(Transcription, ids[1])
+    done.status = "completed"
+    done.full_text = "texto longo da audiência"
+    await db_session.flush()
+
+    pages, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        resp = await client.get(
+            "/api/v1/transcriptions/", headers=headers, params=params
+        )
+        assert resp.status_code == 200
+        pages.append([t["id"] for t in resp.json()])
+        assert all("full_text" not in t for t in resp.json())
+        cursor = resp.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert pages == [ids[:2:-1], ids[2:0:-1], ids[:1]]
+
+    resp = await client.get(
+        "/api/v1/transcriptions/", headers=headers, params={"status": "completed"}
+    )
+    assert [t["id"] for t in resp.json()] == [ids[1]]
+    resp = await client.get(
+        "/api/v1/transcriptions/", headers=headers, params={"limit": 10000}
+    )
+    assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_segments_time_window_and_cursor(client: AsyncClient, db_session):
+    from app.models.transcription import TranscriptionSegment
+
+    headers = await _auth_headers(client, "editor@example.com")
+    created = await _upload(client, headers, "Editor", b"RIFF....WAVEfmt editor")
+    db_session.add_all(
+        [
+            TranscriptionSegment(
+                transcription_id=created["id"],
+                start_time=i * 5.0,
+                end_time=i * 5.0 + 5,
+                text=f"s{i}",
+            )
+            for i in range(20)
+        ]
+    )
+    await db_session.flush()
+    url = f"/api/v1/transcriptions/{created['id']}/segments"
+
+    # Janela em volta da posição 42 s: inclui o segmento que começou em 40 s
+    resp = await client.get(url, headers=headers, params={"from": 42, "to": 55})
+    assert [s["text"] for s in resp.json()] == ["s8", "s9", "s10"]
+
+    texts, cursor = [], None
+    while True:
+        params = {"limit": 8, **({"cursor": cursor} if cursor else {})}
+        resp = await client.get(url, headers=headers, params=params)
+        texts += [s["text"] for s in resp.json()]
+        cursor = resp.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert texts == [f"s{i}" for i in range(20)]
+
+    resp = await client.get(url, headers=headers, params={"cursor": "x"})
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_words_are_served_in_bounded_windows(
+    client: AsyncClient, db_session, monkeypatch
+):
+    from app.core.config import settings
+    from app.models.transcription import Transcription
+    from app.services.asr import SegmentResult, WordTiming
+    from app.services.packed import PackedWords
+
+    monkeypatch.setattr(settings, "WORDS_MAX_WINDOW_SECONDS", 60)
+    headers = await _auth_headers(client, "words@example.com")
+    created = await _upload(client, headers, "Palavras", b"RIFF....WAVEfmt words")
+    transcription = await db_session.get(Transcription, created["id"])
+    words = [WordTiming(f" w{i}", i * 10.0, i * 10.0 + 1, 0.9) for i in range(20)]
+    segment = SegmentResult(id=0, start=0.0, end=200.0, text="", words=words)
+    transcription.words = PackedWords.from_segments([segment]).to_bytes()
+    await db_session.flush()
+    url = f"/api/v1/transcriptions/{created['id']}/words"
+
+    # Sem "to": só a janela máxima a partir de "from"
+    resp = await client.get(url, headers=headers, params={"from": 100})
+    assert [w["text"] for w in resp.json()] == [f"w{i}" for i in range(10, 16)]
+
+    resp = await client.get(url, headers=headers, params={"from": 0, "to": 120})
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_event_stream_pushes_progress_and_segments(
+    client: AsyncClient, monkeypatch
+):
+    import json
+    from app.api import transcriptions as transcriptions_api
+
+    headers = await _auth_headers(client, "sse@example.com")
+    created = await _upload(client, headers, "Ao vivo")
+    me = (await client.get("/api/v1/auth/me", headers=headers)).json()
+    subscribed = []
+
+    async def fake_read_progress(transcription_id):
+        return {"status": "pending", "stage": "queued", "segment_count": 0}
+
+    async def fake_events(user_id, keepalive_seconds):
+        subscribed.append(user_id)
+        yield {
+            "event": "progress",
+            "transcription_id": created["id"],
+            "status": "processing",
+            "stage": "transcribe",
+        }
+        yield None
+        yield {
+            "event": "segments",
+            "transcription_id": created["id"],
+            "segments": [{"id": 1, "text": "Bom dia"}],
+        }
+
+    monkeypatch.setattr(transcriptions_api, "read_progress", fake_read_progress)
+    monkeypatch.setattr(transcriptions_api, "iter_user_events", fake_events)
+    resp = await client.get("/api/v1/transcriptions/events", headers=headers)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    assert subscribed == [int(me["id"])]
+
+    blocks = [b for b in resp.text.split("\n\n") if b.startswith("event:")]
+    events = [
+        (b.split("\n")[0], json.loads(b.split("\n")[1][len("data: ") :]))
+        for b in blocks
+    ]
+    assert [name for name, _ in events] == [
+        "event: progress",
+        "event: progress",
+        "event: segments",
+    ]
+    assert events[0][1]["stage"] == "queued"  # estado atual enviado ao conectar
+    assert events[2][1]["segments"][0]["text"] == "Bom dia"
+    assert ": keep-alive" in resp.text
+
+    # EventSource não envia cabeçalhos: token curto na query string
+    resp = await client.post("/api/v1/auth/stream-token", headers=headers)
+    assert resp.status_code == 200
+    stream_token = resp.json()["token"]
+    resp = await client.get(
+        "/api/v1/transcriptions/events", params={"token": stream_token}
+    )
+    assert resp.status_code == 200
+    assert subscribed == [int(me["id"])] * 2
+
+    access_token = headers["Authorization"].split()[1]
+    resp = await client.get(
+        "/api/v1/transcriptions/events", params={"token": access_token}
+    )
+    assert resp.status_code == 401  # só tokens do tipo "stream" valem na URL
+    resp = await client.get("/api/v1/transcriptions/events")
+    assert resp.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_search_returns_ranked_segment_hits_with_timestamps(
+    client: AsyncClient, db_session
+):
+    from app.models.transcription import Transcription, TranscriptionSegment
+    from app.services.segments import bulk_insert_segments
+
+    headers = await _auth_headers(client, "search@example.com")
+    first = await _upload(client, headers, "Instrução", b"RIFF....WAVEfmt search-1")
+    second = await _upload(client, headers, "Julgamento", b"RIFF....WAVEfmt search-2")
+    (await db_session.get(Transcription, second["id"])).case_number = (
+        "0001234-56.2024.8.26.0100"
+    )
+    db_session.add(
+        TranscriptionSegment(
+            transcription_id=first["id"],
+            start_time=10,
+            end_time=14,
+            text="A testemunha viu o veículo",
+        )
+    )
+    # Segmentos gravados em lote também entram no índice
+    await bulk_insert_segments(
+        db_session,
+        [
+            {
+                "transcription_id": second["id"],
+                "start_time": 120.0,
+                "end_time": 126.5,
+                "text": "O veículo estava estacionado na calçada",
+                "speaker": "Speaker_1",
+                "confidence": 0.1,
+            },
+            {
+                "transcription_id": second["id"],
+                "start_time": 130.0,
+                "end_time": 133.0,
+                "text": "Sem perguntas",
+                "speaker": None,
+                "confidence": None,
+            },
+            {
+                "transcription_id": second["id"],
+                "start_time": 140.0,
+                "end_time": 141.0,
+                "text": "<script>alert(1)</script> placa",
+                "speaker": None,
+                "confidence": None,
+            },
+        ],
+    )
+    await db_session.flush()
+    url = "/api/v1/transcriptions/search"
+
+    resp = await client.get(url, headers=headers, params={"q": "veiculo"})
+    assert resp.status_code == 200
+    assert {hit["transcription_id"] for hit in resp.json()} == {
+        first["id"],
+        second["id"],
+    }
+
+    resp = await client.get(
+        url,
+        headers=headers,
+        params={"q": "veículo calçada", "case_number": "0001234-56.2024.8.26.0100"},
+    )
+    [hit] = resp.json()
+    assert (hit["title"], hit["start_time"], hit["end_time"]) == (
+        "Julgamento",
+        120.0,
+        126.5,
+    )
+    assert "<mark>calçada</mark>" in hit["snippet"]
+
+    # O texto da transcrição é escapado: só os marcadores são HTML
+    [hit] = (await client.get(url, headers=headers, params={"q": "placa"})).json()
+    assert hit["snippet"] == "&lt;script&gt;alert(1)&lt;/script&gt; <mark>placa</mark>"
+
+    other = await _auth_headers(client, "search-other@example.com")
+    assert (await client.get(url, headers=other, params={"q": "veículo"})).json() == []
+
+
+@pytest.mark.asyncio
+async def test_exports_stream_from_segments_and_are_cached(
+    client: AsyncClient, db_session, monkeypatch, tmp_path
+):
+    import io
+    from docx import Document
+    from app.core.config import settings
+    from app.api import transcriptions as transcriptions_api
+    from app.models.transcription import (
+        Transcription,
+        TranscriptionSegment,
+        TranscriptionStatus,
+    )
+    from tests.conftest import TestingSessionLocal
+
+    monkeypatch.setattr(settings, "EXPORT_CACHE_PATH", str(tmp_path))
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 2)
+    # O corpo é lido numa sessão própria, não na da requisição
+    monkeypatch.setattr(transcriptions_api, "AsyncSessionLocal", TestingSessionLocal)
+    headers = await _auth_headers(client, "export@example.com")
+    created = await _upload(client, headers, "Oitiva", b"RIFF....WAVEfmt export")
+    db_session.add_all(
+        [
+            TranscriptionSegment(
+                transcription_id=created["id"],
+                start_time=3661.5,
+                end_time=3663.25,
+                text="Confirmo <tudo>",
+                speaker="Speaker_1",
+            ),
+            TranscriptionSegment(
+                transcription_id=created["id"],
+                start_time=1.0,
+                end_time=2.5,
+                text="Bom dia",
+                speaker="Speaker_0",
+            ),
+            TranscriptionSegment(
+                transcription_id=created["id"],
+                start_time=5.0,
+                end_time=6.0,
+                text="Pode falar",
+                speaker=None,
+            ),
+        ]
+    )
+    await db_session.commit()
+    url = f"/api/v1/transcriptions/{created['id']}/export"
+
+    srt = await client.get(url, headers=headers)
+    assert (
+        srt.headers["content-disposition"]
+        == f'attachment; filename="transcricao-{created["id"]}.srt"'
+    )
+    assert srt.text.startswith(
+        "1\n00:00:01,000 --> 00:00:02,500\nSpeaker_0: Bom dia\n\n2\n"
+    )
+    assert "3\n01:01:01,500 --> 01:01:03,250\nSpeaker_1: Confirmo <tudo>\n" in srt.text
+    vtt = await client.get(url, headers=headers, params={"format": "vtt"})
+    assert vtt.text.startswith(
+        "WEBVTT\n\n00:00:01.000 --> 00:00:02.500\n<v Speaker_0>Bom dia\n"
+    )
+    assert "Confirmo &lt;tudo&gt;" in vtt.text
+    txt = await client.get(url, headers=headers, params={"format": "txt"})
+    assert txt.text.splitlines()[2:4] == [
+        "[00:00:01] Speaker_0: Bom dia",
+        "[00:00:05] Pode falar",
+    ]
+    docx = await client.get(url, headers=headers, params={"format": "docx"})
+    paragraphs = [p.text for p in Document(io.BytesIO(docx.content)).paragraphs]
+    assert paragraphs == [
+        "Oitiva",
+        "[00:00:01] Speaker_0: Bom dia",
+        "[00:00:05] Pode falar",
+        "[01:01:01] Speaker_1: Confirmo <tudo>",
+    ]
+    assert not any(tmp_path.iterdir())  # em andamento: sem cache
+    from app.services.anonymization import Anonymizer
+
+    monkeypatch.setattr(
+        transcriptions_api, "get_anonymizer", lambda: Anonymizer(["Oitiva", "falar"])
+    )
+    anonymized = await client.get(
+        url, headers=headers, params={"format": "txt", "anonymize": "true"}
+    )
+    assert anonymized.text.splitlines()[0] == "[NOME]"
+    assert "[00:00:05] Pode [NOME]" in anonymized.text
+
+    (await db_session.get(Transcription, created["id"])).status = (
+        TranscriptionStatus.COMPLETED
+    )
+    await db_session.commit()
+    first = await client.get(url, headers=headers)
+    [cached] = (tmp_path / str(created["id"])).iterdir()
+    assert cached.read_bytes() == first.content == srt.content
+    cached.write_bytes(b"servido do cache")
+    assert (await client.get(url, headers=headers)).content == b"servido do cache"
+
+    # Segmento novo muda a versão: o cache antigo é substituído
+    db_session.add(
+        TranscriptionSegment(
+            transcription_id=created["id"],
+            start_time=7.0,
+            end_time=8.0,
+            text="Encerrado",
+        )
+    )
+    await db_session.commit()
+    assert "Encerrado" in (await client.get(url, headers=headers)).text
+    assert [p.read_bytes() for p in (tmp_path / str(created["id"])).iterdir()] != [
+        b"servido do cache"
+    ]
@@ -0,0 +1,291 @@
+import hashlib
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from tests.test_transcriptions import _auth_headers
+
+
+@pytest.mark.asyncio
+async def test_resumable_upload_in_parts(client: AsyncClient, db_session):
+    from app.models.transcription import Transcription
+    from app.services import storage
+
+    headers = await _auth_headers(client, "resumable@example.com")
+    content = b"RIFF\x00\x00\x00\x00WAVEfmt " + bytes(range(256)) * 400
+
+    resp = await client.post(
+        "/api/v1/uploads",
+        headers=headers,
+        json={"title": "Audiência", "filename": "video.mp4", "size": len(content)},
+    )
+    assert resp.status_code == 201, resp.text
+    upload_id = resp.json()["id"]
+    url = f"/api/v1/uploads/{upload_id}"
+
+    part_headers = {**headers, "Content-Type": "application/offset+octet-stream"}
+    resp = await client.patch(
+        url, headers={**part_headers, "Upload-Offset": "0"}, content=content[:40000]
+    )
+    assert resp.status_code == 204
+    assert resp.headers["Upload-Offset"] == "40000"
+
+    # Parte repetida com offset antigo (ex.: retry após timeout) é recusada
+    resp = await client.patch(
+        url, headers={**part_headers, "Upload-Offset": "0"}, content=content[:100]
+    )
+    assert resp.status_code == 409
+    assert resp.headers["Upload-Offset"] == "40000"
+
+    resp = await client.post(f"{url}/complete", headers=headers)
+    assert resp.status_code == 409
+
+    # Retomada em outro processo: sem o hash incremental, recalculado na finalização
+    storage._part_hashers.clear()
+    resp = await client.head(url, headers=headers)
+    offset = int(resp.headers["Upload-Offset"])
+    resp = await client.patch(
+        url,
+        headers={**part_headers, "Upload-Offset": str(offset)},
+        content=content[offset:],
+    )
+    assert resp.status_code == 204
+
+    resp = await client.post(f"{url}/complete", headers=headers)
+    assert resp.status_code == 201, resp.text
+    created = resp.json()
+    assert created["file_size"] == len(content)
+
+    transcription = await db_session.get(Transcription, created["id"])
+    assert transcription.content_hash == hashlib.sha256(content).hexdigest()
+    assert transcription.mime_type == "audio/x-wav"
+    with open(transcription.file_path, "rb") as f:
+        assert f.read() == content
+
+    # Retry do /complete devolve a mesma transcrição
+    resp = await client.post(f"{url}/complete", headers=headers)
+    assert resp.status_code == 201
+    assert resp.json()["id"] == created["id"]
+    resp = await client.patch(
+        url, headers={**part_headers, "Upload-Offset": str(len(content))}, content=b"x"
+    )
+    assert resp.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_upload_claim_blocks_concurrent_requests(client: AsyncClient, db_session):
+    from datetime import datetime, timedelta, timezone
+
+    from app.models.upload import UploadSession, UploadStatus
+    from app.services.storage import partial_upload_path
+
+    headers = await _auth_headers(client, "claims@example.com")
+    content = b"RIFF\x00\x00\x00\x00WAVEfmt " + bytes(range(256)) * 40
+    resp = await client.post(
+        "/api/v1/uploads",
+        headers=headers,
+        json={"title": "Audiência", "filename": "audio.wav", "size": len(content)},
+    )
+    upload_id = resp.json()["id"]
+    url = f"/api/v1/uploads/{upload_id}"
+    part_headers = {
+        **headers,
+        "Content-Type": "application/offset+octet-stream",
+        "Upload-Offset": "0",
+    }
+
+    # PATCH em andamento em outro worker: demais requisições recebem 409
+    upload = await db_session.get(UploadSession, upload_id)
+    upload.status = UploadStatus.WRITING
+    upload.claim_token = "other-worker"
+    upload.claimed_at = datetime.now(timezone.utc)
+    await db_session.commit()
+
+    resp = await client.patch(url, headers=part_headers, content=content)
+    assert resp.status_code == 409
+    assert resp.json()["detail"] == "Upload em uso por outra requisição"
+    resp = await client.delete(url, headers=headers)
+    assert resp.status_code == 409
+
+    # Claim de um processo que morreu expira e o upload é retomado
+    upload.claimed_at = datetime.now(timezone.utc) - timedelta(hours=2)
+    await db_session.commit()
+    resp = await client.patch(url, headers=part_headers, content=content)
+    assert resp.status_code == 204
+    assert resp.headers["Upload-Offset"] == str(len(content))
+    resp = await client.get(url, headers=headers)
+    assert resp.json()["status"] == "uploading"
+
+    resp = await client.delete(url, headers=headers)
+    assert resp.status_code == 204
+    assert not partial_upload_path(upload_id).exists()
+
+
+@pytest.mark.asyncio
+async def test_rejected_part_does_not_advance_offset(client: AsyncClient, db_session):
+    from app.models.transcription import Transcription
+    from app.services.storage import partial_upload_path
+
+    headers = await _auth_headers(client, "oversized@example.com")
+    content = b"RIFF\x00\x00\x00\x00WAVEfmt " + bytes(range(256)) * 40
+    resp = await client.post(
+        "/api/v1/uploads",
+        headers=headers,
+        json={"title": "Audiência", "filename": "audio.wav", "size": len(content)},
+    )
+    upload_id = resp.json()["id"]
+    url = f"/api/v1/uploads/{upload_id}"
+    part_headers = {**headers, "Content-Type": "application/offset+octet-stream"}
+
+    resp = await client.patch(
+        url, headers={**part_headers, "Upload-Offset": "0"}, content=content[:1000]
+    )
+    assert resp.status_code == 204
+
+    async def oversized():
+        # Blocos válidos gravados antes do excedente chegar
+        yield content[1000:2000]
+        yield content[2000:]
+        yield b"x" * 100
+
+    # Parte maior que o restante declarado: recusada sem mover o offset
+    resp = await client.patch(
+        url, headers={**part_headers, "Upload-Offset": "1000"}, content=oversized()
+    )
+    assert resp.status_code == 413
+    resp = await client.head(url, headers=headers)
+    assert resp.headers["Upload-Offset"] == "1000"
+    assert partial_upload_path(upload_id).stat().st_size == 1000
+
+    resp = await client.patch(
+        url, headers={**part_headers, "Upload-Offset": "1000"}, content=content[1000:]
+    )
+    assert resp.status_code == 204
+    resp = await client.post(f"{url}/complete", headers=headers)
+    assert resp.status_code == 201, resp.text
+    transcription = await db_session.get(Transcription, resp.json()["id"])
+    with open(transcription.file_path, "rb") as f:
+        assert f.read() == content
+
+
+@pytest.mark.asyncio
+async def test_failed_complete_after_blob_move_restarts_upload(
+    client: AsyncClient, db_session
+):
+    from unittest.mock import patch
+
+    from app.api import uploads as uploads_api
+    from app.services.blobstore import store_blob
+
+    headers = await _auth_headers(client, "complete-retry@example.com")
+    content = b"RIFF\x00\x00\x00\x00WAVEfmt " + bytes(range(256)) * 40
+    resp = await client.post(
+        "/api/v1/uploads",
+        headers=headers,
+        json={"title": "Audiência", "filename": "audio.wav", "size": len(content)},
+    )
+    upload_id = resp.json()["id"]
+    url = f"/api/v1/uploads/{upload_id}"
+    part_headers = {
+        **headers,
+        "Content-Type": "application/offset+octet-stream",
+        "Upload-Offset": "0",
+    }
+    resp = await client.patch(url, headers=part_headers, content=content)
+    assert resp.status_code == 204
+
+    async def _fail_after_blob_move(db, background, *, stored, **_kwargs):
+        # O arquivo parcial já virou blob quando a criação da transcrição falha
+        await store_blob(db, stored)
+        raise RuntimeError("banco indisponível")
+
+    with patch.object(
+        uploads_api, "register_uploaded_file", side_effect=_fail_after_blob_move
+    ):
+        with pytest.raises(RuntimeError):
+            await client.post(f"{url}/complete", headers=headers)
+
+    # Sem o arquivo parcial o upload recomeça do zero em vez de ficar travado
+    resp = await client.head(url, headers=headers)
+    assert resp.headers["Upload-Offset"] == "0"
+    resp = await client.patch(url, headers=part_headers, content=content)
+    assert resp.status_code == 204
+    resp = await client.post(f"{url}/complete", headers=headers)
+    assert resp.status_code == 201, resp.text
+    assert resp.json()["file_size"] == len(content)
+
+
+@pytest.mark.asyncio
+async def test_expire_stale_uploads(client: AsyncClient, db_session):
+    import os
+    import time
+    from datetime import datetime, timedelta, timezone
+
+    from app.models.upload import UploadSession
+    from app.services.storage import partial_upload_path
+    from app.services.uploads import expire_stale_uploads
+
+    headers = await _auth_headers(client, "stale@example.com")
+    ids = []
+    for _ in range(2):
+        resp = await client.post(
+            "/api/v1/uploads",
+            headers=headers,
+            json={"title": "Audiência", "filename": "audio.wav", "size": 1000},
+        )
+        ids.append(resp.json()["id"])
+        resp = await client.patch(
+            f"/api/v1/uploads/{ids[-1]}",
+            headers={**headers, "Upload-Offset": "0"},
+            content=b"RIFF\x00\x00\x00\x00WAVEfmt " + b"\x00" * 100,
+        )
+        assert resp.status_code == 204
+    abandoned, active = ids
+    upload = await db_session.get(UploadSession, abandoned)
+    upload.updated_at = datetime.now(timezone.utc) - timedelta(days=3)
+    await db_session.commit()
+
+    orphan = partial_upload_path("orphan" + abandoned[:10])
+    orphan.write_bytes(b"x")
+    old = time.time() - 3 * 86400
+    os.utime(orphan, (old, old))
+
+    expired = await expire_stale_uploads(db_session)
+    assert abandoned in expired and orphan.name in expired
+    assert active not in expired
+    assert not partial_upload_path(abandoned).exists() and not orphan.exists()
+    assert partial_upload_path(active).exists()
+    remaining = await db_session.execute(select(UploadSession.id))
+    assert set(remaining.scalars()) == {active}
+
+
+@pytest.mark.asyncio
+async def test_append_part_keeps_bytes_on_disconnect_and_propagates_disk_errors(
+    client: AsyncClient,
+):
+    from starlette.requests import ClientDisconnect
+
+    from app.services import storage
+
+    header = b"RIFF\x00\x00\x00\x00WAVEfmt "
+
+    async def dropped():
+        yield header
+        raise ClientDisconnect()
+
+    part = await storage.append_upload_part("disconnect", 0, dropped(), 1000)
+    assert part.written == len(header)
+
+    async def failing():
+        yield b"x" * 10
+        raise OSError("disco cheio")
+
+    part = storage.PartResult(written=0)
+    with pytest.raises(OSError):
+        await storage.append_upload_part(
+            "disconnect", len(header), failing(), 1000, part
+        )
+    assert part.written == 10
+    assert "disconnect" not in storage._part_hashers  # hash recalculado na finalização
+    await storage.discard_upload("disconnect")
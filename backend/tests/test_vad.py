@@ -0,0 +1,48 @@
+import numpy as np
+
+from app.services.audio import SAMPLE_RATE
+from app.services.vad import detect_speech, plan_speech_chunks
+
+
+def _synthetic_hearing(layout):
+    """Concatena trechos (segundos, fala?) com ruído de fundo baixo."""
+    rng = np.random.default_rng(0)
+    parts = []
+    for seconds, speech in layout:
+        n = int(seconds * SAMPLE_RATE)
+        noise = rng.normal(0, 0.001, n)
+        if speech:
+            t = np.arange(n) / SAMPLE_RATE
+            noise += (
+                0.3 * np.sin(2 * np.pi * 440 * t) * (1 + np.sin(2 * np.pi * 3 * t)) / 2
+            )
+        parts.append(noise)
+    return np.concatenate(parts).astype(np.float32)
+
+
+def test_detect_speech_finds_regions_and_skips_silence():
+    audio = _synthetic_hearing(
+        [(5, False), (4, True), (30, False), (3, True), (5, False)]
+    )
+    regions = detect_speech(audio)
+
+    assert len(regions) == 2
+    (s1, e1), (s2, e2) = regions
+    assert abs(s1 / SAMPLE_RATE - 5) < 0.5 and abs(e1 / SAMPLE_RATE - 9) < 0.5
+    assert abs(s2 / SAMPLE_RATE - 39) < 0.5 and abs(e2 / SAMPLE_RATE - 42) < 0.5
+
+    # O recesso de 30 s fica fora dos chunks; cada chunk é uma fatia contínua
+    chunks = plan_speech_chunks(audio, regions, max_chunk_seconds=600)
+    assert chunks == regions
+
+
+def test_plan_speech_chunks_cuts_long_speech_in_the_quietest_frame():
+    audio = _synthetic_hearing([(9, True), (0.6, False), (9, True)])
+    regions = detect_speech(audio)
+    assert len(regions) == 1  # pausa curta é unida à fala
+
+    chunks = plan_speech_chunks(audio, regions, max_chunk_seconds=10)
+    assert len(chunks) == 2
+    cut = chunks[0][1] / SAMPLE_RATE
+    assert 9.0 <= cut <= 9.6
+    assert chunks[0][1] == chunks[1][0]
@@ -1,12 +1,33 @@
 from __future__ import annotations
 
+import logging
 import os
-from rq import Worker  # type: ignore
+from rq import SimpleWorker, Worker  # type: ignore
+from app.core.config import settings
 from app.core.queue import get_redis_connection
+from app.services.model_pool import get_model_pool
+from app.services.transcription_pipeline import schedule_reaper
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     conn = get_redis_connection()
-    Worker(list(map(str, ["transcriptions"])) , connection=conn).work()
 
+    # Pré-carregar modelos no processo do worker (ex.: WHISPER_PRELOAD_MODELS=tiny,base)
+    if settings.WHISPER_PRELOAD_MODELS:
+        pool = get_model_pool()
+        pool.preload(settings.WHISPER_PRELOAD_MODELS)
+        logging.getLogger(__name__).info("Pool de modelos: %s", pool.stats())
 
+    # Reaper de jobs órfãos: roda agora se nenhuma execução estiver agendada (uma única
+    # cadeia entre workers)
+    schedule_reaper(delay_seconds=0)
+
+    # SimpleWorker executa os jobs no próprio processo, mantendo o pool de modelos
+    # residente entre jobs; o Worker padrão faz fork a cada job e descarta o que foi
+    # carregado
+    worker_cls = Worker if settings.WORKER_FORK_PER_JOB else SimpleWorker
+    # O scheduler do RQ atende o retry com intervalo e o reagendamento do reaper
+    worker_cls(list(map(str, ["transcriptions"])), connection=conn).work(
+        with_scheduler=True
+    )
@@ -43,7 +43,9 @@ const ENDPOINTS_WITHOUT_SLASH = new Set([
   'auth/register', 
   'auth/refresh',
   'auth/me',
+  'auth/stream-token',
   'transcriptions/upload',
+  'transcriptions/events',
   'texts/normalize',
   'texts/extract',
   'texts/compare',
@@ -102,8 +104,19 @@ async function proxyRequest(
     method,
     headers,
     body,
+    // Closing the page (or an EventSource) also closes the backend stream
+    signal: request.signal,
   });
 
+  // Server-Sent Events: pass the stream through as it arrives. Reading it as
+  // text would only resolve when the stream closes.
+  if (response.headers.get('content-type')?.includes('text/event-stream')) {
+    return new Response(response.body, {
+      status: response.status,
+      headers: response.headers,
+    });
+  }
+
   const responseBody = await response.text();
 
   return new NextResponse(responseBody, {
@@ -10,6 +10,12 @@ export type Transcription = {
   created_at: string;
 };
 
+export type TranscriptionEvent = {
+  event: 'progress' | 'segments';
+  transcription_id: number;
+  [key: string]: unknown;
+};
+
 // Always go through Next.js rewrite to avoid mixed content/CORS
 const BASE_URL = '/api';
 
@@ -46,4 +52,45 @@ export const transcriptionsApi = {
     });
     return handleResponse<Transcription>(res);
   },
+
+  /**
+   * Subscribe to progress/segment events (SSE). EventSource cannot send the
+   * Authorization header, so each connection uses a short-lived token from
+   * /auth/stream-token; a new token is fetched whenever the stream drops.
+   * Returns a function that closes the stream.
+   */
+  subscribe(accessToken: string, onEvent: (event: TranscriptionEvent) => void): () => void {
+    let source: EventSource | null = null;
+    let closed = false;
+    let retry: ReturnType<typeof setTimeout> | undefined;
+
+    const connect = async () => {
+      try {
+        const res = await fetch(`${BASE_URL}/auth/stream-token/`, {
+          method: 'POST',
+          headers: { Authorization: `Bearer ${accessToken}` },
+        });
+        const { token } = await handleResponse<{ token: string; expires_in: number }>(res);
+        if (closed) return;
+        source = new EventSource(`${BASE_URL}/transcriptions/events/?token=${encodeURIComponent(token)}`);
+        const handler = (message: MessageEvent) => onEvent(JSON.parse(message.data) as TranscriptionEvent);
+        source.addEventListener('progress', handler);
+        source.addEventListener('segments', handler);
+        source.onerror = () => {
+          // The URL token expires within a minute: reconnect with a fresh one
+          source?.close();
+          if (!closed) retry = setTimeout(connect, 5000);
+        };
+      } catch {
+        if (!closed) retry = setTimeout(connect, 5000);
+      }
+    };
+
+    connect();
+    return () => {
+      closed = true;
+      clearTimeout(retry);
+      source?.close();
+    };
+  },
 };